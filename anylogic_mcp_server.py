@@ -12,8 +12,10 @@ import os
 from datetime import datetime
 from pathlib import Path
 from typing import Any, Dict, List, Optional
+from urllib.parse import parse_qs, urlsplit
 
 from mcp.server import Server
+from mcp.server.lowlevel.helper_types import ReadResourceContents
 from mcp.server.models import InitializationOptions
 from mcp.types import (
     CallToolResult,
@@ -27,11 +29,10 @@ from mcp.types import (
     Prompt,
     PromptArgument,
     PromptMessage,
-    ReadResourceResult,
     Resource,
+    ResourceTemplate,
     ServerCapabilities,
     TextContent,
-    TextResourceContents,
     Tool,
 )
 
@@ -47,6 +48,25 @@ except ImportError:
     )
     ANYLOGIC_AVAILABLE = False
 
+from cloud_executor import cloud_executor
+from model_catalog import ModelCatalog, model_catalogs
+from result_cache import result_cache
+from simulation_ids import id_timestamp, new_simulation_id
+from simulation_registry import (
+    SimulationRegistry,
+    open_simulation_registry,
+    page_simulations,
+    query_simulations,
+    simulation_changes,
+    status_counts,
+)
+from simulation_journal import SimulationJournal
+from results_layout import ResultsLayout
+from artifact_writer import artifact_writer
+from artifact_compression import artifact_exists
+from outputs_cache import outputs_cache
+from serialization import compact_responses, dumps_response, dumps_streamed, project_fields
+
 
 class AnyLogicMCPServer:
     def __init__(self):
@@ -55,6 +75,7 @@ class AnyLogicMCPServer:
         
         self.server = Server("anylogic-mcp-server")
         self.cloud_client: Optional[CloudClient] = None
+        self.model_catalog: Optional[ModelCatalog] = None
         self.current_simulations: Dict[str, Any] = {}
 
         # Setup storage directories
@@ -64,9 +85,25 @@ class AnyLogicMCPServer:
         self._ensure_directories()
         print("Storage directories ready", file=sys.stderr)
 
-        # Load existing simulations on startup
+        # Location of each simulation's directory (flat, or sharded by date or hash)
+        self.results_layout = ResultsLayout(self.results_dir)
+
+        # Cached run outputs live next to the results
+        result_cache.use_storage_dir(self.simulations_dir)
+
+        # Number of recent simulations listed as resources (older ones are reachable by template)
+        self.recent_resources = int(os.getenv("ANYLOGIC_RECENT_RESOURCES", "20"))
+
+        # Lifecycle journal: metadata.json is written once, later status changes are appended
+        self.simulation_journal = SimulationJournal(self.results_dir, layout=self.results_layout)
+
+        # Open the simulation registry; history is hydrated in the background once run() starts
+        self._hydration: Optional[asyncio.Future] = None
         self._load_existing_simulations()
-        print(f"Loaded {len(self.current_simulations)} existing simulations", file=sys.stderr)
+        if isinstance(self.current_simulations, SimulationRegistry) and not self.current_simulations.hydrated:
+            print("Simulation history will be loaded in the background", file=sys.stderr)
+        else:
+            print(f"Loaded {len(self.current_simulations)} existing simulations", file=sys.stderr)
 
         # Setup handlers
         self._setup_handlers()
@@ -80,63 +117,58 @@ class AnyLogicMCPServer:
         (self.exports_dir / "json").mkdir(parents=True, exist_ok=True)
         (self.exports_dir / "reports").mkdir(parents=True, exist_ok=True)
 
+    @staticmethod
+    def _simulation_record(sim_id: str, metadata: Dict[str, Any]) -> Dict[str, Any]:
+        """Build the in-memory record of a simulation from its saved metadata"""
+        # Don't reload the actual simulation object, just metadata
+        return {
+            "simulation": None,  # Will be None for loaded simulations
+            "model_name": metadata.get("model_name", "Unknown"),
+            "parameters": metadata.get("parameters", {}),
+            "status": metadata.get("status", "unknown"),
+            "created": metadata.get("created", ""),
+            "completed": metadata.get("completed"),
+            "persisted": True,
+        }
+
     def _load_existing_simulations(self):
-        """Load existing simulations from disk on startup"""
+        """Open the simulation registry, importing new or changed result directories"""
         try:
-            for sim_dir in self.results_dir.glob("sim_*"):
-                if sim_dir.is_dir():
-                    metadata_file = sim_dir / "metadata.json"
-                    if metadata_file.exists():
-                        with open(metadata_file, "r") as f:
-                            metadata = json.load(f)
-
-                        sim_id = sim_dir.name
-                        # Don't reload the actual simulation object, just metadata
-                        self.current_simulations[sim_id] = {
-                            "simulation": None,  # Will be None for loaded simulations
-                            "model_name": metadata.get("model_name", "Unknown"),
-                            "parameters": metadata.get("parameters", {}),
-                            "status": metadata.get("status", "unknown"),
-                            "created": metadata.get("created", ""),
-                            "completed": metadata.get("completed"),
-                            "persisted": True,
-                        }
+            # Fold status changes journaled by earlier runs into metadata.json before importing it
+            self.simulation_journal.compact()
+            self.current_simulations = open_simulation_registry(
+                self.results_dir, self._simulation_record, variant="mcp_server", background=True
+            )
+            # Move result directories into the configured layout without blocking startup
+            self.results_layout.start_background_migration()
         except Exception as e:
             print(f"Warning: Could not load existing simulations: {e}")
 
     def _save_simulation_metadata(self, sim_id: str, metadata: Dict[str, Any]):
-        """Save simulation metadata to disk"""
+        """Save simulation metadata to the lifecycle journal"""
         try:
-            sim_dir = self.results_dir / sim_id
-            sim_dir.mkdir(exist_ok=True)
-
-            metadata_file = sim_dir / "metadata.json"
-            with open(metadata_file, "w") as f:
-                json.dump(metadata, f, indent=2)
+            self.simulation_journal.write(sim_id, metadata)
         except Exception as e:
             print(f"Warning: Could not save simulation metadata: {e}")
 
     def _save_simulation_results(self, sim_id: str, outputs_data: Dict[str, Any]):
         """Save simulation results to disk"""
         try:
-            sim_dir = self.results_dir / sim_id
-            sim_dir.mkdir(exist_ok=True)
+            sim_dir = self.results_layout.sim_dir(sim_id)
+            sim_dir.mkdir(parents=True, exist_ok=True)
 
-            outputs_file = sim_dir / "outputs.json"
-            with open(outputs_file, "w") as f:
-                json.dump(outputs_data, f, indent=2)
+            artifact_writer.write_json(sim_dir / "outputs.json", outputs_data, compress=True)
         except Exception as e:
             print(f"Warning: Could not save simulation results: {e}")
 
     def _load_simulation_results(self, sim_id: str) -> Optional[Dict[str, Any]]:
         """Load simulation results from disk"""
         try:
-            sim_dir = self.results_dir / sim_id
+            sim_dir = self.results_layout.sim_dir(sim_id)
             outputs_file = sim_dir / "outputs.json"
 
-            if outputs_file.exists():
-                with open(outputs_file, "r") as f:
-                    return json.load(f)
+            if artifact_exists(outputs_file):
+                return outputs_cache.load(outputs_file)
         except Exception as e:
             print(f"Warning: Could not load simulation results: {e}")
         return None
@@ -186,7 +218,16 @@ class AnyLogicMCPServer:
                         description="List available models in AnyLogic Cloud",
                         inputSchema={
                             "type": "object",
-                            "properties": {},
+                            "properties": {
+                                "refresh": {
+                                    "type": "boolean",
+                                    "description": "Bypass the cached model catalog and fetch it again",
+                                },
+                                "fields": {
+                                    "type": "string",
+                                    "description": "Comma-separated model keys to return (e.g. \"id,name\"); answers with JSON instead of text",
+                                },
+                            },
                             "required": [],
                         },
                     ),
@@ -204,6 +245,10 @@ class AnyLogicMCPServer:
                                     "type": "object",
                                     "description": "Simulation parameters as key-value pairs",
                                 },
+                                "use_cache": {
+                                    "type": "boolean",
+                                    "description": "Reuse results of an identical earlier run (default true)",
+                                },
                             },
                             "required": ["model_name"],
                         },
@@ -217,17 +262,68 @@ class AnyLogicMCPServer:
                                 "simulation_id": {
                                     "type": "string",
                                     "description": "ID of the simulation to get results for",
-                                }
+                                },
+                                "fields": {
+                                    "type": "string",
+                                    "description": "Comma-separated output keys to return (e.g. \"Throughput,Total cost\"); answers with JSON instead of text",
+                                },
                             },
                             "required": ["simulation_id"],
                         },
                     ),
                     Tool(
                         name="list_simulations",
-                        description="List all simulations (running and completed)",
+                        description="List simulations (running and completed), newest first, optionally filtered",
                         inputSchema={
                             "type": "object",
-                            "properties": {},
+                            "properties": {
+                                "status": {
+                                    "type": "string",
+                                    "description": "Only simulations with this status (e.g. running, completed, failed)",
+                                },
+                                "model_name": {
+                                    "type": "string",
+                                    "description": "Only simulations of this model",
+                                },
+                                "created_after": {
+                                    "type": "string",
+                                    "description": "Only simulations created at or after this ISO date/time",
+                                },
+                                "created_before": {
+                                    "type": "string",
+                                    "description": "Only simulations created before this ISO date/time",
+                                },
+                                "limit": {
+                                    "type": "integer",
+                                    "description": "Simulations per page",
+                                },
+                                "cursor": {
+                                    "type": "string",
+                                    "description": "Cursor from a previous page to continue listing",
+                                },
+                                "fields": {
+                                    "type": "string",
+                                    "description": "Comma-separated simulation keys to return (e.g. \"id,status\"); answers with JSON instead of text",
+                                },
+                            },
+                            "required": [],
+                        },
+                    ),
+                    Tool(
+                        name="get_simulation_changes",
+                        description="Simulations created, changed or removed since a history version (for polling)",
+                        inputSchema={
+                            "type": "object",
+                            "properties": {
+                                "since": {
+                                    "type": "integer",
+                                    "description": "Version returned by the previous call (0 for everything)",
+                                },
+                                "limit": {
+                                    "type": "integer",
+                                    "description": "Maximum number of changed simulations to return",
+                                },
+                            },
                             "required": [],
                         },
                     ),
@@ -289,6 +385,8 @@ class AnyLogicMCPServer:
                 return await self._get_simulation_results(arguments)
             elif name == "list_simulations":
                 return await self._list_simulations(arguments)
+            elif name == "get_simulation_changes":
+                return await self._get_simulation_changes(arguments)
             elif name == "export_simulation_results":
                 return await self._export_simulation_results(arguments)
             elif name == "cleanup_simulations":
@@ -297,7 +395,7 @@ class AnyLogicMCPServer:
                 raise ValueError(f"Unknown tool: {name}")
 
         @self.server.list_resources()
-        async def handle_list_resources() -> ListResourcesResult:
+        async def handle_list_resources() -> List[Resource]:
             """List available resources"""
             resources = [
                 Resource(
@@ -315,13 +413,15 @@ class AnyLogicMCPServer:
                 Resource(
                     uri="anylogic://simulations/history",
                     name="Simulation History",
-                    description="Complete history of all simulations",
+                    description="History of all simulations, newest first, one page at a time",
                     mimeType="application/json",
                 ),
             ]
 
-            # Add simulation results as resources
-            for sim_id in self.current_simulations:
+            # Only the most recent simulations are listed; any other one is read through
+            # the anylogic://simulation/{simulation_id} template, so this list stays bounded
+            recent = query_simulations(self.current_simulations, limit=self.recent_resources)
+            for sim_id, _ in recent:
                 resources.append(
                     Resource(
                         uri=f"anylogic://simulation/{sim_id}",
@@ -331,18 +431,43 @@ class AnyLogicMCPServer:
                     )
                 )
 
-            return ListResourcesResult(resources=resources)
+            # The decorator wraps the list in a ListResourcesResult
+            return resources
+
+        @self.server.list_resource_templates()
+        async def handle_list_resource_templates() -> List[ResourceTemplate]:
+            """List parameterised resources"""
+            return [
+                ResourceTemplate(
+                    uriTemplate="anylogic://simulation/{simulation_id}",
+                    name="Simulation",
+                    description="Results and status of any simulation by ID",
+                    mimeType="application/json",
+                ),
+                ResourceTemplate(
+                    uriTemplate="anylogic://simulations/history{?cursor}",
+                    name="Simulation History Page",
+                    description="Later pages of the simulation history (cursor from next_cursor)",
+                    mimeType="application/json",
+                ),
+            ]
 
         @self.server.read_resource()
-        async def handle_read_resource(uri: str) -> ReadResourceResult:
+        async def handle_read_resource(uri: str) -> List[ReadResourceContents]:
             """Read resource content"""
+            uri = str(uri)
 
             if uri == "anylogic://models":
                 return await self._get_models_resource()
             elif uri == "anylogic://connection-status":
                 return await self._get_connection_status()
-            elif uri == "anylogic://simulations/history":
-                return await self._get_simulation_history_resource()
+            elif uri == "anylogic://simulations/history" or uri.startswith("anylogic://simulations/history?"):
+                # Later pages: anylogic://simulations/history?cursor=<next_cursor>&limit=<n>
+                query = parse_qs(urlsplit(uri).query)
+                return await self._get_simulation_history_resource(
+                    cursor=query.get("cursor", [None])[0],
+                    page_size=int(query["limit"][0]) if "limit" in query else None,
+                )
             elif uri.startswith("anylogic://simulation/"):
                 sim_id = uri.split("/")[-1]
                 return await self._get_simulation_resource(sim_id)
@@ -409,6 +534,17 @@ class AnyLogicMCPServer:
                 raise ValueError(f"Unknown prompt: {name}")
 
     # Tool implementations
+    @staticmethod
+    def _json_response(arguments: dict) -> bool:
+        """Whether a tool answers with JSON: in compact mode or when specific fields were requested"""
+        return compact_responses() or bool(arguments.get("fields"))
+
+    @staticmethod
+    def _json_error(message: str, **details: Any) -> CallToolResult:
+        """Error answer of a tool in JSON mode"""
+        content = {"success": False, "error": message, **details}
+        return CallToolResult(content=[TextContent(type="text", text=dumps_response(content))])
+
     async def _connect_anylogic(self, arguments: dict) -> CallToolResult:
         """Connect to AnyLogic Cloud"""
         if not ANYLOGIC_AVAILABLE:
@@ -426,9 +562,10 @@ class AnyLogicMCPServer:
                 "api_key", "e05a6efa-ea5f-4adf-b090-ae0ca7d16c20"
             )  # Default demo key
             self.cloud_client = CloudClient(api_key)
+            self.model_catalog = model_catalogs.get(api_key, self.cloud_client)
 
-            # Test connection by trying to list models
-            models = self.cloud_client.get_models()
+            # Test connection by trying to list models (also warms the catalog)
+            models = await self.model_catalog.refresh()
 
             # Check if using demo key
             is_demo = api_key == "e05a6efa-ea5f-4adf-b090-ae0ca7d16c20"
@@ -528,6 +665,8 @@ class AnyLogicMCPServer:
     async def _list_models(self, arguments: dict) -> CallToolResult:
         """List available models"""
         if not self.cloud_client:
+            if self._json_response(arguments):
+                return self._json_error("Not connected to AnyLogic Cloud. Use connect_anylogic tool first.")
             return CallToolResult(
                 content=[
                     TextContent(
@@ -538,7 +677,9 @@ class AnyLogicMCPServer:
             )
 
         try:
-            models = self.cloud_client.get_models()
+            models = await self.model_catalog.get_models(
+                force_refresh=arguments.get("refresh", False)
+            )
             model_list = []
 
             for model in models:
@@ -550,6 +691,13 @@ class AnyLogicMCPServer:
                 }
                 model_list.append(model_info)
 
+            if self._json_response(arguments):
+                content = {
+                    "models": project_fields(model_list, arguments.get("fields")),
+                    "count": len(model_list),
+                }
+                return CallToolResult(content=[TextContent(type="text", text=dumps_response(content))])
+
             return CallToolResult(
                 content=[
                     TextContent(
@@ -562,6 +710,8 @@ class AnyLogicMCPServer:
                 ]
             )
         except Exception as e:
+            if self._json_response(arguments):
+                return self._json_error(f"Error listing models: {str(e)}")
             return CallToolResult(
                 content=[
                     TextContent(type="text", text=f"❌ Error listing models: {str(e)}")
@@ -584,17 +734,60 @@ class AnyLogicMCPServer:
             model_name = arguments["model_name"]
             parameters = arguments.get("parameters", {})
 
-            # Get model and create simulation
-            version = self.cloud_client.get_latest_model_version(model_name)
-            inputs = self.cloud_client.create_default_inputs(version)
+            # Resolve the model by id, exact name or closest fuzzy match
+            model = await self.model_catalog.resolve(model_name)
+            model_name = model.name
+
+            # Identical runs of the same model version reuse stored outputs
+            version = await self.model_catalog.get_version(model)
+            if arguments.get("use_cache", True):
+                cache_entry = result_cache.lookup(model.id, version.id, parameters)
+                if cache_entry is not None:
+                    simulation_id = new_simulation_id()
+                    now = datetime.now().isoformat()
+                    sim_metadata = {
+                        "simulation": None,
+                        "model_name": model_name,
+                        "parameters": parameters,
+                        "status": "completed",
+                        "created": now,
+                        "completed": now,
+                        "persisted": True,
+                        "cached_from": cache_entry.get("source_simulation"),
+                    }
+                    self.current_simulations[simulation_id] = sim_metadata
+                    # Disk writes wait for their fsync, so they run off the event loop
+                    await asyncio.to_thread(
+                        self._save_simulation_metadata,
+                        simulation_id, {k: v for k, v in sim_metadata.items() if k != "simulation"}
+                    )
+                    await asyncio.to_thread(
+                        self._save_simulation_results, simulation_id, cache_entry.get("outputs") or {}
+                    )
+
+                    return CallToolResult(
+                        content=[
+                            TextContent(
+                                type="text",
+                                text=f"♻️ Reused cached results of '{cache_entry.get('source_simulation')}' for '{model_name}' with ID: {simulation_id}\n"
+                                + f"Parameters: {json.dumps(parameters, indent=2) if parameters else 'Default parameters'}\n"
+                                + f"Use get_simulation_results with ID '{simulation_id}' to view results.",
+                            )
+                        ]
+                    )
+
+            # Get cached model version and a private copy of its default inputs
+            version, inputs = await self.model_catalog.default_inputs(model)
 
             # Set parameters if provided
             for param_name, param_value in parameters.items():
                 inputs.set_input(param_name, param_value)
 
             # Create and run simulation
-            simulation = self.cloud_client.create_simulation(inputs)
-            simulation_id = f"sim_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+            simulation = await cloud_executor.call(
+                self.cloud_client.create_simulation, inputs
+            )
+            simulation_id = new_simulation_id()
 
             # Store simulation for later reference
             sim_metadata = {
@@ -604,6 +797,8 @@ class AnyLogicMCPServer:
                 "status": "running",
                 "created": datetime.now().isoformat(),
                 "persisted": True,
+                "model_id": str(model.id),
+                "version_id": str(version.id),
             }
             self.current_simulations[simulation_id] = sim_metadata
 
@@ -611,7 +806,7 @@ class AnyLogicMCPServer:
             metadata_to_save = {
                 k: v for k, v in sim_metadata.items() if k != "simulation"
             }
-            self._save_simulation_metadata(simulation_id, metadata_to_save)
+            await asyncio.to_thread(self._save_simulation_metadata, simulation_id, metadata_to_save)
 
             return CallToolResult(
                 content=[
@@ -637,6 +832,8 @@ class AnyLogicMCPServer:
         simulation_id = arguments["simulation_id"]
 
         if simulation_id not in self.current_simulations:
+            if self._json_response(arguments):
+                return self._json_error(f"Simulation ID '{simulation_id}' not found")
             return CallToolResult(
                 content=[
                     TextContent(
@@ -650,11 +847,15 @@ class AnyLogicMCPServer:
             sim_data = self.current_simulations[simulation_id]
             simulation = sim_data["simulation"]
 
-            # Check if we have cached results first
-            cached_results = self._load_simulation_results(simulation_id)
+            # Check if we have cached results first (only completed runs have any to use)
+            cached_results = None
+            key_outputs = None
+            if sim_data["status"] == "completed":
+                cached_results = self._load_simulation_results(simulation_id)
 
-            if cached_results and sim_data["status"] == "completed":
+            if cached_results:
                 # Use cached results
+                key_outputs = cached_results.get("key_outputs", {})
                 result_text = f"📊 Simulation Results for '{sim_data['model_name']}' (ID: {simulation_id})\n\n"
                 result_text += f"Status: ✅ Completed (from cache)\n"
                 result_text += f"Started: {sim_data['created']}\n"
@@ -666,7 +867,9 @@ class AnyLogicMCPServer:
 
             elif simulation is not None:
                 # Try to get fresh outputs (this will run if not already completed)
-                outputs = simulation.get_outputs_and_run_if_absent()
+                outputs = await cloud_executor.run(
+                    simulation.get_outputs_and_run_if_absent
+                )
 
                 # Update status
                 sim_data["status"] = "completed"
@@ -696,13 +899,23 @@ class AnyLogicMCPServer:
                     "completed_at": sim_data["completed"],
                     "status": "completed",
                 }
-                self._save_simulation_results(simulation_id, results_data)
+                await asyncio.to_thread(self._save_simulation_results, simulation_id, results_data)
+                if sim_data.get("model_id") and sim_data.get("version_id"):
+                    await asyncio.to_thread(
+                        result_cache.store,
+                        sim_data["model_id"],
+                        sim_data["version_id"],
+                        sim_data["parameters"],
+                        results_data,
+                        simulation_id,
+                    )
 
-                # Update metadata on disk
+                # Update metadata on disk and in the registry
                 metadata_to_save = {
                     k: v for k, v in sim_data.items() if k != "simulation"
                 }
-                self._save_simulation_metadata(simulation_id, metadata_to_save)
+                await asyncio.to_thread(self._save_simulation_metadata, simulation_id, metadata_to_save)
+                self.current_simulations[simulation_id] = sim_data
 
                 # Format results
                 result_text = f"📊 Simulation Results for '{sim_data['model_name']}' (ID: {simulation_id})\n\n"
@@ -729,6 +942,24 @@ class AnyLogicMCPServer:
                 else:
                     result_text = f"❌ Simulation results not available for ID '{simulation_id}'. Simulation may still be running or data was lost."
 
+            if key_outputs is not None and self._json_response(arguments):
+                content = {
+                    "simulation_id": simulation_id,
+                    "model_name": sim_data["model_name"],
+                    "status": "completed",
+                    "created": sim_data["created"],
+                    "completed": sim_data.get("completed"),
+                    "results": project_fields(key_outputs, arguments.get("fields")),
+                }
+                return CallToolResult(content=[TextContent(type="text", text=dumps_response(content))])
+
+            if self._json_response(arguments):
+                return self._json_error(
+                    f"Simulation results not available for ID '{simulation_id}'",
+                    simulation_id=simulation_id,
+                    status=sim_data.get("status", "unknown"),
+                )
+
             if "result_text" not in locals():
                 result_text = (
                     f"❌ Could not retrieve results for simulation {simulation_id}"
@@ -737,6 +968,8 @@ class AnyLogicMCPServer:
             return CallToolResult(content=[TextContent(type="text", text=result_text)])
 
         except Exception as e:
+            if self._json_response(arguments):
+                return self._json_error(f"Error getting simulation results: {str(e)}")
             return CallToolResult(
                 content=[
                     TextContent(
@@ -747,21 +980,46 @@ class AnyLogicMCPServer:
             )
 
     async def _list_simulations(self, arguments: dict) -> CallToolResult:
-        """List all simulations"""
+        """List simulations matching the optional filters"""
         try:
-            if not self.current_simulations:
+            # One page answered from the registry's indexes, newest first
+            page = page_simulations(
+                self.current_simulations,
+                cursor=arguments.get("cursor"),
+                page_size=arguments.get("limit"),
+                status=arguments.get("status"),
+                model_name=arguments.get("model_name"),
+                created_after=arguments.get("created_after"),
+                created_before=arguments.get("created_before"),
+            )
+            sorted_sims = page["simulations"]
+            if self._json_response(arguments):
+                content = {
+                    "simulations": [
+                        project_fields(
+                            {
+                                "id": sim_id,
+                                "model_name": sim_data.get("model_name", "Unknown"),
+                                "status": sim_data.get("status", "unknown"),
+                                "created": sim_data.get("created", ""),
+                                "completed": sim_data.get("completed"),
+                                "parameters": sim_data.get("parameters", {}),
+                            },
+                            arguments.get("fields"),
+                        )
+                        for sim_id, sim_data in sorted_sims
+                    ],
+                    "total_count": page["total"],
+                    "next_cursor": page["next_cursor"],
+                }
+                return CallToolResult(content=[TextContent(type="text", text=dumps_response(content))])
+
+            if not sorted_sims:
                 return CallToolResult(
                     content=[TextContent(type="text", text="📋 No simulations found.")]
                 )
 
-            result_text = f"📋 Found {len(self.current_simulations)} simulations:\n\n"
-
-            # Sort by creation time (newest first)
-            sorted_sims = sorted(
-                self.current_simulations.items(),
-                key=lambda x: x[1].get("created", ""),
-                reverse=True,
-            )
+            parts = [f"📋 Found {page['total']} simulations, showing {len(sorted_sims)}:\n\n"]
 
             for sim_id, sim_data in sorted_sims:
                 status_emoji = (
@@ -769,17 +1027,22 @@ class AnyLogicMCPServer:
                     if sim_data["status"] == "completed"
                     else "🟡" if sim_data["status"] == "running" else "🔴"
                 )
-                result_text += f"{status_emoji} **{sim_id}**\n"
-                result_text += f"   Model: {sim_data.get('model_name', 'Unknown')}\n"
-                result_text += f"   Status: {sim_data.get('status', 'unknown')}\n"
-                result_text += f"   Created: {sim_data.get('created', 'Unknown')}\n"
+                parts.append(f"{status_emoji} **{sim_id}**\n")
+                parts.append(f"   Model: {sim_data.get('model_name', 'Unknown')}\n")
+                parts.append(f"   Status: {sim_data.get('status', 'unknown')}\n")
+                parts.append(f"   Created: {sim_data.get('created', 'Unknown')}\n")
                 if sim_data.get("completed"):
-                    result_text += f"   Completed: {sim_data['completed']}\n"
-                result_text += "\n"
+                    parts.append(f"   Completed: {sim_data['completed']}\n")
+                parts.append("\n")
 
-            return CallToolResult(content=[TextContent(type="text", text=result_text)])
+            if page["next_cursor"]:
+                parts.append(f"More results: call list_simulations with cursor=\"{page['next_cursor']}\"\n")
+
+            return CallToolResult(content=[TextContent(type="text", text="".join(parts))])
 
         except Exception as e:
+            if self._json_response(arguments):
+                return self._json_error(f"Error listing simulations: {str(e)}")
             return CallToolResult(
                 content=[
                     TextContent(
@@ -788,6 +1051,40 @@ class AnyLogicMCPServer:
                 ]
             )
 
+    async def _get_simulation_changes(self, arguments: dict) -> CallToolResult:
+        """List simulations changed since a registry version"""
+        try:
+            changes = simulation_changes(
+                self.current_simulations,
+                since=arguments.get("since", 0),
+                limit=arguments.get("limit"),
+            )
+            content = {
+                "simulations": [
+                    {
+                        "id": sim_id,
+                        "model_name": sim_data.get("model_name", "Unknown"),
+                        "status": sim_data.get("status", "unknown"),
+                        "created": sim_data.get("created", ""),
+                        "completed": sim_data.get("completed"),
+                    }
+                    for sim_id, sim_data in changes["simulations"]
+                ],
+                "removed": changes["removed"],
+                "version": changes["version"],
+                "more": changes["more"],
+            }
+            return CallToolResult(content=[TextContent(type="text", text=dumps_response(content))])
+
+        except Exception as e:
+            return CallToolResult(
+                content=[
+                    TextContent(
+                        type="text", text=f"❌ Error reading simulation changes: {str(e)}"
+                    )
+                ]
+            )
+
     async def _export_simulation_results(self, arguments: dict) -> CallToolResult:
         """Export simulation results to file"""
         try:
@@ -894,12 +1191,15 @@ class AnyLogicMCPServer:
             for sim_id, sim_data in self.current_simulations.items():
                 try:
                     created_str = sim_data.get("created", "")
-                    if not created_str:
-                        continue
-
-                    created_date = datetime.fromisoformat(
-                        created_str.replace("Z", "+00:00")
-                    )
+                    if created_str:
+                        created_date = datetime.fromisoformat(
+                            created_str.replace("Z", "+00:00")
+                        )
+                    else:
+                        # Fall back to the timestamp encoded in the simulation ID
+                        created_date = id_timestamp(sim_id)
+                        if created_date is None:
+                            continue
                     sim_status = sim_data.get("status", "unknown")
 
                     # Check if simulation meets removal criteria
@@ -924,11 +1224,14 @@ class AnyLogicMCPServer:
                     del self.current_simulations[sim_id]
 
                     # Remove files from disk
-                    sim_dir = self.results_dir / sim_id
+                    sim_dir = self.results_layout.sim_dir(sim_id)
                     if sim_dir.exists():
                         import shutil
 
+                        outputs_cache.invalidate_dir(sim_dir)
+
                         shutil.rmtree(sim_dir)
+                        self.simulation_journal.forget(sim_id)
 
                     removed_count += 1
                     removed_sims.append(
@@ -966,13 +1269,13 @@ class AnyLogicMCPServer:
             )
 
     # Resource implementations
-    async def _get_models_resource(self) -> ReadResourceResult:
+    async def _get_models_resource(self) -> List[ReadResourceContents]:
         """Get models resource"""
         if not self.cloud_client:
             content = {"error": "Not connected to AnyLogic Cloud"}
         else:
             try:
-                models = self.cloud_client.get_models()
+                models = await self.model_catalog.get_models()
                 content = {
                     "models": [
                         {
@@ -988,31 +1291,33 @@ class AnyLogicMCPServer:
             except Exception as e:
                 content = {"error": str(e)}
 
-        return ReadResourceResult(
-            contents=[TextContent(type="text", text=json.dumps(content, indent=2))]
-        )
+        return [ReadResourceContents(content=dumps_response(content), mime_type="application/json")]
 
-    async def _get_connection_status(self) -> ReadResourceResult:
+    async def _get_connection_status(self) -> List[ReadResourceContents]:
         """Get connection status resource"""
         status = {
             "connected": self.cloud_client is not None,
             "anylogic_client_available": ANYLOGIC_AVAILABLE,
             "active_simulations": len(self.current_simulations),
+            "history_loaded": getattr(self.current_simulations, "hydrated", True),
+            "cloud_calls": cloud_executor.metrics(),
+            "model_catalog": self.model_catalog.stats() if self.model_catalog else None,
+            "result_cache": result_cache.stats(),
+            "outputs_cache": outputs_cache.stats(),
             "timestamp": datetime.now().isoformat(),
         }
 
-        return ReadResourceResult(
-            contents=[TextResourceContents(type="text", text=json.dumps(status, indent=2))]
-        )
+        return [ReadResourceContents(content=dumps_response(status), mime_type="application/json")]
 
-    async def _get_simulation_history_resource(self) -> ReadResourceResult:
-        """Get simulation history resource"""
+    async def _get_simulation_history_resource(self, cursor: Optional[str] = None,
+                                               page_size: Optional[int] = None) -> List[ReadResourceContents]:
+        """Get one page of the simulation history resource"""
         try:
-            history = []
-
-            # Include current simulations
-            for sim_id, sim_data in self.current_simulations.items():
-                history_entry = {
+            # Newest first, straight from the registry's (created, id) index
+            page = page_simulations(self.current_simulations, cursor=cursor, page_size=page_size)
+            # Entries are generated while encoding instead of collected into a list first
+            history = (
+                {
                     "id": sim_id,
                     "model_name": sim_data.get("model_name", "Unknown"),
                     "status": sim_data.get("status", "unknown"),
@@ -1021,30 +1326,25 @@ class AnyLogicMCPServer:
                     "parameters": sim_data.get("parameters", {}),
                     "persisted": sim_data.get("persisted", False),
                 }
-                history.append(history_entry)
-
-            # Sort by creation time (newest first)
-            history.sort(key=lambda x: x.get("created", ""), reverse=True)
+                for sim_id, sim_data in page["simulations"]
+            )
 
+            counts = status_counts(self.current_simulations)
             content = {
-                "total_simulations": len(history),
-                "active_simulations": len(
-                    [s for s in history if s["status"] == "running"]
-                ),
-                "completed_simulations": len(
-                    [s for s in history if s["status"] == "completed"]
-                ),
+                "total_simulations": page["total"],
+                "active_simulations": counts.get("running", 0),
+                "completed_simulations": counts.get("completed", 0),
                 "simulations": history,
+                "next_cursor": page["next_cursor"],
             }
+            text = dumps_streamed(content)
 
         except Exception as e:
-            content = {"error": f"Could not load simulation history: {str(e)}"}
+            text = dumps_response({"error": f"Could not load simulation history: {str(e)}"})
 
-        return ReadResourceResult(
-            contents=[TextContent(type="text", text=json.dumps(content, indent=2))]
-        )
+        return [ReadResourceContents(content=text, mime_type="application/json")]
 
-    async def _get_simulation_resource(self, sim_id: str) -> ReadResourceResult:
+    async def _get_simulation_resource(self, sim_id: str) -> List[ReadResourceContents]:
         """Get simulation resource"""
         if sim_id not in self.current_simulations:
             content = {"error": f"Simulation {sim_id} not found"}
@@ -1054,9 +1354,7 @@ class AnyLogicMCPServer:
             sim_data.pop("simulation", None)
             content = sim_data
 
-        return ReadResourceResult(
-            contents=[TextContent(type="text", text=json.dumps(content, indent=2))]
-        )
+        return [ReadResourceContents(content=dumps_response(content), mime_type="application/json")]
 
     # Prompt implementations
     async def _get_supply_chain_analysis_prompt(
@@ -1158,6 +1456,10 @@ Create a comprehensive comparison report with clear insights for decision-making
         # Start the server using stdio transport
         from mcp.server.stdio import stdio_server
 
+        # Hydrate simulation history without delaying initialize/list_tools
+        if isinstance(self.current_simulations, SimulationRegistry):
+            self._hydration = self.current_simulations.start_background_hydration()
+
         async with stdio_server() as (read_stream, write_stream):
             await self.server.run(
                 read_stream,
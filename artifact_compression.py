@@ -0,0 +1,159 @@
+"""
+Optional compression of stored simulation artifacts.
+Large artifacts (outputs.json, raw_results.json, cache entries) can be stored as
+outputs.json.zst or outputs.json.gz; readers ask for the plain name and get the
+decompressed contents of whichever variant exists. Files below a size threshold
+stay plain so small metadata remains cheap to read and easy to inspect.
+"""
+
+import gzip
+import logging
+import os
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+
+import serialization
+
+logger = logging.getLogger(__name__)
+
+try:
+    import zstandard
+    ZSTD_AVAILABLE = True
+except ImportError:
+    zstandard = None
+    ZSTD_AVAILABLE = False
+
+# Codec name -> file suffix
+CODEC_SUFFIXES = {"zstd": ".zst", "gzip": ".gz"}
+
+# Artifacts the storage layer may compress
+COMPRESSIBLE_FILES = ("outputs.json", "raw_results.json")
+
+
+def _zstd_compress(data: bytes, level: int) -> bytes:
+    return zstandard.ZstdCompressor(level=level).compress(data)
+
+
+def _zstd_decompress(data: bytes) -> bytes:
+    return zstandard.ZstdDecompressor().decompress(data)
+
+
+def _codec(name: str) -> Tuple[Callable[[bytes, int], bytes], Callable[[bytes], bytes]]:
+    """(compress, decompress) functions of a codec."""
+    if name == "gzip":
+        return (lambda data, level: gzip.compress(data, compresslevel=level, mtime=0)), gzip.decompress
+    if name == "zstd":
+        if not ZSTD_AVAILABLE:
+            raise ValueError("zstd compression requires the 'zstandard' package")
+        return _zstd_compress, _zstd_decompress
+    raise ValueError(f"Unknown compression codec '{name}'; use one of {sorted(CODEC_SUFFIXES)} or 'none'")
+
+
+def _codec_for_suffix(suffix: str) -> Optional[str]:
+    for name, codec_suffix in CODEC_SUFFIXES.items():
+        if suffix == codec_suffix:
+            return name
+    return None
+
+
+def artifact_variants(path: Union[str, Path]) -> List[Path]:
+    """The plain path and every compressed variant it may be stored as."""
+    path = Path(path)
+    return [path] + [path.with_name(path.name + suffix) for suffix in CODEC_SUFFIXES.values()]
+
+
+def find_artifact(path: Union[str, Path]) -> Optional[Path]:
+    """
+    The stored file for an artifact, compressed or not.
+
+    If an interrupted rewrite left several variants, the most recently written wins.
+    """
+    newest, newest_mtime = None, -1.0
+    for variant in artifact_variants(path):
+        try:
+            mtime = variant.stat().st_mtime
+        except FileNotFoundError:
+            continue
+        if mtime > newest_mtime:
+            newest, newest_mtime = variant, mtime
+    return newest
+
+
+def artifact_exists(path: Union[str, Path]) -> bool:
+    """Whether an artifact is stored, in any variant."""
+    return find_artifact(path) is not None
+
+
+def read_artifact(path: Union[str, Path]) -> bytes:
+    """
+    Contents of an artifact, decompressed if it is stored compressed.
+
+    Raises:
+        FileNotFoundError: No variant of the artifact exists
+    """
+    stored = find_artifact(path)
+    if stored is None:
+        raise FileNotFoundError(f"No such artifact: {path}")
+    with open(stored, "rb") as f:
+        data = f.read()
+    codec = _codec_for_suffix(stored.suffix) if stored != Path(path) else None
+    return _codec(codec)[1](data) if codec else data
+
+
+def read_json_artifact(path: Union[str, Path]) -> Any:
+    """Decoded JSON contents of an artifact, compressed or not."""
+    return serialization.loads(read_artifact(path))
+
+
+def remove_artifact(path: Union[str, Path], keep: Optional[Path] = None) -> None:
+    """Delete every variant of an artifact except `keep`."""
+    for variant in artifact_variants(path):
+        if variant != keep:
+            variant.unlink(missing_ok=True)
+
+
+class CompressionPolicy:
+    """Decides whether and how an artifact is compressed."""
+
+    def __init__(self, codec: Optional[str] = None, min_bytes: Optional[int] = None,
+                 level: Optional[int] = None):
+        self.codec = (codec or os.getenv("ANYLOGIC_COMPRESSION", "none")).lower()
+        if self.codec != "none":
+            _codec(self.codec)
+        self.min_bytes = min_bytes if min_bytes is not None else int(
+            os.getenv("ANYLOGIC_COMPRESSION_MIN_BYTES", "16384")
+        )
+        default_level = 3 if self.codec == "zstd" else 6
+        self.level = level if level is not None else int(os.getenv("ANYLOGIC_COMPRESSION_LEVEL", str(default_level)))
+
+    @property
+    def enabled(self) -> bool:
+        return self.codec != "none"
+
+    def encode(self, path: Path, data: bytes) -> Tuple[Path, bytes]:
+        """
+        Target file and payload for an artifact.
+
+        Returns:
+            (path, data) unchanged when compression is off or the data is below the
+            threshold, otherwise (path with codec suffix, compressed data)
+        """
+        if not self.enabled or len(data) < self.min_bytes:
+            return path, data
+        compress, _ = _codec(self.codec)
+        return path.with_name(path.name + CODEC_SUFFIXES[self.codec]), compress(data, self.level)
+
+    def stats(self) -> Dict[str, Any]:
+        """Compression settings for status resources."""
+        return {"codec": self.codec, "min_bytes": self.min_bytes, "level": self.level}
+
+
+def _policy_from_env() -> CompressionPolicy:
+    try:
+        return CompressionPolicy()
+    except ValueError as e:
+        logger.warning(f"{e}; storing artifacts uncompressed")
+        return CompressionPolicy(codec="none")
+
+# Global compression policy shared by all tools in a server process
+compression_policy = _policy_from_env()
@@ -0,0 +1,246 @@
+"""
+Crash-safe writes for simulation artifacts (metadata, outputs, cache entries, sweeps).
+Every file is written to a temporary sibling and atomically renamed over its target,
+so readers and the startup loader never see a truncated file. Durability is configurable:
+"strict" fsyncs each write before returning, "batched" group-commits fsyncs from a
+background thread, and "none" leaves flushing to the OS. Only "none" can leave a
+renamed but unsynced (empty or truncated) file behind after a crash.
+"""
+
+import atexit
+import logging
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Set, Union
+
+import serialization
+from artifact_compression import CompressionPolicy, compression_policy, remove_artifact
+
+logger = logging.getLogger(__name__)
+
+DURABILITY_MODES = ("strict", "batched", "none")
+
+
+def _fsync_path(path: Path) -> None:
+    """fsync a file or directory by path; directories are skipped where the OS cannot open them."""
+    flags = os.O_RDONLY
+    if path.is_dir():
+        if not hasattr(os, "O_DIRECTORY"):
+            return
+        flags |= os.O_DIRECTORY
+    fd = os.open(path, flags)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+class ArtifactWriter:
+    """
+    Atomic file writer with configurable durability.
+
+    In "batched" mode the temporary files of concurrent writers are fsynced together
+    by one background group commit, and each is renamed into place only once its data
+    is on disk. The directory fsyncs that make the renames durable follow at the next
+    group commit, at most `group_commit_ms` later; flush() waits for every earlier
+    write to be durable.
+
+    Writes block their caller until the data is synced, so async code calls them
+    from worker threads (asyncio.to_thread); writers overlapping there share commits.
+    """
+
+    def __init__(self, durability: Optional[str] = None, group_commit_ms: Optional[float] = None,
+                 compression: Optional[CompressionPolicy] = None):
+        self.durability = (durability or os.getenv("ANYLOGIC_WRITE_DURABILITY", "batched")).lower()
+        if self.durability not in DURABILITY_MODES:
+            raise ValueError(f"Durability must be one of {DURABILITY_MODES}, got '{self.durability}'")
+        self.group_commit_ms = group_commit_ms if group_commit_ms is not None else float(
+            os.getenv("ANYLOGIC_GROUP_COMMIT_MS", "50")
+        )
+        self.compression = compression or compression_policy
+
+        self._cond = threading.Condition()
+        self._pending: Set[Path] = set()
+        # Temporary files waiting for their data to be synced before they are renamed
+        self._pending_files: List[Path] = []
+        self._files_enqueued = 0
+        self._files_synced = 0
+        self._enqueued = 0
+        self._durable = 0
+        self._flusher: Optional[threading.Thread] = None
+        self._flush_requested = False
+
+        self.writes = 0
+        self.fsyncs = 0
+        self.group_commits = 0
+
+    def write_bytes(self, path: Union[str, Path], data: bytes, compress: bool = False) -> Path:
+        """
+        Atomically replace path with data.
+
+        With compress set, data above the compression threshold is stored as
+        path plus the codec suffix (e.g. outputs.json.zst) and other variants of
+        the artifact are removed; read it back through artifact_compression.
+
+        Returns:
+            The file actually written
+        """
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        logical_path = path
+        if compress:
+            path, data = self.compression.encode(path, data)
+        # Unique per process and thread so concurrent writers of one target never share a temp file
+        temp_path = path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        try:
+            with open(temp_path, "wb") as f:
+                f.write(data)
+                if self.durability == "strict":
+                    f.flush()
+                    os.fsync(f.fileno())
+                    self.fsyncs += 1
+            if self.durability == "batched":
+                self._sync_file_batched(temp_path)
+            os.replace(temp_path, path)
+        except BaseException:
+            temp_path.unlink(missing_ok=True)
+            raise
+
+        if compress:
+            remove_artifact(logical_path, keep=path)
+
+        self.writes += 1
+        if self.durability == "strict":
+            self._sync_now(path.parent)
+        elif self.durability == "batched":
+            self._enqueue(path, path.parent)
+        return path
+
+    def write_text(self, path: Union[str, Path], text: str, compress: bool = False) -> Path:
+        """Atomically replace path with UTF-8 text."""
+        return self.write_bytes(path, text.encode("utf-8"), compress)
+
+    def write_json(self, path: Union[str, Path], data: Any, indent: bool = False, compress: bool = False) -> Path:
+        """
+        Atomically replace path with data as JSON (compact unless indent is set).
+
+        The document is serialized before anything touches the disk, so a value
+        that cannot be serialized leaves the existing file untouched.
+        """
+        return self.write_bytes(path, serialization.dumps(data, indent), compress)
+
+    def append_text(self, path: Union[str, Path], text: str) -> None:
+        """Append to a log file (e.g. the lifecycle journal) with the configured durability."""
+        path = Path(path)
+        with open(path, "a") as f:
+            f.write(text)
+            if self.durability == "strict":
+                f.flush()
+                os.fsync(f.fileno())
+                self.fsyncs += 1
+        self.writes += 1
+        if self.durability == "batched":
+            self._enqueue(path)
+
+    def _sync_now(self, *paths: Path) -> None:
+        for path in paths:
+            try:
+                _fsync_path(path)
+                self.fsyncs += 1
+            except FileNotFoundError:
+                # Removed (e.g. by cleanup or compaction) before it was synced
+                pass
+            except OSError as e:
+                logger.debug(f"Could not fsync {path}: {e}")
+
+    def _start_flusher(self) -> None:
+        if self._flusher is None or not self._flusher.is_alive():
+            self._flusher = threading.Thread(target=self._flush_loop, name="artifact-group-commit",
+                                             daemon=True)
+            self._flusher.start()
+
+    def _enqueue(self, *paths: Path) -> None:
+        with self._cond:
+            self._pending.update(paths)
+            self._enqueued += 1
+            self._start_flusher()
+            self._cond.notify_all()
+
+    def _sync_file_batched(self, temp_path: Path) -> None:
+        """Wait until the next group commit has fsynced a temporary file's data."""
+        with self._cond:
+            self._pending_files.append(temp_path)
+            self._files_enqueued += 1
+            ticket = self._files_enqueued
+            self._start_flusher()
+            self._cond.notify_all()
+            self._cond.wait_for(lambda: self._files_synced >= ticket)
+
+    def _flush_loop(self) -> None:
+        """Background group commit: gather writes for one window, then fsync them together."""
+        while True:
+            with self._cond:
+                while not self._pending and not self._pending_files:
+                    self._cond.wait()
+                # Let concurrent writers join this batch unless a writer is blocked on it
+                # or a flush() is waiting; writers arriving meanwhile join the next batch
+                deadline = time.monotonic() + self.group_commit_ms / 1000
+                while not self._flush_requested and not self._pending_files:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._cond.wait(remaining)
+                self._flush_requested = False
+                temp_files, self._pending_files = self._pending_files, []
+                files_target = self._files_enqueued
+                batch, self._pending = self._pending, set()
+                target = self._enqueued
+
+            # Temporary files first: their writers rename them as soon as the data is on disk
+            if temp_files:
+                self._sync_now(*temp_files)
+                with self._cond:
+                    self._files_synced = max(self._files_synced, files_target)
+                    self._cond.notify_all()
+
+            # Then appended files and the directories of renamed entries
+            files = sorted(path for path in batch if not path.is_dir())
+            directories = sorted(path for path in batch if path.is_dir())
+            self._sync_now(*files, *directories)
+
+            with self._cond:
+                self.group_commits += 1
+                self._durable = max(self._durable, target)
+                self._cond.notify_all()
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """
+        Wait until every write issued so far is durable.
+
+        Returns:
+            False if the timeout expired first
+        """
+        with self._cond:
+            target = self._enqueued
+            if self._durable < target:
+                self._flush_requested = True
+                self._cond.notify_all()
+            return self._cond.wait_for(lambda: self._durable >= target, timeout)
+
+    def stats(self) -> Dict[str, Any]:
+        """Writer statistics for status resources."""
+        return {
+            "durability": self.durability,
+            "compression": self.compression.stats(),
+            "group_commit_ms": self.group_commit_ms,
+            "writes": self.writes,
+            "fsyncs": self.fsyncs,
+            "group_commits": self.group_commits,
+            "pending": len(self._pending)
+        }
+
+# Global writer shared by all tools in a server process
+artifact_writer = ArtifactWriter()
+atexit.register(artifact_writer.flush, 5.0)
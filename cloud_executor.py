@@ -0,0 +1,177 @@
+"""
+Bounded executor for blocking AnyLogic Cloud client calls.
+Runs CloudClient round trips on a thread pool so the MCP event loop stays responsive.
+"""
+
+import asyncio
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+# Sentinel meaning "use the executor's default call timeout"
+DEFAULT_TIMEOUT = object()
+
+
+class CloudCallTimeoutError(TimeoutError):
+    """Raised when an AnyLogic Cloud call does not finish within its timeout."""
+
+
+class CloudCallExecutor:
+    """Runs blocking AnyLogic Cloud calls on a bounded thread pool."""
+
+    def __init__(self, max_workers: Optional[int] = None,
+                 call_timeout: Optional[float] = None,
+                 run_timeout: Optional[float] = None,
+                 max_run_workers: Optional[int] = None):
+        self.max_workers = max_workers or int(os.getenv("ANYLOGIC_CLOUD_WORKERS", "8"))
+        # Runs wait on their own pool so long simulations never starve catalog/metadata calls
+        self.max_run_workers = max_run_workers or int(os.getenv("ANYLOGIC_RUN_WORKERS", "16"))
+        self.call_timeout = (
+            call_timeout if call_timeout is not None
+            else float(os.getenv("ANYLOGIC_CLOUD_CALL_TIMEOUT", "60"))
+        )
+        # Simulation runs legitimately take much longer than catalog/metadata calls
+        self.run_timeout = (
+            run_timeout if run_timeout is not None
+            else float(os.getenv("ANYLOGIC_RUN_TIMEOUT", "3600"))
+        )
+
+        self._executors: Dict[str, ThreadPoolExecutor] = {}
+        self._lock = threading.Lock()
+        self._queued = 0
+        self._in_flight = 0
+        self._peak_in_flight = 0
+        self._in_flight_by_operation: Dict[str, int] = {}
+        self._submitted = 0
+        self._completed = 0
+        self._failed = 0
+        self._timed_out = 0
+
+    def _get_executor(self, pool: str) -> ThreadPoolExecutor:
+        """Create the named thread pool on first use."""
+        with self._lock:
+            executor = self._executors.get(pool)
+            if executor is None:
+                executor = ThreadPoolExecutor(
+                    max_workers=self.max_run_workers if pool == "runs" else self.max_workers,
+                    thread_name_prefix=f"anylogic-{pool}"
+                )
+                self._executors[pool] = executor
+            return executor
+
+    def _run_tracked(self, ticket: Dict[str, str], operation: str, func: Callable,
+                     args: tuple, kwargs: dict) -> Any:
+        """Execute a call on a worker thread while keeping the in-flight counters accurate."""
+        with self._lock:
+            if ticket["state"] == "abandoned":
+                # Caller already timed out while this call sat in the queue
+                return None
+            ticket["state"] = "running"
+            self._queued -= 1
+            self._in_flight += 1
+            self._peak_in_flight = max(self._peak_in_flight, self._in_flight)
+            self._in_flight_by_operation[operation] = self._in_flight_by_operation.get(operation, 0) + 1
+
+        started = time.monotonic()
+        try:
+            result = func(*args, **kwargs)
+            with self._lock:
+                self._completed += 1
+            return result
+        except Exception:
+            with self._lock:
+                self._failed += 1
+            raise
+        finally:
+            with self._lock:
+                self._in_flight -= 1
+                remaining = self._in_flight_by_operation.get(operation, 1) - 1
+                if remaining:
+                    self._in_flight_by_operation[operation] = remaining
+                else:
+                    self._in_flight_by_operation.pop(operation, None)
+            logger.debug(f"Cloud call {operation} finished in {time.monotonic() - started:.2f}s")
+
+    def _abandon(self, ticket: Dict[str, str]) -> None:
+        """Drop a call that has not started yet so it never occupies a worker."""
+        with self._lock:
+            if ticket["state"] == "queued":
+                ticket["state"] = "abandoned"
+                self._queued -= 1
+
+    async def call(self, func: Callable, *args: Any, timeout: Any = DEFAULT_TIMEOUT,
+                   pool: str = "calls", **kwargs: Any) -> Any:
+        """
+        Run a blocking cloud call on the thread pool and await its result.
+
+        Args:
+            func: Blocking callable, e.g. cloud_client.get_models
+            timeout: Seconds to wait; defaults to the executor call timeout, None waits forever
+            pool: "calls" for short round trips, "runs" for simulation execution
+
+        Returns:
+            Whatever func returns
+        """
+        if timeout is DEFAULT_TIMEOUT:
+            timeout = self.call_timeout
+        operation = getattr(func, "__name__", repr(func))
+
+        ticket = {"state": "queued"}
+        with self._lock:
+            self._submitted += 1
+            self._queued += 1
+
+        loop = asyncio.get_running_loop()
+        future = loop.run_in_executor(
+            self._get_executor(pool), self._run_tracked, ticket, operation, func, args, kwargs
+        )
+
+        try:
+            return await asyncio.wait_for(future, timeout=timeout)
+        except asyncio.CancelledError:
+            self._abandon(ticket)
+            raise
+        except asyncio.TimeoutError:
+            # A running worker thread cannot be interrupted; it keeps counting as in flight until it returns
+            self._abandon(ticket)
+            with self._lock:
+                self._timed_out += 1
+            logger.warning(f"Cloud call {operation} timed out after {timeout}s")
+            raise CloudCallTimeoutError(f"AnyLogic Cloud call '{operation}' timed out after {timeout}s")
+
+    async def run(self, func: Callable, *args: Any, **kwargs: Any) -> Any:
+        """Run a long blocking call (simulation execution) using the run timeout."""
+        return await self.call(func, *args, timeout=self.run_timeout, pool="runs", **kwargs)
+
+    def metrics(self) -> Dict[str, Any]:
+        """Snapshot of executor load for status resources."""
+        with self._lock:
+            return {
+                "max_workers": self.max_workers,
+                "max_run_workers": self.max_run_workers,
+                "in_flight": self._in_flight,
+                "queued": self._queued,
+                "peak_in_flight": self._peak_in_flight,
+                "in_flight_by_operation": dict(self._in_flight_by_operation),
+                "submitted": self._submitted,
+                "completed": self._completed,
+                "failed": self._failed,
+                "timed_out": self._timed_out,
+                "call_timeout_seconds": self.call_timeout,
+                "run_timeout_seconds": self.run_timeout
+            }
+
+    def shutdown(self, wait: bool = False) -> None:
+        """Stop the thread pools."""
+        with self._lock:
+            executors, self._executors = list(self._executors.values()), {}
+        for executor in executors:
+            executor.shutdown(wait=wait)
+
+# Global executor instance shared by all tools in a server process
+cloud_executor = CloudCallExecutor()
@@ -29,6 +29,15 @@ except ImportError:
     print("uv add https://cloud.anylogic.com/files/api-8.5.0/clients/anylogiccloudclient-8.5.0-py3-none-any.whl")
     ANYLOGIC_AVAILABLE = False
 
+from simulation_ids import id_timestamp, new_simulation_id
+from simulation_registry import open_simulation_registry, page_simulations, simulation_changes
+from simulation_journal import SimulationJournal
+from results_layout import ResultsLayout
+from artifact_writer import artifact_writer
+from artifact_compression import artifact_exists
+from outputs_cache import outputs_cache
+from serialization import dumps_streamed
+
 
 # Initialize FastMCP server
 mcp = FastMCP("AnyLogic Cloud MCP Server 🚀")
@@ -52,43 +61,45 @@ def _ensure_directories():
     (exports_dir / "json").mkdir(parents=True, exist_ok=True)
     (exports_dir / "reports").mkdir(parents=True, exist_ok=True)
 
+def _simulation_record(sim_id: str, metadata: Dict[str, Any]) -> Dict[str, Any]:
+    """Build the in-memory record of a simulation from its saved metadata"""
+    return {
+        "simulation": None,  # Will be None for loaded simulations
+        "model_name": metadata.get("model_name", "Unknown"),
+        "parameters": metadata.get("parameters", {}),
+        "status": metadata.get("status", "unknown"),
+        "created": metadata.get("created", ""),
+        "completed": metadata.get("completed", ""),
+        "metadata": metadata
+    }
+
+# Location of each simulation's directory (flat, or sharded by date or hash)
+results_layout = ResultsLayout(results_dir)
+
+# Lifecycle journal: metadata.json is written once, later status changes are appended
+simulation_journal = SimulationJournal(results_dir, layout=results_layout)
+
 def _load_existing_simulations():
-    """Load existing simulations from disk on startup"""
+    """Open the simulation registry, importing new or changed result directories"""
     global current_simulations
     try:
-        for sim_dir in results_dir.glob("sim_*"):
-            if sim_dir.is_dir():
-                metadata_file = sim_dir / "metadata.json"
-                if metadata_file.exists():
-                    with open(metadata_file, "r") as f:
-                        metadata = json.load(f)
-                    
-                    sim_id = sim_dir.name
-                    current_simulations[sim_id] = {
-                        "simulation": None,  # Will be None for loaded simulations
-                        "model_name": metadata.get("model_name", "Unknown"),
-                        "parameters": metadata.get("parameters", {}),
-                        "status": metadata.get("status", "unknown"),
-                        "created": metadata.get("created", ""),
-                        "completed": metadata.get("completed", ""),
-                        "metadata": metadata
-                    }
+        # Fold status changes journaled by earlier runs into metadata.json before importing it
+        simulation_journal.compact()
+        current_simulations = open_simulation_registry(results_dir, _simulation_record, variant="fastmcp")
+        # Move result directories into the configured layout without blocking startup
+        results_layout.start_background_migration()
     except Exception as e:
         print(f"Error loading existing simulations: {e}")
 
 def _save_simulation_metadata(sim_id: str, simulation_data: Dict[str, Any]):
-    """Save simulation metadata to disk"""
-    sim_dir = results_dir / sim_id
-    sim_dir.mkdir(exist_ok=True)
-    
-    metadata_file = sim_dir / "metadata.json"
-    with open(metadata_file, "w") as f:
-        json.dump(simulation_data["metadata"], f, indent=2)
+    """Save simulation metadata to the journal and the registry"""
+    simulation_journal.write(sim_id, simulation_data["metadata"])
+    current_simulations[sim_id] = simulation_data
 
 def _save_simulation_results(sim_id: str, results: Any):
     """Save simulation results to disk"""
-    sim_dir = results_dir / sim_id
-    sim_dir.mkdir(exist_ok=True)
+    sim_dir = results_layout.sim_dir(sim_id)
+    sim_dir.mkdir(parents=True, exist_ok=True)
     
     results_file = sim_dir / "outputs.json"
     
@@ -99,8 +110,7 @@ def _save_simulation_results(sim_id: str, results: Any):
         else:
             results_data = results
         
-        with open(results_file, "w") as f:
-            json.dump(results_data, f, indent=2, default=str)
+        artifact_writer.write_json(results_file, results_data, compress=True)
     except Exception as e:
         print(f"Error saving results: {e}")
 
@@ -212,8 +222,7 @@ def run_simulation(model_name: str, parameters: Dict[str, Any] = None) -> Dict[s
     
     try:
         # Generate unique simulation ID
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        sim_id = f"sim_{timestamp}"
+        sim_id = new_simulation_id()
         
         # Find the model
         models = cloud_client.get_models()
@@ -291,10 +300,9 @@ def get_simulation_results(simulation_id: str) -> Dict[str, Any]:
         
         if simulation is None:
             # Try to load from disk
-            results_file = results_dir / simulation_id / "outputs.json"
-            if results_file.exists():
-                with open(results_file, "r") as f:
-                    results = json.load(f)
+            results_file = results_layout.sim_dir(simulation_id) / "outputs.json"
+            if artifact_exists(results_file):
+                results = outputs_cache.load(results_file)
                 return {
                     "success": True,
                     "simulation_id": simulation_id,
@@ -337,12 +345,20 @@ def get_simulation_results(simulation_id: str) -> Dict[str, Any]:
         return {"success": False, "error": f"Failed to get results: {str(e)}"}
 
 @mcp.tool
-def list_simulations() -> Dict[str, Any]:
-    """List all simulations (running and completed)"""
+def list_simulations(status: Optional[str] = None, model_name: Optional[str] = None,
+                     created_after: Optional[str] = None, created_before: Optional[str] = None,
+                     limit: Optional[int] = None, cursor: Optional[str] = None) -> Dict[str, Any]:
+    """List simulations (running and completed), newest first, filtered by status, model and creation date range (ISO; created_before is exclusive). Returns one page of at most `limit`; pass next_cursor back as `cursor` for the next page"""
     global current_simulations
     
     sim_list = []
-    for sim_id, sim_data in current_simulations.items():
+    # One page answered from the registry's indexes, newest first
+    try:
+        page = page_simulations(current_simulations, cursor=cursor, page_size=limit, status=status,
+                                model_name=model_name, created_after=created_after, created_before=created_before)
+    except ValueError as e:
+        return {"success": False, "error": str(e)}
+    for sim_id, sim_data in page["simulations"]:
         sim_info = {
             "id": sim_id,
             "model_name": sim_data["model_name"],
@@ -356,8 +372,33 @@ def list_simulations() -> Dict[str, Any]:
     return {
         "success": True,
         "simulations": sim_list,
-        "total_count": len(sim_list)
+        "total_count": page["total"],
+        "next_cursor": page["next_cursor"]
+    }
+
+@mcp.tool
+def get_simulation_changes(since: int = 0, limit: Optional[int] = None) -> Dict[str, Any]:
+    """Simulations created, changed or removed since a history version. Pass the returned version as `since` next time (0 returns everything); when "more" is true, call again right away"""
+    changes = simulation_changes(current_simulations, since=since, limit=limit)
+    sim_list = []
+    for sim_id, sim_data in changes["simulations"]:
+        sim_list.append({
+            "id": sim_id,
+            "model_name": sim_data["model_name"],
+            "status": sim_data["status"],
+            "created": sim_data["created"],
+            "completed": sim_data["completed"]
+        })
+    
+    result = {
+        "success": True,
+        "simulations": sim_list,
+        "removed": changes["removed"],
+        "version": changes["version"],
+        "more": changes["more"]
     }
+    
+    return result
 
 @mcp.tool
 def export_simulation_results(simulation_id: str, format_type: str = "json") -> Dict[str, Any]:
@@ -370,12 +411,11 @@ def export_simulation_results(simulation_id: str, format_type: str = "json") ->
     
     try:
         # Load results
-        results_file = results_dir / simulation_id / "outputs.json"
-        if not results_file.exists():
+        results_file = results_layout.sim_dir(simulation_id) / "outputs.json"
+        if not artifact_exists(results_file):
             return {"success": False, "error": f"No results file found for {simulation_id}"}
         
-        with open(results_file, "r") as f:
-            results = json.load(f)
+        results = outputs_cache.load(results_file)
         
         # Export based on format
         if format_type == "json":
@@ -425,11 +465,13 @@ def cleanup_simulations(days_old: int = 30, status_filter: str = "completed") ->
         for sim_id in list(current_simulations.keys()):
             sim_data = current_simulations[sim_id]
             
-            # Parse creation date
+            # Parse creation date, falling back to the timestamp in the simulation ID
             try:
                 created_date = datetime.fromisoformat(sim_data["created"].replace("Z", "+00:00"))
             except:
-                continue
+                created_date = id_timestamp(sim_id)
+                if created_date is None:
+                    continue
             
             # Check if simulation meets cleanup criteria
             if created_date < cutoff_date:
@@ -438,10 +480,12 @@ def cleanup_simulations(days_old: int = 30, status_filter: str = "completed") ->
                     del current_simulations[sim_id]
                     
                     # Remove from disk
-                    sim_dir = results_dir / sim_id
+                    sim_dir = results_layout.sim_dir(sim_id)
                     if sim_dir.exists():
                         import shutil
+                        outputs_cache.invalidate_dir(sim_dir)
                         shutil.rmtree(sim_dir)
+                        simulation_journal.forget(sim_id)
                     
                     cleaned_count += 1
         
@@ -507,24 +551,35 @@ def get_connection_status() -> str:
 
 @mcp.resource("anylogic://simulations/history")
 def get_simulation_history() -> str:
-    """Complete simulation history resource"""
-    history = {
-        "total_simulations": len(current_simulations),
-        "simulations": []
-    }
+    """Simulation history resource, newest first, one page at a time"""
+    return _simulation_history_page(None)
+
+@mcp.resource("anylogic://simulations/history/{cursor}")
+def get_simulation_history_page(cursor: str) -> str:
+    """Later pages of the simulation history (cursor from next_cursor)"""
+    return _simulation_history_page(cursor)
+
+def _simulation_history_page(cursor: Optional[str]) -> str:
+    try:
+        page = page_simulations(current_simulations, cursor=cursor)
+    except ValueError as e:
+        return json.dumps({"error": str(e)})
     
-    for sim_id, sim_data in current_simulations.items():
-        sim_info = {
+    history = {
+        "total_simulations": page["total"],
+        "next_cursor": page["next_cursor"],
+        # Generated while encoding instead of collected into a list first
+        "simulations": ({
             "id": sim_id,
             "model_name": sim_data["model_name"],
             "status": sim_data["status"],
             "created": sim_data["created"],
             "completed": sim_data["completed"],
             "parameter_count": len(sim_data["parameters"])
-        }
-        history["simulations"].append(sim_info)
+        } for sim_id, sim_data in page["simulations"])
+    }
     
-    return json.dumps(history, indent=2)
+    return dumps_streamed(history)
 
 @mcp.resource("anylogic://simulation/{simulation_id}")
 def get_simulation_resource(simulation_id: str) -> str:
@@ -537,12 +592,11 @@ def get_simulation_resource(simulation_id: str) -> str:
     sim_data = current_simulations[simulation_id]
     
     # Try to load results if available
-    results_file = results_dir / simulation_id / "outputs.json"
+    results_file = results_layout.sim_dir(simulation_id) / "outputs.json"
     results = None
-    if results_file.exists():
+    if artifact_exists(results_file):
         try:
-            with open(results_file, "r") as f:
-                results = json.load(f)
+            results = outputs_cache.load(results_file)
         except:
             pass
     
@@ -559,7 +613,8 @@ def get_simulation_resource(simulation_id: str) -> str:
     if results:
         resource_data["results"] = results
     
-    return json.dumps(resource_data, indent=2)
+    # Encoded key by key rather than through an indented copy of the whole outputs
+    return dumps_streamed(resource_data)
 
 # ============================================================================
 # PROMPTS
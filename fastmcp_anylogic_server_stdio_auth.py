@@ -68,6 +68,20 @@ except ImportError:
     ANYLOGIC_AVAILABLE = False
     CloudClient = None
 
+from cloud_executor import cloud_executor
+from model_catalog import ModelCatalog, model_catalogs
+from simulation_runner import background_runs, serialize_run_outputs
+from result_cache import result_cache
+from simulation_ids import id_timestamp, new_simulation_id
+from simulation_registry import open_simulation_registry, page_simulations, simulation_changes
+from simulation_journal import SimulationJournal
+from results_layout import ResultsLayout
+from artifact_writer import artifact_writer
+from artifact_compression import artifact_exists
+from outputs_cache import outputs_cache
+from serialization import dumps_response, dumps_streamed, project_fields
+from output_arrays import OutputArrayStore
+
 # Initialize FastMCP server
 server_name = "AnyLogic Cloud MCP Server"
 if AUTH_AVAILABLE:
@@ -77,6 +91,7 @@ mcp = FastMCP(server_name)
 
 # Global state
 cloud_client: Optional[CloudClient] = None
+model_catalog: Optional[ModelCatalog] = None
 current_simulations: Dict[str, Any] = {}
 
 # Storage directories - use absolute path based on script location
@@ -94,25 +109,32 @@ for directory in [simulations_dir, results_dir, exports_dir,
                   exports_dir / "csv", exports_dir / "json", exports_dir / "reports"]:
     directory.mkdir(parents=True, exist_ok=True)
 
+# Location of each simulation's directory (flat, or sharded by date or hash)
+results_layout = ResultsLayout(results_dir)
+
+# Cached run outputs live next to the results
+result_cache.use_storage_dir(simulations_dir)
+
+# Lifecycle journal: metadata.json is written once, later status changes are appended
+simulation_journal = SimulationJournal(results_dir, layout=results_layout)
+
+# Numeric output series are stored as memory-mapped arrays next to outputs.json
+output_arrays = OutputArrayStore(results_dir, layout=results_layout)
+
 # Load existing simulations on startup
 def load_existing_simulations():
-    """Load existing simulation metadata from disk."""
+    """Open the simulation registry, importing new or changed result directories."""
     global current_simulations
-    loaded_count = 0
-    
-    for sim_dir in results_dir.iterdir():
-        if sim_dir.is_dir() and sim_dir.name.startswith("sim_"):
-            metadata_file = sim_dir / "metadata.json"
-            if metadata_file.exists():
-                try:
-                    with open(metadata_file, 'r') as f:
-                        metadata = json.load(f)
-                    current_simulations[sim_dir.name] = metadata
-                    loaded_count += 1
-                except Exception as e:
-                    logger.warning(f"Failed to load simulation {sim_dir.name}: {e}")
-    
-    logger.info(f"Loaded {loaded_count} existing simulations")
+    # Fold status changes journaled by earlier runs into metadata.json before importing it
+    simulation_journal.compact()
+    current_simulations = open_simulation_registry(
+        results_dir, lambda sim_id, metadata: metadata, variant="fastmcp_stdio_auth"
+    )
+    # Runs left queued or running by an earlier process will never finish
+    background_runs.fail_orphaned(current_simulations, _save_simulation_metadata)
+    # Move result directories into the configured layout without blocking startup
+    results_layout.start_background_migration()
+    logger.info(f"Loaded {len(current_simulations)} existing simulations")
 
 # Authentication helper for stdio transport
 def get_auth_token_from_env():
@@ -138,6 +160,100 @@ def authenticate_stdio_request():
         set_user_context(None)
         return None
 
+def _save_simulation_metadata(sim_id: str, sim_metadata: Dict[str, Any]):
+    """Save simulation metadata to the journal (excluding the simulation object) and the registry."""
+    metadata_copy = sim_metadata.copy()
+    metadata_copy.pop("simulation", None)
+    simulation_journal.write(sim_id, metadata_copy)
+    
+    current_simulations[sim_id] = sim_metadata
+
+async def _complete_simulation(sim_id: str, simulation: Any, model_name: str, param_dict: Dict[str, Any],
+                               model_id: Any = None, version_id: Any = None):
+    """Wait for a created simulation to finish, then persist its outputs and final status."""
+    sim_metadata = current_simulations[sim_id]
+    sim_metadata["status"] = "running"
+    await asyncio.to_thread(_save_simulation_metadata, sim_id, sim_metadata)
+    
+    # Run simulation and get outputs
+    logger.info(f"Running simulation {sim_id} and waiting for completion...")
+    try:
+        outputs = await cloud_executor.run(simulation.get_outputs_and_run_if_absent)
+        logger.info(f"Simulation {sim_id} completed successfully")
+    except asyncio.CancelledError:
+        logger.warning(f"Simulation {sim_id} was cancelled before it finished")
+        sim_metadata["status"] = "failed"
+        sim_metadata["error"] = "Cancelled before the run finished"
+        sim_metadata["completion_time"] = datetime.now().isoformat()
+        _save_simulation_metadata(sim_id, sim_metadata)
+        raise
+    except Exception as e:
+        logger.error(f"Failed to run simulation or get outputs: {e}")
+        sim_metadata["status"] = "failed"
+        sim_metadata["error"] = str(e)
+        sim_metadata["completion_time"] = datetime.now().isoformat()
+        await asyncio.to_thread(_save_simulation_metadata, sim_id, sim_metadata)
+        raise Exception(f"Simulation execution failed: {str(e)}")
+    
+    # Disk writes wait for their fsync, so they run off the event loop
+    await asyncio.to_thread(_save_simulation_outputs, sim_id, model_name, param_dict, outputs, model_id, version_id)
+    
+    sim_metadata["status"] = "completed"
+    sim_metadata["completion_time"] = datetime.now().isoformat()
+    await asyncio.to_thread(_save_simulation_metadata, sim_id, sim_metadata)
+
+def _save_simulation_outputs(sim_id: str, model_name: str, param_dict: Dict[str, Any], outputs: Any,
+                             model_id: Any = None, version_id: Any = None):
+    """Write a finished run's outputs.json (and its result cache entry)."""
+    sim_dir = results_layout.sim_dir(sim_id)
+    
+    # Save simulation outputs
+    try:
+        logger.info("Saving simulation outputs...")
+        output_data = serialize_run_outputs(sim_id, model_name, param_dict, outputs)
+        
+        artifact_writer.write_json(sim_dir / "outputs.json", output_arrays.extract(sim_id, output_data), compress=True)
+        
+        logger.info(f"Saved simulation outputs to {sim_dir / 'outputs.json'}")
+        
+        if model_id is not None and version_id is not None:
+            result_cache.store(model_id, version_id, param_dict, output_data, sim_id)
+        
+    except Exception as e:
+        logger.error(f"Failed to save outputs: {e}")
+        # Save basic output info
+        basic_output = {
+            "simulation_id": sim_id,
+            "status": "completed",
+            "message": "Outputs available but failed to serialize details",
+            "error": str(e)
+        }
+        artifact_writer.write_json(sim_dir / "outputs.json", basic_output, compress=True)
+
+def _register_cached_simulation(sim_id: str, model_name: str, param_dict: Dict[str, Any],
+                                cache_entry: Dict[str, Any]):
+    """Record a run answered from the result cache as a completed simulation."""
+    user = get_user_context()
+    now = datetime.now().isoformat()
+    sim_metadata = {
+        "id": sim_id,
+        "model_name": model_name,
+        "parameters": param_dict,
+        "start_time": now,
+        "completion_time": now,
+        "status": "completed",
+        "user": user.username if user else "unknown",
+        "cached_from": cache_entry.get("source_simulation"),
+        "simulation": None
+    }
+    current_simulations[sim_id] = sim_metadata
+    _save_simulation_metadata(sim_id, sim_metadata)
+    
+    output_data = dict(cache_entry.get("outputs") or {})
+    output_data["simulation_id"] = sim_id
+    output_data["cached_from"] = cache_entry.get("source_simulation")
+    artifact_writer.write_json(results_layout.sim_dir(sim_id) / "outputs.json", output_arrays.extract(sim_id, output_data), compress=True)
+
 # =============================================================================
 # PUBLIC TOOLS (Tier 1) - No authentication required
 # =============================================================================
@@ -174,7 +290,7 @@ async def get_server_info() -> str:
         "setup_guide": "See AUTHENTICATION_SETUP.md for configuration instructions"
     }
     
-    return json.dumps(info, indent=2)
+    return dumps_response(info)
 
 @mcp.tool()
 async def get_auth_instructions() -> str:
@@ -226,7 +342,7 @@ async def get_auth_instructions() -> str:
         if stdio_user.is_privileged:
             instructions["current_access"] += " (Privileged - can run simulations)"
     
-    return json.dumps(instructions, indent=2)
+    return dumps_response(instructions)
 
 # =============================================================================
 # AUTHENTICATED TOOLS (Tier 2) - Requires GitHub OAuth
@@ -239,7 +355,7 @@ async def connect_anylogic(api_key: str = "", cloud_url: str = "") -> str:
     Connect to AnyLogic Cloud API.
     Requires authentication.
     """
-    global cloud_client
+    global cloud_client, model_catalog
     
     if not ANYLOGIC_AVAILABLE:
         raise Exception("AnyLogic Cloud client not available")
@@ -252,6 +368,7 @@ async def connect_anylogic(api_key: str = "", cloud_url: str = "") -> str:
     
     try:
         cloud_client = CloudClient(api_key, cloud_url)
+        model_catalog = model_catalogs.get(f"{cloud_url}|{api_key}", cloud_client)
         user = get_user_context()
         user_info = f" (user: {user.username})" if user else ""
         logger.info(f"Connected to AnyLogic Cloud{user_info}")
@@ -262,24 +379,26 @@ async def connect_anylogic(api_key: str = "", cloud_url: str = "") -> str:
 
 @mcp.tool()
 @require_auth
-async def list_models() -> str:
+async def list_models(refresh: bool = False, fields: Optional[str] = None) -> str:
     """
     List available models in user's AnyLogic Cloud account.
+    Set refresh=True to bypass the cached model catalog; `fields` (e.g. "id,name")
+    limits the keys returned per model.
     Requires authentication.
     """
     if not cloud_client:
         raise Exception("Not connected to AnyLogic Cloud. Use connect_anylogic first.")
     
     try:
-        models = cloud_client.get_models()
+        models = await model_catalog.get_models(force_refresh=refresh)
         user = get_user_context()
         user_info = f" for user {user.username}" if user else ""
         logger.info(f"Listed {len(models)} models{user_info}")
-        return json.dumps([{
+        return dumps_response(project_fields([{
             "id": model.id,
             "name": model.name,
             "version": model.version if hasattr(model, 'version') else 'Unknown'
-        } for model in models], indent=2)
+        } for model in models], fields))
     except Exception as e:
         logger.error(f"Failed to list models: {e}")
         raise Exception(f"Failed to list models: {str(e)}")
@@ -297,7 +416,7 @@ async def list_demo_models() -> str:
     try:
         # Use the same method as list_models since demo models are typically part of regular models
         # or use a different approach if the API has specific demo access
-        models = cloud_client.get_models()
+        models = await model_catalog.get_models()
         
         # Filter for demo/public models if needed, or return all available models
         # Since we're using the demo API key, all returned models should be demo models
@@ -314,56 +433,110 @@ async def list_demo_models() -> str:
         user_info = f" for user {user.username}" if user else ""
         logger.info(f"Listed {len(demo_models)} demo models{user_info}")
         
-        return json.dumps(demo_models, indent=2)
+        return dumps_response(demo_models)
     except Exception as e:
         logger.error(f"Failed to list demo models: {e}")
         raise Exception(f"Failed to list demo models: {str(e)}")
 
 @mcp.tool()
 @require_auth
-async def get_simulation_results(simulation_id: str) -> str:
+async def get_simulation_results(simulation_id: str, include_arrays: bool = False,
+                                 fields: Optional[str] = None) -> str:
     """
     Get results from a completed simulation.
+    Stored output series are summarized (shape, min, max, mean) unless include_arrays is set;
+    `fields` (e.g. "Throughput,Queue.mean") limits the output keys returned.
     Requires authentication.
     """
     if simulation_id not in current_simulations:
         raise Exception(f"Simulation {simulation_id} not found")
     
-    results_file = results_dir / simulation_id / "outputs.json"
-    if not results_file.exists():
+    status = current_simulations[simulation_id].get("status", "unknown")
+    if status in ("queued", "running"):
+        raise Exception(f"Simulation {simulation_id} is still {status}; results are not available yet")
+    if status == "failed":
+        error = current_simulations[simulation_id].get("error", "unknown error")
+        raise Exception(f"Simulation {simulation_id} failed: {error}")
+    
+    results_file = results_layout.sim_dir(simulation_id) / "outputs.json"
+    if not artifact_exists(results_file):
         raise Exception(f"Results not available for simulation {simulation_id}")
     
     try:
-        with open(results_file, 'r') as f:
-            results = json.load(f)
+        results = outputs_cache.load(results_file)
+        results = output_arrays.resolve(simulation_id, results, materialize=include_arrays)
         user = get_user_context()
         user_info = f" by user {user.username}" if user else ""
         logger.info(f"Retrieved results for simulation {simulation_id}{user_info}")
-        return json.dumps(results, indent=2)
+        return dumps_response(project_fields(results, fields))
     except Exception as e:
         logger.error(f"Failed to get results for simulation {simulation_id}: {e}")
         raise Exception(f"Failed to get simulation results: {str(e)}")
 
 @mcp.tool()
 @require_auth
-async def list_simulations(status_filter: str = "all") -> str:
+async def list_simulations(status_filter: str = "all", model_name: Optional[str] = None,
+                           username: Optional[str] = None, created_after: Optional[str] = None,
+                           created_before: Optional[str] = None, limit: Optional[int] = None,
+                           cursor: Optional[str] = None, fields: Optional[str] = None) -> str:
     """
-    List all simulations with optional status filter.
+    List simulations, newest first, filtered by status, model, user and creation
+    date range (ISO dates/times; created_before is exclusive). Returns one page of
+    at most `limit` simulations; pass the returned next_cursor to get the next page.
+    `fields` (e.g. "status,created") limits the keys returned per simulation.
     Requires authentication.
     """
     filtered_sims = {}
     
-    for sim_id, sim_data in current_simulations.items():
-        if status_filter == "all" or sim_data.get("status", "unknown") == status_filter:
-            # Remove simulation object to make it JSON serializable
-            sim_copy = sim_data.copy()
-            sim_copy.pop("simulation", None)
-            filtered_sims[sim_id] = sim_copy
+    # Answered from the registry's indexes, so only the page's simulations are read
+    try:
+        page = page_simulations(
+            current_simulations,
+            cursor=cursor,
+            page_size=limit,
+            status=None if status_filter == "all" else status_filter,
+            model_name=model_name,
+            user=username,
+            created_after=created_after,
+            created_before=created_before
+        )
+    except ValueError as e:
+        raise Exception(str(e))
+    for sim_id, sim_data in page["simulations"]:
+        # Remove simulation object to make it JSON serializable
+        filtered_sims[sim_id] = project_fields(
+            {key: value for key, value in sim_data.items() if key != "simulation"}, fields
+        )
     
     user = get_user_context()
     user_info = f" by user {user.username}" if user else ""
     logger.info(f"Listed {len(filtered_sims)} simulations (filter: {status_filter}){user_info}")
-    return json.dumps(filtered_sims, indent=2)
+    return dumps_response({
+        "simulations": filtered_sims,
+        "total": page["total"],
+        "next_cursor": page["next_cursor"]
+    })
+
+@mcp.tool()
+@require_auth
+async def get_simulation_changes(since: int = 0, limit: Optional[int] = None) -> str:
+    """
+    Simulations created, changed or removed since a version of the history.
+    Pass the returned version as `since` on the next call to receive only newer
+    changes (0 returns everything). When "more" is true, call again right away.
+    Requires authentication.
+    """
+    changes = simulation_changes(current_simulations, since=since, limit=limit)
+    changed = {
+        sim_id: {key: value for key, value in sim_data.items() if key != "simulation"}
+        for sim_id, sim_data in changes["simulations"]
+    }
+    return dumps_response({
+        "simulations": changed,
+        "removed": changes["removed"],
+        "version": changes["version"],
+        "more": changes["more"]
+    })
 
 # =============================================================================
 # PRIVILEGED TOOLS (Tier 3) - Requires privileged GitHub user
@@ -371,9 +544,14 @@ async def list_simulations(status_filter: str = "all") -> str:
 
 @mcp.tool()
 @require_privileged_auth
-async def run_simulation(model_name: str, parameters: str = "{}") -> str:
+async def run_simulation(model_name: str, parameters: str = "{}", wait: bool = True,
+                         use_cache: bool = True) -> str:
     """
     Run a simulation with specified parameters.
+    Set wait=False to submit the run and return its simulation ID immediately;
+    it completes in the background (check list_simulations or get_simulation_results).
+    An identical earlier run of the same model version is answered from the result
+    cache; set use_cache=False to force a fresh run.
     Requires privileged access - only authorized users can run simulations.
     """
     if not cloud_client:
@@ -384,31 +562,24 @@ async def run_simulation(model_name: str, parameters: str = "{}") -> str:
         param_dict = json.loads(parameters) if parameters else {}
         
         # Create simulation ID
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        sim_id = f"sim_{timestamp}"
-        
-        # Get model - search by name or ID first
-        models = cloud_client.get_models()
-        target_model = None
-        
-        # Try to find by exact ID first
-        for model in models:
-            if model.id == model_name:
-                target_model = model
-                break
-        
-        # If not found by ID, try by name match
-        if not target_model:
-            for model in models:
-                if model_name.lower() in model.name.lower():
-                    target_model = model
-                    break
+        sim_id = new_simulation_id()
         
-        if not target_model:
-            raise Exception(f"Model '{model_name}' not found")
+        # Resolve model by id, exact name or closest fuzzy match
+        target_model = await model_catalog.resolve(model_name)
         
         logger.info(f"Found model: {target_model.name} (ID: {target_model.id})")
         
+        # Identical runs of the same model version reuse stored outputs
+        version = await model_catalog.get_version(target_model)
+        if use_cache:
+            cache_entry = result_cache.lookup(target_model.id, version.id, param_dict)
+            if cache_entry is not None:
+                await asyncio.to_thread(_register_cached_simulation, sim_id, target_model.name, param_dict,
+                                        cache_entry)
+                logger.info(f"Simulation {sim_id} served from cache of {cache_entry.get('source_simulation')}")
+                return (f"♻️ Completed simulation {sim_id} for model '{target_model.name}' from cached results "
+                        f"of {cache_entry.get('source_simulation')}. Results saved to disk.")
+        
         # Use correct AnyLogic Cloud API workflow:
         # 1. Get model and version
         # 2. Create inputs from model version  
@@ -416,148 +587,51 @@ async def run_simulation(model_name: str, parameters: str = "{}") -> str:
         # 4. Create simulation with inputs (not model)
         
         try:
-            logger.info("Getting latest model version...")
-            version = cloud_client.get_latest_model_version(target_model)
+            logger.info("Getting latest model version and default inputs...")
+            version, inputs = await model_catalog.default_inputs(target_model)
             logger.info(f"Got version: {version}")
             
-            logger.info("Creating default inputs...")
-            inputs = cloud_client.create_default_inputs(version)
-            logger.info("Default inputs created successfully")
-            
             # Set parameters from param_dict
             for key, value in param_dict.items():
                 logger.info(f"Setting input parameter: {key} = {value}")
                 inputs.set_input(key, value)
             
             logger.info("Creating simulation with inputs...")
-            simulation = cloud_client.create_simulation(inputs)
+            simulation = await cloud_executor.call(cloud_client.create_simulation, inputs)
             logger.info("Simulation created successfully")
             
         except Exception as e:
             logger.error(f"Failed in AnyLogic Cloud API workflow: {e}")
             raise Exception(f"Simulation creation failed: {str(e)}")
         
-        # Run simulation and get outputs (better approach)
-        logger.info("Running simulation and waiting for completion...")
-        try:
-            outputs = simulation.get_outputs_and_run_if_absent()
-            logger.info("Simulation completed successfully")
-        except Exception as e:
-            logger.error(f"Failed to run simulation or get outputs: {e}")
-            raise Exception(f"Simulation execution failed: {str(e)}")
-        
-        # Store simulation metadata
+        # Register the run before it executes so list_simulations can see it
         user = get_user_context()
         sim_metadata = {
             "id": sim_id,
             "model_name": target_model.name,
             "parameters": param_dict,
             "start_time": datetime.now().isoformat(),
-            "completion_time": datetime.now().isoformat(),
-            "status": "completed",
+            "completion_time": "",
+            "status": "queued",
+            "owner": background_runs.owner,
             "user": user.username if user else "unknown",
             "simulation": simulation  # This will be excluded from JSON serialization
         }
         
         current_simulations[sim_id] = sim_metadata
+        await asyncio.to_thread(_save_simulation_metadata, sim_id, sim_metadata)
         
-        # Save results to disk
-        sim_dir = results_dir / sim_id
-        sim_dir.mkdir(exist_ok=True)
+        task = background_runs.submit(sim_id, _complete_simulation(sim_id, simulation, target_model.name,
+                                                                   param_dict, target_model.id, version.id))
+        if not wait:
+            user_info = f" by privileged user {user.username}" if user else ""
+            logger.info(f"Submitted simulation {sim_id}{user_info}")
+            return (f"🚀 Submitted simulation {sim_id} for model '{target_model.name}' (status: queued). "
+                    "Use list_simulations or get_simulation_results to check progress.")
         
-        # Save metadata (excluding simulation object)
-        metadata_copy = sim_metadata.copy()
-        metadata_copy.pop("simulation", None)
+        # The background task owns the run, so a cancelled request does not leave it running
+        await asyncio.shield(task)
         
-        with open(sim_dir / "metadata.json", 'w') as f:
-            json.dump(metadata_copy, f, indent=2)
-        
-        # Save simulation outputs
-        try:
-            logger.info("Saving simulation outputs...")
-            
-            # Extract serializable data from outputs
-            output_data = {
-                "simulation_id": sim_id,
-                "model_name": target_model.name,
-                "parameters": param_dict,
-                "completion_time": datetime.now().isoformat(),
-                "status": "completed"
-            }
-            
-            # Try to get raw outputs safely
-            if hasattr(outputs, 'get_raw_outputs'):
-                try:
-                    raw_outputs = outputs.get_raw_outputs()
-                    logger.info(f"Raw outputs type: {type(raw_outputs)}")
-                    
-                    # Convert raw outputs to serializable format
-                    serializable_outputs = []
-                    if isinstance(raw_outputs, list):
-                        for item in raw_outputs:
-                            try:
-                                # Extract basic info from each output item
-                                output_item = {
-                                    "name": getattr(item, 'name', str(item)),
-                                    "value": getattr(item, 'value', None),
-                                    "type": str(type(item).__name__),
-                                    "string_representation": str(item)
-                                }
-                                serializable_outputs.append(output_item)
-                            except Exception as e:
-                                logger.warning(f"Failed to serialize output item: {e}")
-                                serializable_outputs.append({"error": str(e), "raw_str": str(item)})
-                    
-                    output_data["raw_outputs"] = serializable_outputs
-                    logger.info(f"Processed {len(serializable_outputs)} output items")
-                    
-                except Exception as e:
-                    logger.warning(f"Failed to process raw outputs: {e}")
-                    output_data["raw_outputs"] = {"error": str(e)}
-            
-            # Try to get output names
-            if hasattr(outputs, 'names'):
-                try:
-                    names = outputs.names()
-                    output_data["output_names"] = names if isinstance(names, (list, tuple)) else [str(names)]
-                except Exception as e:
-                    logger.warning(f"Failed to get output names: {e}")
-                    output_data["output_names"] = {"error": str(e)}
-            
-            # Try to get individual output values by name
-            if hasattr(outputs, 'names') and hasattr(outputs, 'value'):
-                try:
-                    names = outputs.names()
-                    individual_outputs = {}
-                    for name in names:
-                        try:
-                            value = outputs.value(name)
-                            individual_outputs[name] = value
-                        except Exception as e:
-                            individual_outputs[name] = {"error": str(e)}
-                    output_data["individual_outputs"] = individual_outputs
-                except Exception as e:
-                    logger.warning(f"Failed to get individual outputs: {e}")
-                    output_data["individual_outputs"] = {"error": str(e)}
-            
-            with open(sim_dir / "outputs.json", 'w') as f:
-                json.dump(output_data, f, indent=2)
-            
-            logger.info(f"Saved simulation outputs to {sim_dir / 'outputs.json'}")
-            
-        except Exception as e:
-            logger.error(f"Failed to save outputs: {e}")
-            # Save basic output info
-            basic_output = {
-                "simulation_id": sim_id,
-                "status": "completed",
-                "message": "Outputs available but failed to serialize details",
-                "error": str(e)
-            }
-            with open(sim_dir / "outputs.json", 'w') as f:
-                json.dump(basic_output, f, indent=2)
-        
-        user = get_user_context()
         user_info = f" by privileged user {user.username}" if user else ""
         logger.info(f"Completed simulation {sim_id}{user_info}")
         return f"✅ Completed simulation {sim_id} for model '{target_model.name}'. Results saved to disk."
@@ -576,13 +650,12 @@ async def export_simulation_results(simulation_id: str, format: str = "json") ->
     if simulation_id not in current_simulations:
         raise Exception(f"Simulation {simulation_id} not found")
     
-    results_file = results_dir / simulation_id / "outputs.json"
-    if not results_file.exists():
+    results_file = results_layout.sim_dir(simulation_id) / "outputs.json"
+    if not artifact_exists(results_file):
         raise Exception(f"Results not available for simulation {simulation_id}")
     
     try:
-        with open(results_file, 'r') as f:
-            results = json.load(f)
+        results = outputs_cache.load(results_file)
         
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         
@@ -596,8 +669,19 @@ async def export_simulation_results(simulation_id: str, format: str = "json") ->
                     writer.writerow(["Parameter", "Value"])
                     for key, value in results["outputs"].items():
                         writer.writerow([key, value])
+            
+            # Stored output series, one row per element, read from the memory-mapped arrays
+            arrays = list(output_arrays.iter_arrays(simulation_id))
+            if arrays:
+                with open(export_file, 'a', newline='') as csvfile:
+                    writer = csv.writer(csvfile)
+                    writer.writerow(["Array", "Index", "Value"])
+                    for name, array in arrays:
+                        for index, row in enumerate(array):
+                            writer.writerow([name, index, *(row.tolist() if array.ndim > 1 else [row.item()])])
         else:
             export_file = exports_dir / "json" / f"{simulation_id}_{timestamp}.json"
+            results = output_arrays.resolve(simulation_id, results, materialize=True)
             with open(export_file, 'w') as f:
                 json.dump(results, f, indent=2)
         
@@ -622,22 +706,27 @@ async def cleanup_simulations(days_old: int = 30, status_filter: str = "complete
     
     for sim_id, sim_data in list(current_simulations.items()):
         start_time_str = sim_data.get("start_time", "")
-        if start_time_str:
-            try:
+        try:
+            if start_time_str:
                 start_time = datetime.fromisoformat(start_time_str.replace('Z', '+00:00'))
-                if start_time < cutoff_date and (status_filter == "all" or sim_data.get("status") == status_filter):
-                    # Remove from memory
-                    del current_simulations[sim_id]
-                    
-                    # Remove from disk
-                    sim_dir = results_dir / sim_id
-                    if sim_dir.exists():
-                        import shutil
-                        shutil.rmtree(sim_dir)
-                    
-                    cleaned_count += 1
-            except Exception as e:
-                logger.warning(f"Failed to parse start time for {sim_id}: {e}")
+            else:
+                # Records without a start time fall back to the timestamp in the simulation ID
+                start_time = id_timestamp(sim_id)
+            if start_time is not None and start_time < cutoff_date and (status_filter == "all" or sim_data.get("status") == status_filter):
+                # Remove from memory
+                del current_simulations[sim_id]
+                
+                # Remove from disk
+                sim_dir = results_layout.sim_dir(sim_id)
+                if sim_dir.exists():
+                    import shutil
+                    outputs_cache.invalidate_dir(sim_dir)
+                    shutil.rmtree(sim_dir)
+                    simulation_journal.forget(sim_id)
+                
+                cleaned_count += 1
+        except Exception as e:
+            logger.warning(f"Failed to parse start time for {sim_id}: {e}")
     
     user = get_user_context()
     user_info = f" by privileged user {user.username}" if user else ""
@@ -666,12 +755,16 @@ async def connection_status() -> str:
     status = {
         "connected": cloud_client is not None,
         "anylogic_available": ANYLOGIC_AVAILABLE,
+        "cloud_calls": cloud_executor.metrics(),
+        "model_catalog": model_catalog.stats() if model_catalog else None,
+        "result_cache": result_cache.stats(),
+        "outputs_cache": outputs_cache.stats(),
         "authentication_available": AUTH_AVAILABLE,
         "authentication_status": auth_info,
         "server": server_name,
         "transport": "stdio"
     }
-    return json.dumps(status, indent=2)
+    return dumps_response(status)
 
 @mcp.resource("anylogic://models")
 async def available_models() -> str:
@@ -689,18 +782,26 @@ async def available_models() -> str:
         return json.dumps({"error": "Not connected to AnyLogic Cloud"})
     
     try:
-        models = cloud_client.get_models()
-        return json.dumps([{
+        models = await model_catalog.get_models()
+        return dumps_response([{
             "id": model.id,
             "name": model.name,
             "version": model.version if hasattr(model, 'version') else 'Unknown'
-        } for model in models], indent=2)
+        } for model in models])
     except Exception as e:
         return json.dumps({"error": f"Failed to get models: {str(e)}"})
 
 @mcp.resource("anylogic://simulations/history")
 async def simulations_history() -> str:
-    """Simulation history - requires authentication."""
+    """Simulation history, newest first, one page at a time - requires authentication."""
+    return _simulations_history_page(None)
+
+@mcp.resource("anylogic://simulations/history/{cursor}")
+async def simulations_history_page(cursor: str) -> str:
+    """Later pages of the simulation history (cursor from next_cursor) - requires authentication."""
+    return _simulations_history_page(cursor)
+
+def _simulations_history_page(cursor: Optional[str]) -> str:
     if not AUTH_AVAILABLE:
         return json.dumps({"error": "Authentication system not available"})
     
@@ -710,14 +811,23 @@ async def simulations_history() -> str:
     if not stdio_user:
         return json.dumps({"error": "Authentication required - set MCP_AUTH_TOKEN environment variable"})
     
-    # Remove simulation objects to make it JSON serializable
-    history = {}
-    for sim_id, sim_data in current_simulations.items():
-        sim_copy = sim_data.copy()
-        sim_copy.pop("simulation", None)
-        history[sim_id] = sim_copy
+    try:
+        page = page_simulations(current_simulations, cursor=cursor)
+    except ValueError as e:
+        return json.dumps({"error": str(e)})
+    
+    # Entries are generated while encoding instead of collected first; simulation
+    # objects are left out to keep them JSON serializable
+    history = (
+        {"id": sim_id, **{key: value for key, value in sim_data.items() if key != "simulation"}}
+        for sim_id, sim_data in page["simulations"]
+    )
     
-    return json.dumps(history, indent=2)
+    return dumps_streamed({
+        "simulations": history,
+        "total": page["total"],
+        "next_cursor": page["next_cursor"]
+    })
 
 @mcp.resource("anylogic://simulation/{simulation_id}")
 async def simulation_details(simulation_id: str) -> str:
@@ -738,7 +848,7 @@ async def simulation_details(simulation_id: str) -> str:
     sim_data = current_simulations[simulation_id].copy()
     sim_data.pop("simulation", None)
     
-    return json.dumps(sim_data, indent=2)
+    return dumps_response(sim_data)
 
 # =============================================================================
 # PROMPTS
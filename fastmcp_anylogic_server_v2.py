@@ -16,7 +16,7 @@ from typing import Any, Dict, List, Optional
 import csv
 
 # Official MCP imports using FastMCP pattern
-from mcp.server.fastmcp import FastMCP
+from mcp.server.fastmcp import Context, FastMCP
 
 # Configure logging to stderr (not stdout) for MCP servers
 logging.basicConfig(
@@ -37,17 +37,36 @@ except ImportError:
     # Define a placeholder type for when CloudClient is not available
     CloudClient = None
 
+from cloud_executor import cloud_executor
+from model_catalog import ModelCatalog, model_catalogs
+from model_index import ModelLookupError
+from simulation_poller import SimulationPoller
+from result_cache import result_cache
+from simulation_ids import id_timestamp, new_simulation_id, simulation_ids
+from simulation_registry import open_simulation_registry, page_simulations, simulation_changes
+from simulation_journal import SimulationJournal
+from results_layout import ResultsLayout
+from artifact_writer import artifact_writer
+from artifact_compression import artifact_exists
+from outputs_cache import outputs_cache
+from serialization import dumps_response, dumps_streamed, project_fields
+from parameter_sweep import SweepDefinitionError, build_points, sweep_runner
+from replication_stats import ReplicationStatistics
+from simulation_runner import background_runs, serialize_run_outputs
+
 # Initialize FastMCP server using official pattern
 mcp = FastMCP("AnyLogic Cloud MCP Server")
 
 # Global state
 cloud_client: Optional[CloudClient] = None
+model_catalog: Optional[ModelCatalog] = None
 current_simulations: Dict[str, Any] = {}
 
 # Storage directories
 simulations_dir = Path("simulations")
 results_dir = simulations_dir / "results"
 exports_dir = simulations_dir / "exports"
+sweeps_dir = simulations_dir / "sweeps"
 
 # Demo API key for testing
 DEMO_API_KEY = "e05a6efa-ea5f-4adf-b090-ae0ca7d16c20"
@@ -58,44 +77,50 @@ def _ensure_directories():
     (exports_dir / "csv").mkdir(parents=True, exist_ok=True)
     (exports_dir / "json").mkdir(parents=True, exist_ok=True)
     (exports_dir / "reports").mkdir(parents=True, exist_ok=True)
+    sweeps_dir.mkdir(parents=True, exist_ok=True)
+
+def _simulation_record(sim_id: str, metadata: Dict[str, Any]) -> Dict[str, Any]:
+    """Build the in-memory record of a simulation from its saved metadata"""
+    return {
+        "simulation": None,  # Will be None for loaded simulations
+        "model_name": metadata.get("model_name", "Unknown"),
+        "parameters": metadata.get("parameters", {}),
+        "status": metadata.get("status", "unknown"),
+        "created": metadata.get("created", ""),
+        "completed": metadata.get("completed", ""),
+        "metadata": metadata
+    }
+
+# Location of each simulation's directory (flat, or sharded by date or hash)
+results_layout = ResultsLayout(results_dir)
+
+# Cached run outputs live next to the results
+result_cache.use_storage_dir(simulations_dir)
+
+# Lifecycle journal: metadata.json is written once, later status changes are appended
+simulation_journal = SimulationJournal(results_dir, layout=results_layout)
 
 def _load_existing_simulations():
-    """Load existing simulations from disk on startup"""
+    """Open the simulation registry, importing new or changed result directories"""
     global current_simulations
     try:
-        for sim_dir in results_dir.glob("sim_*"):
-            if sim_dir.is_dir():
-                metadata_file = sim_dir / "metadata.json"
-                if metadata_file.exists():
-                    with open(metadata_file, "r") as f:
-                        metadata = json.load(f)
-                    
-                    sim_id = sim_dir.name
-                    current_simulations[sim_id] = {
-                        "simulation": None,  # Will be None for loaded simulations
-                        "model_name": metadata.get("model_name", "Unknown"),
-                        "parameters": metadata.get("parameters", {}),
-                        "status": metadata.get("status", "unknown"),
-                        "created": metadata.get("created", ""),
-                        "completed": metadata.get("completed", ""),
-                        "metadata": metadata
-                    }
+        # Fold status changes journaled by earlier runs into metadata.json before importing it
+        simulation_journal.compact()
+        current_simulations = open_simulation_registry(results_dir, _simulation_record, variant="fastmcp_v2")
+        # Move result directories into the configured layout without blocking startup
+        results_layout.start_background_migration()
     except Exception as e:
         logger.error(f"Error loading existing simulations: {e}")
 
 def _save_simulation_metadata(sim_id: str, simulation_data: Dict[str, Any]):
-    """Save simulation metadata to disk"""
-    sim_dir = results_dir / sim_id
-    sim_dir.mkdir(exist_ok=True)
-    
-    metadata_file = sim_dir / "metadata.json"
-    with open(metadata_file, "w") as f:
-        json.dump(simulation_data["metadata"], f, indent=2)
+    """Save simulation metadata to the journal and the registry"""
+    simulation_journal.write(sim_id, simulation_data["metadata"])
+    current_simulations[sim_id] = simulation_data
 
 def _save_simulation_results(sim_id: str, results: Any):
     """Save simulation results to disk"""
-    sim_dir = results_dir / sim_id
-    sim_dir.mkdir(exist_ok=True)
+    sim_dir = results_layout.sim_dir(sim_id)
+    sim_dir.mkdir(parents=True, exist_ok=True)
     
     results_file = sim_dir / "outputs.json"
     
@@ -110,20 +135,105 @@ def _save_simulation_results(sim_id: str, results: Any):
         else:
             results_data = results
         
-        # Custom JSON serializer for complex objects
-        def json_serializer(obj):
-            if hasattr(obj, '__dict__'):
-                return obj.__dict__
-            elif hasattr(obj, 'to_dict'):
-                return obj.to_dict()
-            else:
-                return str(obj)
-        
-        with open(results_file, "w") as f:
-            json.dump(results_data, f, indent=2, default=json_serializer)
+        # Complex output objects are converted while encoding
+        artifact_writer.write_json(results_file, results_data, compress=True)
     except Exception as e:
         logger.error(f"Error saving results: {e}")
 
+def _new_simulation_data(sim_id: str, model_name: str, parameters: Dict[str, Any], model_id: Any,
+                         version_id: Any, simulation: Any = None, status: str = "running") -> Dict[str, Any]:
+    """Build the in-memory record (with its persisted metadata) for a simulation"""
+    now = datetime.now().isoformat()
+    completed = now if status == "completed" else ""
+    return {
+        "simulation": simulation,
+        "model_name": model_name,
+        "parameters": parameters,
+        "status": status,
+        "created": now,
+        "completed": completed,
+        "metadata": {
+            "model_name": model_name,
+            "parameters": parameters,
+            "status": status,
+            "created": now,
+            "completed": completed,
+            "sim_id": sim_id,
+            "model_id": str(model_id),
+            "version_id": str(version_id)
+        }
+    }
+
+def _register_cached_simulation(sim_id: str, model_name: str, parameters: Dict[str, Any], model_id: Any,
+                                version_id: Any, cache_entry: Dict[str, Any]):
+    """Record a run answered from the result cache as a completed simulation"""
+    simulation_data = _new_simulation_data(sim_id, model_name, parameters, model_id, version_id,
+                                           status="completed")
+    simulation_data["metadata"]["cached_from"] = cache_entry.get("source_simulation")
+    current_simulations[sim_id] = simulation_data
+    _save_simulation_metadata(sim_id, simulation_data)
+    artifact_writer.write_json(results_layout.sim_dir(sim_id) / "outputs.json", cache_entry.get("outputs"), compress=True)
+
+def _apply_parameters(inputs: Any, parameters: Dict[str, Any]):
+    """
+    Set parameter overrides on a model's inputs.
+    
+    Raises ValueError when a parameter cannot be set, so a run never starts with
+    default inputs that its recorded parameters do not describe.
+    """
+    for param_name, param_value in parameters.items():
+        try:
+            inputs.set_input(param_name, param_value)
+        except Exception as param_error:
+            raise ValueError(f"Could not set parameter {param_name}: {param_error}") from param_error
+
+def _cache_simulation_results(sim_id: str, sim_data: Dict[str, Any], results: Any) -> Dict[str, Any]:
+    """
+    Add a finished run's outputs to the result cache so identical runs can reuse them.
+    
+    Entries hold the serialize_run_outputs structure sweep points use, so a cached
+    point feeds the result table and statistics exactly like a fresh one. Returns it.
+    """
+    output_data = serialize_run_outputs(sim_id, sim_data["model_name"], sim_data["parameters"], results)
+    metadata = sim_data["metadata"]
+    if metadata.get("model_id") and metadata.get("version_id"):
+        result_cache.store(metadata["model_id"], metadata["version_id"], sim_data["parameters"], output_data, sim_id)
+    return output_data
+
+def _persist_completed_simulation(sim_id: str, results: Any) -> Optional[Dict[str, Any]]:
+    """Poller callback: save outputs and mark the simulation completed"""
+    sim_data = current_simulations.get(sim_id)
+    if sim_data is None:
+        return None
+    
+    _save_simulation_results(sim_id, results)
+    
+    sim_data["status"] = "completed"
+    sim_data["completed"] = datetime.now().isoformat()
+    sim_data["metadata"]["status"] = "completed"
+    sim_data["metadata"]["completed"] = sim_data["completed"]
+    _save_simulation_metadata(sim_id, sim_data)
+    return _cache_simulation_results(sim_id, sim_data, results)
+
+def _persist_failed_simulation(sim_id: str, status: str, error: Optional[str] = None):
+    """Poller callback: mark the simulation failed"""
+    sim_data = current_simulations.get(sim_id)
+    if sim_data is None:
+        return
+    
+    sim_data["status"] = "failed"
+    sim_data["completed"] = datetime.now().isoformat()
+    sim_data["metadata"]["status"] = "failed"
+    sim_data["metadata"]["completed"] = sim_data["completed"]
+    sim_data["metadata"]["error"] = error or f"Simulation ended with status {status}"
+    _save_simulation_metadata(sim_id, sim_data)
+
+# Background poller that persists results as soon as runs finish
+simulation_poller = SimulationPoller(
+    on_complete=_persist_completed_simulation,
+    on_failure=_persist_failed_simulation
+)
+
 # Initialize storage on module load
 _ensure_directories()
 _load_existing_simulations()
@@ -135,18 +245,19 @@ _load_existing_simulations()
 @mcp.tool()
 async def connect_anylogic(api_key: Optional[str] = None) -> str:
     """Connect to AnyLogic Cloud with API key (uses demo key if not provided)."""
-    global cloud_client
+    global cloud_client, model_catalog
     
     if not ANYLOGIC_AVAILABLE:
-        return json.dumps({
+        return dumps_response({
             "success": False,
             "error": "AnyLogic Cloud client not available. Please install anylogiccloudclient."
-        }, indent=2)
+        })
     
     try:
         # Use provided key or demo key
         key_to_use = api_key or DEMO_API_KEY
         cloud_client = CloudClient(api_key=key_to_use)
+        model_catalog = model_catalogs.get(key_to_use, cloud_client)
         
         result = {
             "success": True,
@@ -154,13 +265,13 @@ async def connect_anylogic(api_key: Optional[str] = None) -> str:
             "using_demo_key": api_key is None
         }
         logger.info(f"Connected to AnyLogic Cloud, using demo key: {api_key is None}")
-        return json.dumps(result, indent=2)
+        return dumps_response(result)
     except Exception as e:
         logger.error(f"Failed to connect to AnyLogic Cloud: {e}")
-        return json.dumps({
+        return dumps_response({
             "success": False,
             "error": f"Failed to connect: {str(e)}"
-        }, indent=2)
+        })
 
 @mcp.tool()
 async def list_demo_models() -> str:
@@ -194,18 +305,18 @@ async def list_demo_models() -> str:
         "note": "These are common public demo models. Use list_models() to see all available models in your account."
     }
     
-    return json.dumps(result, indent=2)
+    return dumps_response(result)
 
 @mcp.tool()
-async def list_models() -> str:
-    """List available models in AnyLogic Cloud."""
+async def list_models(refresh: bool = False, fields: Optional[str] = None) -> str:
+    """List available models in AnyLogic Cloud (set refresh=True to bypass the cached catalog). `fields` (e.g. "id,name") limits the keys returned per model."""
     global cloud_client
     
     if not cloud_client:
-        return json.dumps({"success": False, "error": "Not connected. Use connect_anylogic() first."}, indent=2)
+        return dumps_response({"success": False, "error": "Not connected. Use connect_anylogic() first."})
     
     try:
-        models = cloud_client.get_models()
+        models = await model_catalog.get_models(force_refresh=refresh)
         model_list = []
         
         for model in models:
@@ -217,99 +328,91 @@ async def list_models() -> str:
                 "created": str(getattr(model, 'created', '')),
                 "modified": str(getattr(model, 'modified', ''))
             }
-            model_list.append(model_dict)
+            model_list.append(project_fields(model_dict, fields))
         
         result = {
             "success": True,
             "models": model_list,
             "count": len(model_list)
         }
-        return json.dumps(result, indent=2)
+        return dumps_response(result)
     except Exception as e:
         logger.error(f"Failed to list models: {e}")
-        return json.dumps({"success": False, "error": f"Failed to list models: {str(e)}"}, indent=2)
+        return dumps_response({"success": False, "error": f"Failed to list models: {str(e)}"})
 
 @mcp.tool()
-async def run_simulation(model_name: str, parameters: Optional[Dict[str, Any]] = None) -> str:
-    """Run a simulation model with specified parameters."""
+async def run_simulation(model_name: str, parameters: Optional[Dict[str, Any]] = None,
+                         use_cache: bool = True) -> str:
+    """Run a simulation model with specified parameters.
+    
+    Identical runs of the same model version return cached results instantly;
+    set use_cache=False to force a fresh run.
+    """
     global cloud_client, current_simulations
     
     if not cloud_client:
-        return json.dumps({"success": False, "error": "Not connected. Use connect_anylogic() first."}, indent=2)
+        return dumps_response({"success": False, "error": "Not connected. Use connect_anylogic() first."})
     
     if parameters is None:
         parameters = {}
     
     try:
         # Generate unique simulation ID
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        sim_id = f"sim_{timestamp}"
-        
-        # Find the model
-        models = cloud_client.get_models()
-        target_model = None
-        
-        for model in models:
-            if getattr(model, 'name', '') == model_name:
-                target_model = model
-                break
+        sim_id = new_simulation_id()
         
-        if not target_model:
-            return json.dumps({"success": False, "error": f"Model '{model_name}' not found"}, indent=2)
+        # Find the model by id, exact name or closest fuzzy match
+        try:
+            target_model = await model_catalog.resolve(model_name)
+        except ModelLookupError as e:
+            return dumps_response({"success": False, "error": str(e), "candidates": e.candidates})
+        model_name = getattr(target_model, 'name', model_name)
         
         # Get the latest model version
         if not target_model.model_versions:
-            return json.dumps({"success": False, "error": f"No versions available for model '{model_name}'"}, indent=2)
+            return dumps_response({"success": False, "error": f"No versions available for model '{model_name}'"})
+        
+        # The latest version, resolved the same way by every server so they share cache entries
+        version_id = (await model_catalog.get_version(target_model)).id
         
-        # Get the first/latest version
-        version_id = target_model.model_versions[0]
-        model_version = cloud_client.get_model_version_by_id(target_model, version_id)
+        # Identical runs of the same model version reuse stored outputs
+        if use_cache:
+            cache_entry = result_cache.lookup(target_model.id, version_id, parameters)
+            if cache_entry is not None:
+                await asyncio.to_thread(_register_cached_simulation, sim_id, model_name, parameters,
+                                        target_model.id, version_id, cache_entry)
+                
+                logger.info(f"Simulation {sim_id} served from cache of {cache_entry.get('source_simulation')}")
+                return dumps_response({
+                    "success": True,
+                    "simulation_id": sim_id,
+                    "status": "completed",
+                    "cached": True,
+                    "cached_from": cache_entry.get("source_simulation"),
+                    "message": f"Reused cached results for model '{model_name}'",
+                    "parameters": parameters
+                })
         
-        # Create default inputs for the simulation
-        inputs = cloud_client.create_default_inputs(model_version)
+        # Version and default inputs come from the per-version cache (fresh copy per run)
+        model_version, inputs = await model_catalog.default_inputs(target_model, version_id)
         
         # Set parameters if provided
-        if parameters:
-            for param_name, param_value in parameters.items():
-                try:
-                    # Try to set the parameter in inputs
-                    if hasattr(inputs, 'set_parameter'):
-                        inputs.set_parameter(param_name, param_value)
-                    elif hasattr(inputs, param_name):
-                        setattr(inputs, param_name, param_value)
-                    else:
-                        logger.warning(f"Parameter {param_name} not found in model inputs")
-                except Exception as param_error:
-                    logger.warning(f"Could not set parameter {param_name}: {param_error}")
+        _apply_parameters(inputs, parameters)
         
         # Create and start simulation
-        simulation = cloud_client.create_simulation(inputs)
+        simulation = await cloud_executor.call(cloud_client.create_simulation, inputs)
         
         # Store simulation info
-        simulation_data = {
-            "simulation": simulation,
-            "model_name": model_name,
-            "parameters": parameters,
-            "status": "running",
-            "created": datetime.now().isoformat(),
-            "completed": "",
-            "metadata": {
-                "model_name": model_name,
-                "parameters": parameters,
-                "status": "running",
-                "created": datetime.now().isoformat(),
-                "completed": "",
-                "sim_id": sim_id
-            }
-        }
+        simulation_data = _new_simulation_data(sim_id, model_name, parameters, target_model.id, version_id,
+                                               simulation=simulation)
         
         current_simulations[sim_id] = simulation_data
         
-        # Save metadata
-        _save_simulation_metadata(sim_id, simulation_data)
+        # Save metadata (off the event loop: the write waits for its fsync)
+        await asyncio.to_thread(_save_simulation_metadata, sim_id, simulation_data)
         
         # Start simulation
-        simulation.run()
+        await cloud_executor.call(simulation.run)
+        simulation_poller.track(sim_id, simulation, model_name)
         
         result = {
             "success": True,
@@ -319,78 +422,242 @@ async def run_simulation(model_name: str, parameters: Optional[Dict[str, Any]] =
         }
         
         logger.info(f"Started simulation {sim_id} for model {model_name}")
-        return json.dumps(result, indent=2)
+        return dumps_response(result)
         
     except Exception as e:
         logger.error(f"Failed to run simulation: {e}")
-        return json.dumps({"success": False, "error": f"Failed to run simulation: {str(e)}"}, indent=2)
+        return dumps_response({"success": False, "error": f"Failed to run simulation: {str(e)}"})
+
+def _save_sweep(sweep):
+    """Save a sweep summary and result table to disk"""
+    artifact_writer.write_json(sweeps_dir / f"{sweep.sweep_id}.json", sweep.to_dict())
+
+async def _run_sweep_point(sweep, point: Dict[str, Any], target_model: Any, version_id: Any,
+                           use_cache: bool) -> Dict[str, Any]:
+    """Run one sweep point to completion as a regular simulation"""
+    sim_id = new_simulation_id()
+    parameters = point["parameters"]
+    model_name = sweep.model_name
+    
+    if use_cache:
+        cache_entry = result_cache.lookup(target_model.id, version_id, parameters)
+        if cache_entry is not None:
+            await asyncio.to_thread(_register_cached_simulation, sim_id, model_name, parameters,
+                                    target_model.id, version_id, cache_entry)
+            simulation_data = current_simulations[sim_id]
+            simulation_data["metadata"]["sweep_id"] = sweep.sweep_id
+            await asyncio.to_thread(_save_simulation_metadata, sim_id, simulation_data)
+            return {"simulation_id": sim_id, "outputs": cache_entry.get("outputs")}
+    
+    model_version, inputs = await model_catalog.default_inputs(target_model, version_id)
+    _apply_parameters(inputs, parameters)
+    simulation = await cloud_executor.call(cloud_client.create_simulation, inputs)
+    
+    simulation_data = _new_simulation_data(sim_id, model_name, parameters, target_model.id, version_id,
+                                           simulation=simulation)
+    simulation_data["metadata"]["sweep_id"] = sweep.sweep_id
+    current_simulations[sim_id] = simulation_data
+    await asyncio.to_thread(_save_simulation_metadata, sim_id, simulation_data)
+    point["simulation_id"] = sim_id
+    
+    try:
+        outputs = await cloud_executor.run(simulation.get_outputs_and_run_if_absent)
+    except Exception as e:
+        await asyncio.to_thread(_persist_failed_simulation, sim_id, "FAILED", str(e))
+        raise
+    
+    return {"simulation_id": sim_id, "outputs": await asyncio.to_thread(_persist_completed_simulation, sim_id, outputs)}
+
+async def _launch_sweep(model_name: str, parameter_sets: List[Dict[str, Any]], concurrency: Optional[int],
+                        wait: bool, use_cache: bool, ctx: Optional[Context],
+                        statistics: Optional[ReplicationStatistics] = None) -> str:
+    """Resolve the model, then run (or start) a sweep over the given parameter sets"""
+    try:
+        target_model = await model_catalog.resolve(model_name)
+    except ModelLookupError as e:
+        return dumps_response({"success": False, "error": str(e), "candidates": e.candidates})
+    model_name = getattr(target_model, 'name', model_name)
+    
+    if not target_model.model_versions:
+        return dumps_response({"success": False, "error": f"No versions available for model '{model_name}'"})
+    version_id = (await model_catalog.get_version(target_model)).id
+    
+    sweep_id = simulation_ids.new("sweep")
+    sweep = sweep_runner.create(sweep_id, model_name, parameter_sets, concurrency)
+    sweep.statistics = statistics
+    await asyncio.to_thread(_save_sweep, sweep)
+    
+    async def run_point(point):
+        return await _run_sweep_point(sweep, point, target_model, version_id, use_cache)
+    
+    async def on_progress(sweep, point):
+        if wait and ctx is not None:
+            done = len(sweep.points) - sweep.counts()["pending"] - sweep.counts()["running"]
+            await ctx.report_progress(done, len(sweep.points),
+                                      f"Point {point['index']} {point['status']}")
+    
+    async def run_sweep():
+        await sweep_runner.run(sweep, run_point, on_progress)
+        await asyncio.to_thread(_save_sweep, sweep)
+    
+    logger.info(f"Starting sweep {sweep_id}: {len(parameter_sets)} points of {model_name}, "
+                f"concurrency {sweep.concurrency}")
+    
+    if not wait:
+        background_runs.submit(sweep_id, run_sweep())
+        return dumps_response({
+            "success": True,
+            "sweep_id": sweep_id,
+            "status": sweep.status,
+            "total_points": len(sweep.points),
+            "message": f"Sweep started for model '{model_name}'. Use get_sweep_status('{sweep_id}') to follow it."
+        })
+    
+    await run_sweep()
+    return dumps_response({"success": True, **sweep.to_dict()})
+
+@mcp.tool()
+async def run_parameter_sweep(model_name: str, grid: Optional[Dict[str, List[Any]]] = None,
+                              points: Optional[List[Dict[str, Any]]] = None,
+                              concurrency: Optional[int] = None, wait: bool = True,
+                              use_cache: bool = True, ctx: Context = None) -> str:
+    """Run a model over many parameter sets in one call.
+    
+    Pass a grid ({"param": [values...]}, expanded to every combination) and/or an
+    explicit list of parameter sets. Points run concurrently, at most `concurrency`
+    at a time, with progress reported as they finish. Set wait=False to return the
+    sweep ID immediately and check it with get_sweep_status.
+    """
+    if not cloud_client:
+        return dumps_response({"success": False, "error": "Not connected. Use connect_anylogic() first."})
+    
+    try:
+        parameter_sets = build_points(grid, points)
+    except SweepDefinitionError as e:
+        return dumps_response({"success": False, "error": str(e)})
+    
+    return await _launch_sweep(model_name, parameter_sets, concurrency, wait, use_cache, ctx)
+
+@mcp.tool()
+async def run_replications(model_name: str, parameters: Optional[Dict[str, Any]] = None,
+                           replications: int = 10, base_seed: int = 1, confidence: float = 0.95,
+                           concurrency: Optional[int] = None, wait: bool = True,
+                           use_cache: bool = True, ctx: Context = None) -> str:
+    """Run one parameter set with N random seeds and aggregate the outputs.
+    
+    Replication i uses seed base_seed + i. Numeric outputs are aggregated as each
+    replication finishes (mean, standard deviation, min/max and a confidence
+    interval at 0.90, 0.95 or 0.99), so get_sweep_status shows the running
+    summary while the replications are still in progress.
+    """
+    if not cloud_client:
+        return dumps_response({"success": False, "error": "Not connected. Use connect_anylogic() first."})
+    
+    if replications < 1:
+        return dumps_response({"success": False, "error": "replications must be at least 1"})
+    
+    try:
+        statistics = ReplicationStatistics(confidence)
+        parameter_sets = build_points(points=[
+            {**(parameters or {}), "{RANDOM_SEED}": base_seed + replication}
+            for replication in range(replications)
+        ])
+    except (SweepDefinitionError, ValueError) as e:
+        return dumps_response({"success": False, "error": str(e)})
+    
+    return await _launch_sweep(model_name, parameter_sets, concurrency, wait, use_cache, ctx, statistics)
+
+@mcp.tool()
+async def get_sweep_status(sweep_id: str, include_results: bool = True) -> str:
+    """Get per-point status, the combined result table and (for replications) the running statistics of a sweep."""
+    sweep = sweep_runner.get(sweep_id)
+    if sweep is not None:
+        return dumps_response({"success": True, **sweep.to_dict(include_results)})
+    
+    # Sweeps from earlier server sessions are read from disk
+    sweep_file = sweeps_dir / f"{sweep_id}.json"
+    if sweep_file.exists():
+        with open(sweep_file, "r") as f:
+            data = json.load(f)
+        if not include_results:
+            data.pop("results", None)
+        return dumps_response({"success": True, "loaded_from_disk": True, **data})
+    
+    return dumps_response({"success": False, "error": f"Sweep {sweep_id} not found"})
 
 @mcp.tool()
-async def get_simulation_results(simulation_id: str) -> str:
-    """Get results from a completed simulation."""
+async def get_simulation_results(simulation_id: str, fields: Optional[str] = None) -> str:
+    """Get results from a completed simulation. `fields` (e.g. "Throughput,Queue.mean") limits the output keys returned."""
     global current_simulations
     
     if simulation_id not in current_simulations:
-        return json.dumps({"success": False, "error": f"Simulation {simulation_id} not found"}, indent=2)
+        return dumps_response({"success": False, "error": f"Simulation {simulation_id} not found"})
     
     try:
         sim_data = current_simulations[simulation_id]
         simulation = sim_data["simulation"]
         
+        # The poller persists finished runs, so completed results come straight from disk
+        results_file = results_layout.sim_dir(simulation_id) / "outputs.json"
+        if sim_data["status"] == "completed" and artifact_exists(results_file):
+            results = outputs_cache.load(results_file)
+            return dumps_response({
+                "success": True,
+                "simulation_id": simulation_id,
+                "status": "completed",
+                "results": project_fields(results, fields),
+                "loaded_from_disk": True
+            })
+        
+        if sim_data["status"] == "failed":
+            return dumps_response({
+                "success": False,
+                "error": sim_data["metadata"].get("error", "Simulation failed"),
+                "status": "failed"
+            })
+        
+        if simulation_poller.is_tracking(simulation_id):
+            return dumps_response({
+                "success": False,
+                "error": "Simulation not yet completed",
+                "status": sim_data["status"],
+                "polling": simulation_poller.describe(simulation_id)
+            })
+        
         if simulation is None:
             # Try to load from disk
-            results_file = results_dir / simulation_id / "outputs.json"
-            if results_file.exists():
-                with open(results_file, "r") as f:
-                    results = json.load(f)
+            if artifact_exists(results_file):
+                results = outputs_cache.load(results_file)
                 result = {
                     "success": True,
                     "simulation_id": simulation_id,
                     "status": sim_data["status"],
-                    "results": results,
+                    "results": project_fields(results, fields),
                     "loaded_from_disk": True
                 }
-                return json.dumps(result, indent=2)
+                return dumps_response(result)
             else:
-                return json.dumps({"success": False, "error": f"No results available for {simulation_id}"}, indent=2)
+                return dumps_response({"success": False, "error": f"No results available for {simulation_id}"})
         
         # Check if simulation is completed
-        status = simulation.get_status()
+        status = await cloud_executor.call(simulation.get_status)
         if status != "COMPLETED":
-            return json.dumps({
+            return dumps_response({
                 "success": False, 
                 "error": "Simulation not yet completed",
                 "status": status
-            }, indent=2)
+            })
         
         # Get results
-        results = simulation.get_outputs()
+        results = await cloud_executor.call(simulation.get_outputs)
         
-        # Convert results to JSON-serializable format
-        try:
-            if hasattr(results, 'outputs'):
-                # Extract the actual outputs data
-                results_data = results.outputs
-            elif hasattr(results, '__dict__'):
-                results_data = results.__dict__
-            else:
-                results_data = str(results)
-            
-            # Custom JSON serializer for complex objects
-            def json_serializer(obj):
-                if hasattr(obj, '__dict__'):
-                    return obj.__dict__
-                elif hasattr(obj, 'to_dict'):
-                    return obj.to_dict()
-                else:
-                    return str(obj)
-            
-            # Convert to JSON-serializable format
-            serializable_results = json.loads(json.dumps(results_data, default=json_serializer))
-            
-        except Exception as e:
-            logger.warning(f"Could not serialize results, converting to string: {e}")
-            serializable_results = str(results)
+        # Extract the outputs data; complex objects are converted when the response is encoded
+        if hasattr(results, 'outputs'):
+            results_data = results.outputs
+        elif hasattr(results, '__dict__'):
+            results_data = results.__dict__
+        else:
+            results_data = str(results)
         
         # Update status
         sim_data["status"] = "completed" 
@@ -399,30 +666,46 @@ async def get_simulation_results(simulation_id: str) -> str:
         sim_data["metadata"]["completed"] = sim_data["completed"]
         
         # Save results and updated metadata
-        _save_simulation_results(simulation_id, results)
-        _save_simulation_metadata(simulation_id, sim_data)
+        # Disk writes wait for their fsync, so they run off the event loop
+        await asyncio.to_thread(_save_simulation_results, simulation_id, results)
+        await asyncio.to_thread(_save_simulation_metadata, simulation_id, sim_data)
+        await asyncio.to_thread(_cache_simulation_results, simulation_id, sim_data, results)
         
         result = {
             "success": True,
             "simulation_id": simulation_id,
-            "results": serializable_results,
+            "results": project_fields(results_data, fields),
             "status": "completed"
         }
         
         logger.info(f"Retrieved results for simulation {simulation_id}")
-        return json.dumps(result, indent=2)
+        try:
+            return dumps_response(result)
+        except (TypeError, ValueError) as e:
+            logger.warning(f"Could not serialize results, converting to string: {e}")
+            result["results"] = str(results)
+            return dumps_response(result)
         
     except Exception as e:
         logger.error(f"Failed to get results for {simulation_id}: {e}")
-        return json.dumps({"success": False, "error": f"Failed to get results: {str(e)}"}, indent=2)
+        return dumps_response({"success": False, "error": f"Failed to get results: {str(e)}"})
 
 @mcp.tool()
-async def list_simulations() -> str:
-    """List all simulations (running and completed)."""
+async def list_simulations(status: Optional[str] = None, model_name: Optional[str] = None,
+                           created_after: Optional[str] = None, created_before: Optional[str] = None,
+                           limit: Optional[int] = None, cursor: Optional[str] = None,
+                           fields: Optional[str] = None) -> str:
+    """List simulations (running and completed), newest first, filtered by status, model and creation date range (ISO; created_before is exclusive). Returns one page of at most `limit`; pass next_cursor back as `cursor` for the next page. `fields` (e.g. "id,status") limits the keys returned per simulation."""
     global current_simulations
     
     sim_list = []
-    for sim_id, sim_data in current_simulations.items():
+    # One page answered from the registry's indexes, newest first
+    try:
+        page = page_simulations(current_simulations, cursor=cursor, page_size=limit, status=status,
+                                model_name=model_name, created_after=created_after, created_before=created_before)
+    except ValueError as e:
+        return dumps_response({"success": False, "error": str(e)})
+    for sim_id, sim_data in page["simulations"]:
         sim_info = {
             "id": sim_id,
             "model_name": sim_data["model_name"],
@@ -431,33 +714,57 @@ async def list_simulations() -> str:
             "completed": sim_data["completed"],
             "parameters": sim_data["parameters"]
         }
-        sim_list.append(sim_info)
+        sim_list.append(project_fields(sim_info, fields))
+    
+    result = {
+        "success": True,
+        "simulations": sim_list,
+        "total_count": page["total"],
+        "next_cursor": page["next_cursor"]
+    }
+    
+    return dumps_response(result)
+
+@mcp.tool()
+async def get_simulation_changes(since: int = 0, limit: Optional[int] = None) -> str:
+    """Simulations created, changed or removed since a history version. Pass the returned version as `since` next time (0 returns everything); when "more" is true, call again right away."""
+    changes = simulation_changes(current_simulations, since=since, limit=limit)
+    sim_list = []
+    for sim_id, sim_data in changes["simulations"]:
+        sim_list.append({
+            "id": sim_id,
+            "model_name": sim_data["model_name"],
+            "status": sim_data["status"],
+            "created": sim_data["created"],
+            "completed": sim_data["completed"]
+        })
     
     result = {
         "success": True,
         "simulations": sim_list,
-        "total_count": len(sim_list)
+        "removed": changes["removed"],
+        "version": changes["version"],
+        "more": changes["more"]
     }
     
-    return json.dumps(result, indent=2)
+    return dumps_response(result)
 
 @mcp.tool()
 async def export_simulation_results(simulation_id: str, format_type: str) -> str:
     """Export simulation results to CSV or JSON format."""
     if format_type not in ["csv", "json"]:
-        return json.dumps({"success": False, "error": "Format must be 'csv' or 'json'"}, indent=2)
+        return dumps_response({"success": False, "error": "Format must be 'csv' or 'json'"})
     
     if simulation_id not in current_simulations:
-        return json.dumps({"success": False, "error": f"Simulation {simulation_id} not found"}, indent=2)
+        return dumps_response({"success": False, "error": f"Simulation {simulation_id} not found"})
     
     try:
         # Load results
-        results_file = results_dir / simulation_id / "outputs.json"
-        if not results_file.exists():
-            return json.dumps({"success": False, "error": f"No results file found for {simulation_id}"}, indent=2)
+        results_file = results_layout.sim_dir(simulation_id) / "outputs.json"
+        if not artifact_exists(results_file):
+            return dumps_response({"success": False, "error": f"No results file found for {simulation_id}"})
         
-        with open(results_file, "r") as f:
-            results = json.load(f)
+        results = outputs_cache.load(results_file)
         
         # Export based on format
         if format_type == "json":
@@ -492,17 +799,17 @@ async def export_simulation_results(simulation_id: str, format_type: str) -> str
         }
         
         logger.info(f"Exported {simulation_id} results to {format_type} format")
-        return json.dumps(result, indent=2)
+        return dumps_response(result)
         
     except Exception as e:
         logger.error(f"Export failed for {simulation_id}: {e}")
-        return json.dumps({"success": False, "error": f"Export failed: {str(e)}"}, indent=2)
+        return dumps_response({"success": False, "error": f"Export failed: {str(e)}"})
 
 @mcp.tool()
 async def cleanup_simulations(days_old: int = 30, status_filter: str = "completed") -> str:
     """Clean up old simulation data."""
     if status_filter not in ["completed", "failed", "all"]:
-        return json.dumps({"success": False, "error": "status_filter must be 'completed', 'failed', or 'all'"}, indent=2)
+        return dumps_response({"success": False, "error": "status_filter must be 'completed', 'failed', or 'all'"})
     
     try:
         cutoff_date = datetime.now() - timedelta(days=days_old)
@@ -511,11 +818,13 @@ async def cleanup_simulations(days_old: int = 30, status_filter: str = "complete
         for sim_id in list(current_simulations.keys()):
             sim_data = current_simulations[sim_id]
             
-            # Parse creation date
+            # Parse creation date, falling back to the timestamp in the simulation ID
             try:
                 created_date = datetime.fromisoformat(sim_data["created"].replace("Z", "+00:00"))
             except:
-                continue
+                created_date = id_timestamp(sim_id)
+                if created_date is None:
+                    continue
             
             # Check if simulation meets cleanup criteria
             if created_date < cutoff_date:
@@ -524,10 +833,12 @@ async def cleanup_simulations(days_old: int = 30, status_filter: str = "complete
                     del current_simulations[sim_id]
                     
                     # Remove from disk
-                    sim_dir = results_dir / sim_id
+                    sim_dir = results_layout.sim_dir(sim_id)
                     if sim_dir.exists():
                         import shutil
+                        outputs_cache.invalidate_dir(sim_dir)
                         shutil.rmtree(sim_dir)
+                        simulation_journal.forget(sim_id)
                     
                     cleaned_count += 1
         
@@ -538,11 +849,11 @@ async def cleanup_simulations(days_old: int = 30, status_filter: str = "complete
         }
         
         logger.info(f"Cleaned up {cleaned_count} simulations")
-        return json.dumps(result, indent=2)
+        return dumps_response(result)
         
     except Exception as e:
         logger.error(f"Cleanup failed: {e}")
-        return json.dumps({"success": False, "error": f"Cleanup failed: {str(e)}"}, indent=2)
+        return dumps_response({"success": False, "error": f"Cleanup failed: {str(e)}"})
 
 # ============================================================================
 # RESOURCES - Using Official FastMCP Pattern
@@ -552,13 +863,13 @@ async def cleanup_simulations(days_old: int = 30, status_filter: str = "complete
 async def get_models_resource() -> str:
     """Available models resource."""
     if not cloud_client:
-        return json.dumps({
+        return dumps_response({
             "connected": False,
             "error": "Not connected to AnyLogic Cloud"
-        }, indent=2)
+        })
     
     try:
-        models = cloud_client.get_models()
+        models = await model_catalog.get_models()
         model_list = []
         
         for model in models:
@@ -570,17 +881,17 @@ async def get_models_resource() -> str:
             }
             model_list.append(model_dict)
         
-        return json.dumps({
+        return dumps_response({
             "connected": True,
             "models": model_list,
             "count": len(model_list)
-        }, indent=2)
+        })
     except Exception as e:
         logger.error(f"Failed to fetch models: {e}")
-        return json.dumps({
+        return dumps_response({
             "connected": True,
             "error": f"Failed to fetch models: {str(e)}"
-        }, indent=2)
+        })
 
 @mcp.resource("anylogic://connection-status")
 async def get_connection_status() -> str:
@@ -588,52 +899,67 @@ async def get_connection_status() -> str:
     status = {
         "connected": cloud_client is not None,
         "anylogic_available": ANYLOGIC_AVAILABLE,
+        "cloud_calls": cloud_executor.metrics(),
+        "simulation_poller": simulation_poller.stats(),
+        "result_cache": result_cache.stats(),
+        "outputs_cache": outputs_cache.stats(),
         "timestamp": datetime.now().isoformat()
     }
     
     if cloud_client:
         status["using_demo_key"] = True  # Could track this more precisely
+        status["model_catalog"] = model_catalog.stats()
     
-    return json.dumps(status, indent=2)
+    return dumps_response(status)
 
 @mcp.resource("anylogic://simulations/history")
 async def get_simulation_history() -> str:
-    """Complete simulation history resource."""
-    history = {
-        "total_simulations": len(current_simulations),
-        "simulations": []
-    }
+    """Simulation history resource, newest first, one page at a time."""
+    return _simulation_history_page(None)
+
+@mcp.resource("anylogic://simulations/history/{cursor}")
+async def get_simulation_history_page(cursor: str) -> str:
+    """Later pages of the simulation history (cursor from next_cursor)."""
+    return _simulation_history_page(cursor)
+
+def _simulation_history_page(cursor: Optional[str]) -> str:
+    try:
+        page = page_simulations(current_simulations, cursor=cursor)
+    except ValueError as e:
+        return json.dumps({"error": str(e)})
     
-    for sim_id, sim_data in current_simulations.items():
-        sim_info = {
+    history = {
+        "total_simulations": page["total"],
+        "next_cursor": page["next_cursor"],
+        # Generated while encoding instead of collected into a list first
+        "simulations": ({
             "id": sim_id,
             "model_name": sim_data["model_name"],
             "status": sim_data["status"],
             "created": sim_data["created"],
             "completed": sim_data["completed"],
             "parameter_count": len(sim_data["parameters"])
-        }
-        history["simulations"].append(sim_info)
+        } for sim_id, sim_data in page["simulations"])
+    }
     
-    return json.dumps(history, indent=2)
+    return dumps_streamed(history)
 
 @mcp.resource("anylogic://simulation/{simulation_id}")
 async def get_simulation_resource(simulation_id: str) -> str:
     """Individual simulation resource."""
     if simulation_id not in current_simulations:
-        return json.dumps({
+        return dumps_response({
             "error": f"Simulation {simulation_id} not found"
-        }, indent=2)
+        })
     
     sim_data = current_simulations[simulation_id]
     
     # Try to load results if available
-    results_file = results_dir / simulation_id / "outputs.json"
+    results_file = results_layout.sim_dir(simulation_id) / "outputs.json"
     results = None
-    if results_file.exists():
+    if artifact_exists(results_file):
         try:
-            with open(results_file, "r") as f:
-                results = json.load(f)
+            results = outputs_cache.load(results_file)
         except:
             pass
     
@@ -650,7 +976,8 @@ async def get_simulation_resource(simulation_id: str) -> str:
     if results:
         resource_data["results"] = results
     
-    return json.dumps(resource_data, indent=2)
+    # Encoded key by key rather than through an indented copy of the whole outputs
+    return dumps_streamed(resource_data)
 
 # ============================================================================
 # PROMPTS - Using Official FastMCP Pattern  
@@ -701,7 +1028,7 @@ I want to optimize inventory management using AnyLogic simulation. Please help m
    - Various inventory policies (EOQ, (s,S), etc.)
    - Different demand patterns
 
-3. **Run Multiple Scenarios** testing:
+3. **Run Multiple Scenarios** with a single run_parameter_sweep call (a grid over):
    - Different reorder points
    - Various order quantities  
    - Safety stock levels
@@ -735,8 +1062,8 @@ I need to compare multiple simulation scenarios using AnyLogic. Please help me:
 **Analysis Process:**
 1. **Setup and Connect** to AnyLogic Cloud
 2. **Identify Appropriate Model** for scenario comparison
-3. **Run Simulations** for each scenario with the specified parameters
-4. **Collect Results** for all scenarios
+3. **Run Simulations** for all scenarios in one run_parameter_sweep call, passing each scenario's parameters as a point
+4. **Collect Results** for all scenarios from the sweep's combined result table
 5. **Comparative Analysis** including:
    - Key performance indicators
    - Statistical significance testing
@@ -0,0 +1,179 @@
+"""
+Cached AnyLogic Cloud model catalog.
+Keeps one model list per API key so tools and resources share a single get_models() round trip.
+"""
+
+import asyncio
+import logging
+import os
+import time
+from typing import Any, Dict, List, Optional
+
+from cloud_executor import cloud_executor
+from model_index import ModelIndex
+from model_versions import ModelVersionCache
+
+logger = logging.getLogger(__name__)
+
+
+class ModelCatalog:
+    """
+    TTL-cached model list for one AnyLogic Cloud API key.
+
+    Entries younger than ttl are served directly. Entries older than ttl but within
+    ttl + stale_ttl are served immediately while a background refresh runs
+    (stale-while-revalidate). Older entries block on a fresh fetch. Concurrent
+    callers share a single in-flight fetch.
+    """
+
+    def __init__(self, client: Any, ttl: Optional[float] = None, stale_ttl: Optional[float] = None):
+        self.client = client
+        self.ttl = ttl if ttl is not None else float(os.getenv("ANYLOGIC_CATALOG_TTL", "300"))
+        self.stale_ttl = (
+            stale_ttl if stale_ttl is not None
+            else float(os.getenv("ANYLOGIC_CATALOG_STALE_TTL", "3600"))
+        )
+
+        self._models: Optional[List[Any]] = None
+        self.index = ModelIndex([])
+        self.versions = ModelVersionCache(client)
+        self._loaded_at = 0.0
+        self._fetch_future: Optional[asyncio.Future] = None
+
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.fetches = 0
+
+    def age(self) -> Optional[float]:
+        """Seconds since the catalog was last loaded, None if never loaded."""
+        if self._models is None:
+            return None
+        return time.monotonic() - self._loaded_at
+
+    async def get_models(self, force_refresh: bool = False) -> List[Any]:
+        """
+        Get the model list, fetching from AnyLogic Cloud only when needed.
+
+        Args:
+            force_refresh: Bypass the cache and wait for a fresh catalog
+
+        Returns:
+            List of AnyLogic model objects
+        """
+        if force_refresh:
+            return await self.refresh()
+
+        age = self.age()
+        if age is not None and age < self.ttl:
+            self.hits += 1
+            return self._models
+
+        if age is not None and age < self.ttl + self.stale_ttl:
+            self.stale_hits += 1
+            self._start_fetch()
+            return self._models
+
+        self.misses += 1
+        return await self.refresh()
+
+    async def refresh(self) -> List[Any]:
+        """Fetch a fresh catalog, joining any fetch already in flight."""
+        return await asyncio.shield(self._start_fetch())
+
+    def invalidate(self) -> None:
+        """Drop the cached catalog so the next read fetches it again."""
+        self._models = None
+        self._loaded_at = 0.0
+        self.index = ModelIndex([])
+
+    async def resolve(self, reference: str) -> Any:
+        """
+        Resolve a model id or name against the cached catalog.
+
+        Raises:
+            ModelLookupError: No confident or unambiguous match
+        """
+        await self.get_models()
+        return self.index.resolve(reference)
+
+    async def get_version(self, model: Any, version_id: Optional[str] = None) -> Any:
+        """Get a model version from the version cache."""
+        return await self.versions.get_version(model, version_id)
+
+    async def default_inputs(self, model: Any, version_id: Optional[str] = None) -> Any:
+        """Get (version, private default inputs) for a model from the version cache."""
+        return await self.versions.default_inputs(model, version_id)
+
+    async def search(self, query: str, limit: int = 5) -> List[Any]:
+        """Rank catalog models by fuzzy name similarity."""
+        await self.get_models()
+        return self.index.search(query, limit)
+
+    def _start_fetch(self) -> asyncio.Future:
+        """Start a catalog fetch unless one is already running on this event loop."""
+        loop = asyncio.get_running_loop()
+        future = self._fetch_future
+        if future is None or future.done() or future.get_loop() is not loop:
+            future = loop.create_task(self._fetch())
+            future.add_done_callback(self._log_fetch_failure)
+            self._fetch_future = future
+        return future
+
+    async def _fetch(self) -> List[Any]:
+        """Load the catalog from AnyLogic Cloud."""
+        self.fetches += 1
+        models = list(await cloud_executor.call(self.client.get_models))
+        self.index = ModelIndex(models)
+        self.versions.sync_catalog(models)
+        self._models = models
+        self._loaded_at = time.monotonic()
+        logger.info(f"Model catalog refreshed: {len(models)} models")
+        return models
+
+    @staticmethod
+    def _log_fetch_failure(future: asyncio.Future) -> None:
+        """Background refreshes have no awaiting caller, so surface their errors here."""
+        if not future.cancelled() and future.exception() is not None:
+            logger.warning(f"Model catalog refresh failed: {future.exception()}")
+
+    def stats(self) -> Dict[str, Any]:
+        """Cache statistics for status resources."""
+        age = self.age()
+        return {
+            "loaded": self._models is not None,
+            "model_count": len(self._models) if self._models is not None else 0,
+            "age_seconds": round(age, 1) if age is not None else None,
+            "ttl_seconds": self.ttl,
+            "stale_ttl_seconds": self.stale_ttl,
+            "hits": self.hits,
+            "stale_hits": self.stale_hits,
+            "misses": self.misses,
+            "fetches": self.fetches,
+            "versions": self.versions.stats()
+        }
+
+
+class ModelCatalogRegistry:
+    """One ModelCatalog per API key, shared across reconnects."""
+
+    def __init__(self):
+        self._catalogs: Dict[str, ModelCatalog] = {}
+
+    def get(self, api_key: str, client: Any) -> ModelCatalog:
+        """Get the catalog for an API key, pointing it at the current client."""
+        catalog = self._catalogs.get(api_key)
+        if catalog is None:
+            catalog = ModelCatalog(client)
+            self._catalogs[api_key] = catalog
+        else:
+            catalog.client = client
+            catalog.versions.client = client
+        return catalog
+
+    def clear(self) -> None:
+        """Forget all cached catalogs."""
+        self._catalogs.clear()
+
+# Global registry shared by all tools and resources in a server process
+model_catalogs = ModelCatalogRegistry()
@@ -0,0 +1,159 @@
+"""
+Model lookup index for the AnyLogic Cloud catalog.
+Resolves a model reference by id, normalised name or trigram fuzzy match.
+"""
+
+import os
+import re
+from collections import defaultdict
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+_NON_WORD = re.compile(r"[\W_]+", re.UNICODE)
+
+
+def normalize_name(name: str) -> str:
+    """Case-fold a model name and collapse punctuation/whitespace to single spaces."""
+    return _NON_WORD.sub(" ", str(name).casefold()).strip()
+
+
+def trigrams(text: str) -> Set[str]:
+    """Padded character trigrams of a normalised string."""
+    padded = f"  {text} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class ModelLookupError(Exception):
+    """Raised when a model reference does not resolve to exactly one model."""
+
+    def __init__(self, message: str, candidates: Optional[List[Dict[str, Any]]] = None):
+        super().__init__(message)
+        self.candidates = candidates or []
+
+
+class ModelIndex:
+    """
+    Hash and trigram index over a model list.
+
+    Exact lookups by id or normalised name are O(1). Fuzzy lookups only score
+    models that share at least one trigram with the query and rank them by
+    Dice similarity, boosted when the query is a substring of the name.
+    """
+
+    def __init__(self, models: List[Any], min_score: Optional[float] = None):
+        self.models = list(models)
+        self.min_score = (
+            min_score if min_score is not None
+            else float(os.getenv("ANYLOGIC_FUZZY_MATCH_MIN_SCORE", "0.5"))
+        )
+
+        self._by_id: Dict[str, Any] = {}
+        self._by_name: Dict[str, List[Any]] = defaultdict(list)
+        self._postings: Dict[str, List[int]] = defaultdict(list)
+        self._gram_counts: List[int] = []
+        self._names: List[str] = []
+
+        for position, model in enumerate(self.models):
+            model_id = getattr(model, "id", None)
+            if model_id is not None:
+                self._by_id[str(model_id)] = model
+
+            normalized = normalize_name(getattr(model, "name", "") or "")
+            self._names.append(normalized)
+            self._by_name[normalized].append(model)
+
+            grams = trigrams(normalized)
+            self._gram_counts.append(len(grams))
+            for gram in grams:
+                self._postings[gram].append(position)
+
+    def __len__(self) -> int:
+        return len(self.models)
+
+    def get_by_id(self, model_id: str) -> Optional[Any]:
+        """Exact lookup by model id."""
+        return self._by_id.get(str(model_id))
+
+    def get_by_name(self, name: str) -> List[Any]:
+        """Exact lookup by normalised name (names are not unique in AnyLogic Cloud)."""
+        return list(self._by_name.get(normalize_name(name), []))
+
+    def search(self, query: str, limit: int = 5) -> List[Tuple[Any, float]]:
+        """
+        Rank models by trigram similarity to the query.
+
+        Args:
+            query: Free-text model name
+            limit: Maximum number of candidates to return
+
+        Returns:
+            List of (model, score) pairs, best first, scores in [0, 1]
+        """
+        normalized = normalize_name(query)
+        query_grams = trigrams(normalized)
+        if not normalized:
+            return []
+
+        shared: Dict[int, int] = defaultdict(int)
+        for gram in query_grams:
+            for position in self._postings.get(gram, ()):
+                shared[position] += 1
+
+        scored = []
+        for position, count in shared.items():
+            score = 2.0 * count / (len(query_grams) + self._gram_counts[position])
+            if normalized in self._names[position]:
+                # Keep the old substring behaviour: a contained query always clears the threshold
+                score = max(score, 0.5 + score / 2)
+            scored.append((position, score))
+        scored.sort(key=lambda item: (-item[1], _sort_name(self.models[item[0]])))
+        return [(self.models[position], round(score, 3)) for position, score in scored[:limit]]
+
+    def resolve(self, reference: str) -> Any:
+        """
+        Resolve a model reference to a single model.
+
+        Tries the exact id, then the exact normalised name, then the best fuzzy
+        match above min_score.
+
+        Raises:
+            ModelLookupError: No confident match, or an exact name shared by several models
+        """
+        model = self.get_by_id(reference)
+        if model is not None:
+            return model
+
+        exact = self.get_by_name(reference)
+        if len(exact) == 1:
+            return exact[0]
+        if len(exact) > 1:
+            raise ModelLookupError(
+                f"Model name '{reference}' is ambiguous; use one of the model ids",
+                [describe_candidate(candidate, 1.0) for candidate in exact]
+            )
+
+        ranked = self.search(reference)
+        candidates = [describe_candidate(candidate, score) for candidate, score in ranked]
+        if ranked and ranked[0][1] >= self.min_score:
+            # A tie between different names means the query does not pick out one model
+            if len(ranked) == 1 or ranked[1][1] < ranked[0][1]:
+                return ranked[0][0]
+            raise ModelLookupError(f"Model '{reference}' matches several models equally well", candidates)
+
+        suggestion = ""
+        if candidates:
+            suggestion = " Did you mean: " + ", ".join(f"'{c['name']}'" for c in candidates[:3]) + "?"
+        raise ModelLookupError(f"Model '{reference}' not found.{suggestion}", candidates)
+
+
+def _sort_name(model: Any) -> str:
+    """Secondary sort key so equal scores rank deterministically."""
+    return str(getattr(model, "name", ""))
+
+
+def describe_candidate(model: Any, score: float) -> Dict[str, Any]:
+    """JSON-friendly summary of a lookup candidate."""
+    return {
+        "id": getattr(model, "id", None),
+        "name": getattr(model, "name", "Unknown"),
+        "score": score
+    }
@@ -0,0 +1,166 @@
+"""
+Model version and default-input cache for AnyLogic Cloud.
+Saves the version lookup and create_default_inputs() round trips on repeat runs of a model.
+"""
+
+import asyncio
+import copy
+import logging
+from typing import Any, Dict, List, Optional, Tuple
+
+from cloud_executor import cloud_executor
+from result_cache import result_cache
+
+logger = logging.getLogger(__name__)
+
+# Placeholder version id for "whatever the latest version is"
+LATEST = "latest"
+
+
+def version_fingerprint(model: Any) -> Tuple[str, ...]:
+    """The version ids the catalog currently reports for a model."""
+    return tuple(str(version_id) for version_id in (getattr(model, "model_versions", None) or ()))
+
+
+class ModelVersionCache:
+    """
+    Caches model versions and default input templates keyed by (model id, version id).
+
+    Each run receives its own deep copy of the cached inputs, so parameter changes
+    never leak between runs. Entries for a model are dropped when the catalog
+    reports a different version list for it.
+    """
+
+    def __init__(self, client: Any):
+        self.client = client
+        self._versions: Dict[Tuple[str, str], Any] = {}
+        self._inputs: Dict[Tuple[str, str], Any] = {}
+        self._latest: Dict[str, str] = {}
+        self._fingerprints: Dict[str, Tuple[str, ...]] = {}
+        self._locks: Dict[Tuple[str, str], asyncio.Lock] = {}
+
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    def _lock_for(self, key: Tuple[str, str]) -> asyncio.Lock:
+        lock = self._locks.get(key)
+        if lock is None:
+            lock = self._locks[key] = asyncio.Lock()
+        return lock
+
+    async def get_version(self, model: Any, version_id: Optional[str] = None) -> Any:
+        """
+        Get a model version, fetching it from AnyLogic Cloud only once.
+
+        Args:
+            model: AnyLogic model object from the catalog
+            version_id: Specific version id, or None for the latest version
+
+        Returns:
+            AnyLogic model version object
+        """
+        model_id = str(getattr(model, "id", ""))
+        self._track(model)
+
+        if version_id is None and model_id in self._latest:
+            version_id = self._latest[model_id]
+        key = (model_id, str(version_id) if version_id is not None else LATEST)
+
+        version = self._versions.get(key)
+        if version is not None:
+            self.hits += 1
+            return version
+
+        async with self._lock_for(key):
+            if version_id is None and model_id in self._latest:
+                # Another caller resolved "latest" while this one waited; it is stored under the real id
+                key = (model_id, self._latest[model_id])
+            version = self._versions.get(key)
+            if version is not None:
+                self.hits += 1
+                return version
+
+            self.misses += 1
+            if version_id is None:
+                version = await cloud_executor.call(self.client.get_latest_model_version, model)
+                resolved_id = getattr(version, "id", None)
+                if resolved_id is not None:
+                    self._latest[model_id] = str(resolved_id)
+                    key = (model_id, str(resolved_id))
+            else:
+                version = await cloud_executor.call(self.client.get_model_version_by_id, model, version_id)
+
+            self._versions[key] = version
+            return version
+
+    async def default_inputs(self, model: Any, version_id: Optional[str] = None) -> Tuple[Any, Any]:
+        """
+        Get a model version and a private copy of its default inputs.
+
+        Returns:
+            (version, inputs) where inputs is safe to modify for a single run
+        """
+        version = await self.get_version(model, version_id)
+        model_id = str(getattr(model, "id", ""))
+        key = (model_id, str(getattr(version, "id", None) or version_id or LATEST))
+
+        template = self._inputs.get(key)
+        if template is None:
+            async with self._lock_for(key):
+                template = self._inputs.get(key)
+                if template is None:
+                    template = await cloud_executor.call(self.client.create_default_inputs, version)
+                    self._inputs[key] = template
+
+        # Share the client and version objects; only the input values are copied
+        memo = {id(self.client): self.client, id(version): version}
+        return version, copy.deepcopy(template, memo)
+
+    def _track(self, model: Any) -> None:
+        """Remember the version list a model had when it was first cached."""
+        model_id = str(getattr(model, "id", ""))
+        self._fingerprints.setdefault(model_id, version_fingerprint(model))
+
+    def sync_catalog(self, models: List[Any]) -> None:
+        """
+        Invalidate cached versions for models whose version list changed in the catalog.
+
+        Stored run outputs of the model's other versions are pruned from the result
+        cache at the same time, keeping those of the new latest version.
+        """
+        for model in models:
+            model_id = str(getattr(model, "id", ""))
+            known = self._fingerprints.get(model_id)
+            fingerprint = version_fingerprint(model)
+            if known is not None and known != fingerprint:
+                logger.info(f"Model {model_id} has a new version; dropping cached versions and inputs")
+                self.invalidate(model_id)
+                latest = fingerprint[-1] if fingerprint else None
+                if latest is not None and latest != (known[-1] if known else None):
+                    result_cache.invalidate_model(model_id, keep_version=latest)
+
+    def invalidate(self, model_id: Optional[str] = None) -> None:
+        """Drop cached entries for one model, or for every model."""
+        if model_id is None:
+            self._versions.clear()
+            self._inputs.clear()
+            self._latest.clear()
+            self._fingerprints.clear()
+        else:
+            for cache in (self._versions, self._inputs):
+                for key in [key for key in cache if key[0] == model_id]:
+                    del cache[key]
+            self._latest.pop(model_id, None)
+            self._fingerprints.pop(model_id, None)
+        self.invalidations += 1
+
+    def stats(self) -> Dict[str, Any]:
+        """Cache statistics for status resources."""
+        return {
+            "cached_versions": len(self._versions),
+            "cached_input_templates": len(self._inputs),
+            "hits": self.hits,
+            "misses": self.misses,
+            "invalidations": self.invalidations
+        }
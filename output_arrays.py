@@ -0,0 +1,236 @@
+"""
+Array-backed storage for time-series and dataset outputs.
+Numeric series found in a run's outputs are saved as NumPy .npy files in the simulation's
+arrays/ directory, next to outputs.json, and replaced in outputs.json by small references.
+A manifest (arrays.json) lists every array, and readers open them memory-mapped, so
+analysis and export never copy or re-parse the data. NumPy is optional: without it,
+series stay inline in outputs.json as decoded lists.
+"""
+
+import hashlib
+import io
+import logging
+import os
+import re
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+import serialization
+from artifact_writer import artifact_writer
+from results_layout import ResultsLayout
+
+logger = logging.getLogger(__name__)
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    np = None
+    NUMPY_AVAILABLE = False
+
+ARRAYS_DIR = "arrays"
+MANIFEST_FILE = "arrays.json"
+# Key marking an array reference inside outputs.json
+ARRAY_REF_KEY = "$array"
+
+_UNSAFE_NAME_CHARS = re.compile(r"[^\w.-]+")
+# Keys whose values are inputs, not outputs, and are never moved to arrays
+_SKIPPED_KEYS = {"parameters"}
+
+
+def decode_output_value(value: Any) -> Any:
+    """
+    Decode an AnyLogic output value into plain data.
+
+    Data sets, histograms and time series arrive either as objects or as JSON text;
+    both become dicts/lists so their numbers can be stored as arrays instead of one
+    huge string.
+    """
+    if isinstance(value, str):
+        text = value.strip()
+        if text[:1] in ("{", "[") and len(text) > 1:
+            try:
+                return serialization.loads(text)
+            except ValueError:
+                return value
+        return value
+    if value is None or isinstance(value, (bool, int, float)):
+        return value
+    if isinstance(value, dict):
+        return {key: decode_output_value(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [decode_output_value(item) for item in value]
+    return decode_output_value(serialization.to_jsonable(value))
+
+
+def _is_number(value: Any) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def numeric_shape(value: Any) -> Optional[Tuple[int, ...]]:
+    """Shape of a numeric series: a flat list of numbers or a list of equal-length number rows."""
+    if not isinstance(value, list) or not value:
+        return None
+    if all(_is_number(item) for item in value):
+        return (len(value),)
+    if all(isinstance(row, list) and row for row in value):
+        width = len(value[0])
+        if all(len(row) == width and all(_is_number(item) for item in row) for row in value):
+            return (len(value), width)
+    return None
+
+
+def is_array_ref(value: Any) -> bool:
+    """Whether a value in outputs.json is a reference to a stored array."""
+    return isinstance(value, dict) and ARRAY_REF_KEY in value
+
+
+class OutputArrayStore:
+    """Moves numeric series out of outputs.json into memory-mappable .npy files."""
+
+    def __init__(self, results_dir: Path, min_length: Optional[int] = None, layout: Optional[ResultsLayout] = None):
+        self.results_dir = Path(results_dir)
+        self.layout = layout or ResultsLayout(self.results_dir)
+        self.min_length = min_length or int(os.getenv("ANYLOGIC_ARRAY_MIN_LENGTH", "32"))
+
+    @property
+    def enabled(self) -> bool:
+        return NUMPY_AVAILABLE
+
+    def _sim_dir(self, sim_id: str) -> Path:
+        return self.layout.sim_dir(sim_id)
+
+    def extract(self, sim_id: str, output_data: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Store the numeric series of a run's outputs as arrays.
+
+        Args:
+            sim_id: Simulation ID (arrays go to results/<sim_id>/arrays/)
+            output_data: outputs.json structure
+
+        Returns:
+            Copy of output_data with each stored series replaced by a reference,
+            or output_data unchanged when NumPy is not installed
+        """
+        if not self.enabled:
+            return output_data
+
+        manifest: Dict[str, Dict[str, Any]] = {}
+        used_files: set = set()
+        # Entries by content digest: a series reported under several names (raw_outputs
+        # and individual_outputs) is written once and shared by their manifest entries
+        stored_files: Dict[str, Dict[str, Any]] = {}
+
+        def store(path: List[str], values: list) -> Dict[str, Any]:
+            name = "/".join(path)
+            array = np.asarray(values)
+            buffer = io.BytesIO()
+            np.save(buffer, array, allow_pickle=False)
+            content = buffer.getvalue()
+            digest = hashlib.sha256(content).hexdigest()
+
+            entry = stored_files.get(digest)
+            if entry is None:
+                stem = _UNSAFE_NAME_CHARS.sub("_", ".".join(path)).strip("_") or "array"
+                file_name, suffix = f"{stem}.npy", 1
+                while file_name in used_files:
+                    suffix += 1
+                    file_name = f"{stem}_{suffix}.npy"
+                used_files.add(file_name)
+
+                relative = f"{ARRAYS_DIR}/{file_name}"
+                artifact_writer.write_bytes(self._sim_dir(sim_id) / relative, content)
+                entry = {"file": relative, "dtype": str(array.dtype), "shape": list(array.shape)}
+                stored_files[digest] = entry
+
+            manifest[name] = dict(entry)
+            return {ARRAY_REF_KEY: name, **entry}
+
+        def walk(value: Any, path: List[str]) -> Any:
+            if isinstance(value, dict):
+                return {
+                    key: item if key in _SKIPPED_KEYS and not path else walk(item, path + [str(key)])
+                    for key, item in value.items()
+                }
+            if isinstance(value, list):
+                shape = numeric_shape(value)
+                if shape is not None and shape[0] >= self.min_length:
+                    return store(path, value)
+                return [walk(item, path + [str(index)]) for index, item in enumerate(value)]
+            return value
+
+        try:
+            stored = walk(output_data, [])
+        except Exception as e:
+            logger.warning(f"Could not store output arrays of {sim_id}, keeping them inline: {e}")
+            return output_data
+
+        if manifest:
+            artifact_writer.write_json(self._sim_dir(sim_id) / MANIFEST_FILE, {"arrays": manifest}, indent=True)
+            logger.info(f"Stored {len(manifest)} output arrays for {sim_id} in {len(stored_files)} files")
+        return stored
+
+    def manifest(self, sim_id: str) -> Dict[str, Dict[str, Any]]:
+        """Arrays stored for a simulation, by name; empty if there are none."""
+        try:
+            with open(self._sim_dir(sim_id) / MANIFEST_FILE, "rb") as f:
+                return serialization.loads(f.read()).get("arrays", {})
+        except FileNotFoundError:
+            return {}
+
+    def load(self, sim_id: str, name: str, mmap: bool = True) -> Any:
+        """
+        Open a stored array, memory-mapped read-only by default.
+
+        Raises:
+            KeyError: No array of that name
+            RuntimeError: NumPy is not installed
+        """
+        if not self.enabled:
+            raise RuntimeError("NumPy is required to read stored output arrays")
+        entry = self.manifest(sim_id).get(name)
+        if entry is None:
+            raise KeyError(f"Simulation {sim_id} has no output array '{name}'")
+        return self._open(sim_id, entry, mmap)
+
+    def _open(self, sim_id: str, entry: Dict[str, Any], mmap: bool = True) -> Any:
+        return np.load(self._sim_dir(sim_id) / entry["file"], mmap_mode="r" if mmap else None,
+                       allow_pickle=False)
+
+    def iter_arrays(self, sim_id: str) -> Iterator[Tuple[str, Any]]:
+        """(name, memory-mapped array) for every stored array of a simulation."""
+        if not self.enabled:
+            return
+        for name, entry in self.manifest(sim_id).items():
+            yield name, self._open(sim_id, entry)
+
+    def summary(self, sim_id: str, name: str) -> Dict[str, Any]:
+        """Length and basic statistics of a stored array, computed on the memory map."""
+        array = self.load(sim_id, name)
+        summary: Dict[str, Any] = {"shape": list(array.shape), "dtype": str(array.dtype)}
+        if array.size:
+            summary.update({"min": array.min().item(), "max": array.max().item(), "mean": array.mean().item()})
+        return summary
+
+    def resolve(self, sim_id: str, output_data: Any, materialize: bool = False) -> Any:
+        """
+        Prepare stored outputs for a response or export.
+
+        Each array reference gains its summary statistics, or with materialize=True
+        is replaced by the array's values.
+        """
+        if is_array_ref(output_data):
+            if not self.enabled:
+                return output_data
+            try:
+                if materialize:
+                    return self.load(sim_id, output_data[ARRAY_REF_KEY]).tolist()
+                return {**output_data, **self.summary(sim_id, output_data[ARRAY_REF_KEY])}
+            except (KeyError, OSError) as e:
+                logger.warning(f"Output array {output_data[ARRAY_REF_KEY]} of {sim_id} is unavailable: {e}")
+                return output_data
+        if isinstance(output_data, dict):
+            return {key: self.resolve(sim_id, value, materialize) for key, value in output_data.items()}
+        if isinstance(output_data, list):
+            return [self.resolve(sim_id, value, materialize) for value in output_data]
+        return output_data
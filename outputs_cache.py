@@ -0,0 +1,124 @@
+"""
+In-process cache of parsed simulation outputs.
+Results, export and resource reads of the same simulation all parse outputs.json; the
+cache keeps recently used outputs in memory, bounded by their stored size rather than
+by entry count, and reloads an entry whenever the file on disk has changed.
+"""
+
+import logging
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple, Union
+
+from artifact_compression import find_artifact, read_artifact
+import serialization
+
+logger = logging.getLogger(__name__)
+
+# (stored file, mtime in ns, stored size) identifying the version of an artifact on disk
+_Stamp = Tuple[str, int, int]
+
+
+class OutputsCache:
+    """
+    Byte-bounded LRU of parsed outputs.json contents, keyed by artifact path.
+
+    Cached values are shared between callers and must be treated as read-only.
+    """
+
+    def __init__(self, max_bytes: Optional[int] = None):
+        self.max_bytes = max_bytes if max_bytes is not None else int(
+            float(os.getenv("ANYLOGIC_OUTPUTS_CACHE_MB", "64")) * 1024 * 1024
+        )
+        self._entries: "OrderedDict[str, Tuple[_Stamp, int, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.current_bytes = 0
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def _stamp(path: Path) -> Optional[_Stamp]:
+        stored = find_artifact(path)
+        if stored is None:
+            return None
+        try:
+            stat = stored.stat()
+        except FileNotFoundError:
+            return None
+        return (str(stored), stat.st_mtime_ns, stat.st_size)
+
+    def load(self, path: Union[str, Path]) -> Any:
+        """
+        Parsed contents of an outputs artifact (compressed or not), from memory when unchanged on disk.
+
+        Raises:
+            FileNotFoundError: No variant of the artifact exists
+        """
+        key = str(path)
+        stamp = self._stamp(Path(path))
+        if stamp is None:
+            self.invalidate(path)
+            raise FileNotFoundError(f"No such artifact: {path}")
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] == stamp:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[2]
+            self.misses += 1
+
+        data = read_artifact(path)
+        value = serialization.loads(data)
+        self._put(key, stamp, len(data), value)
+        return value
+
+    def _put(self, key: str, stamp: _Stamp, size: int, value: Any) -> None:
+        with self._lock:
+            self._discard(key)
+            if size > self.max_bytes:
+                # Larger than the whole cache; caching it would only evict everything else
+                return
+            self._entries[key] = (stamp, size, value)
+            self.current_bytes += size
+            while self.current_bytes > self.max_bytes:
+                _, (_, evicted_size, _) = self._entries.popitem(last=False)
+                self.current_bytes -= evicted_size
+
+    def _discard(self, key: str) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self.current_bytes -= entry[1]
+
+    def invalidate(self, path: Union[str, Path]) -> None:
+        """Drop a cached artifact (after rewriting or deleting it)."""
+        with self._lock:
+            self._discard(str(path))
+
+    def invalidate_dir(self, directory: Union[str, Path]) -> None:
+        """Drop every cached artifact under a directory (after removing a simulation)."""
+        prefix = str(directory) + os.sep
+        with self._lock:
+            for key in [key for key in self._entries if key.startswith(prefix)]:
+                self._discard(key)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.current_bytes = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """Cache size and hit counts for status resources."""
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "bytes": self.current_bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses
+            }
+
+# Global outputs cache shared by all tools in a server process
+outputs_cache = OutputsCache()
@@ -0,0 +1,231 @@
+"""
+Parameter sweeps for AnyLogic simulations.
+Expands a grid (or explicit list) of parameter sets and runs the points concurrently
+under a configurable limit, tracking per-point status and a combined result table.
+"""
+
+import asyncio
+import itertools
+import logging
+import os
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class SweepDefinitionError(ValueError):
+    """Raised when a sweep's grid or point list is invalid."""
+
+
+def expand_grid(grid: Dict[str, List[Any]]) -> List[Dict[str, Any]]:
+    """
+    Cartesian product of a parameter grid, in the order the parameters were given.
+
+    Example:
+        {"Rate": [1, 2], "Servers": [3]} -> [{"Rate": 1, "Servers": 3}, {"Rate": 2, "Servers": 3}]
+    """
+    names = list(grid)
+    values = []
+    for name in names:
+        options = grid[name]
+        if not isinstance(options, (list, tuple)):
+            options = [options]
+        if not options:
+            raise SweepDefinitionError(f"Grid parameter '{name}' has no values")
+        values.append(list(options))
+    return [dict(zip(names, combination)) for combination in itertools.product(*values)]
+
+
+def build_points(grid: Optional[Dict[str, List[Any]]] = None,
+                 points: Optional[List[Dict[str, Any]]] = None,
+                 max_points: Optional[int] = None) -> List[Dict[str, Any]]:
+    """
+    Build the parameter sets for a sweep from a grid, an explicit list, or both.
+
+    Explicit points are appended after the grid points.
+
+    Raises:
+        SweepDefinitionError: Nothing to run, malformed points or too many points
+    """
+    max_points = max_points or int(os.getenv("ANYLOGIC_SWEEP_MAX_POINTS", "500"))
+
+    parameter_sets = expand_grid(grid) if grid else []
+    for point in points or []:
+        if not isinstance(point, dict):
+            raise SweepDefinitionError(f"Sweep points must be parameter objects, got {type(point).__name__}")
+        parameter_sets.append(dict(point))
+
+    if not parameter_sets:
+        raise SweepDefinitionError("Provide a parameter grid or a list of parameter sets")
+    if len(parameter_sets) > max_points:
+        raise SweepDefinitionError(
+            f"Sweep has {len(parameter_sets)} points; the limit is {max_points} (ANYLOGIC_SWEEP_MAX_POINTS)"
+        )
+    return parameter_sets
+
+
+def table_values(outputs: Any) -> Dict[str, Any]:
+    """Scalar output values of a run for the combined result table."""
+    if not isinstance(outputs, dict):
+        return {}
+    individual = outputs.get("individual_outputs")
+    if isinstance(individual, dict) and "error" not in individual:
+        outputs = individual
+    return {
+        name: value for name, value in outputs.items()
+        if isinstance(value, (int, float, str, bool)) or value is None
+    }
+
+
+class ParameterSweep:
+    """State of one sweep: its points, their simulations and outputs."""
+
+    def __init__(self, sweep_id: str, model_name: str, parameter_sets: List[Dict[str, Any]],
+                 concurrency: int):
+        self.sweep_id = sweep_id
+        self.model_name = model_name
+        self.concurrency = concurrency
+        self.created = datetime.now().isoformat()
+        self.completed = ""
+        # Optional running aggregate (e.g. ReplicationStatistics) fed each completed point's outputs
+        self.statistics: Optional[Any] = None
+        self.points: List[Dict[str, Any]] = [
+            {
+                "index": index,
+                "parameters": parameters,
+                "status": "pending",
+                "simulation_id": None,
+                "error": None,
+                "outputs": {}
+            }
+            for index, parameters in enumerate(parameter_sets)
+        ]
+
+    @property
+    def status(self) -> str:
+        """Overall status derived from the point statuses."""
+        statuses = {point["status"] for point in self.points}
+        if statuses <= {"pending"}:
+            return "pending"
+        if statuses & {"pending", "running"}:
+            return "running"
+        if statuses == {"failed"}:
+            return "failed"
+        return "completed"
+
+    def counts(self) -> Dict[str, int]:
+        """Number of points in each status."""
+        counts = {"pending": 0, "running": 0, "completed": 0, "failed": 0}
+        for point in self.points:
+            counts[point["status"]] = counts.get(point["status"], 0) + 1
+        return counts
+
+    def result_table(self) -> Dict[str, Any]:
+        """One row per point: its parameters followed by its scalar outputs."""
+        parameter_columns: List[str] = []
+        output_columns: List[str] = []
+        for point in self.points:
+            for name in point["parameters"]:
+                if name not in parameter_columns:
+                    parameter_columns.append(name)
+            for name in point["outputs"]:
+                if name not in output_columns:
+                    output_columns.append(name)
+
+        columns = ["point", "simulation_id", "status"] + parameter_columns + output_columns
+        rows = []
+        for point in self.points:
+            row = [point["index"], point["simulation_id"], point["status"]]
+            row += [point["parameters"].get(name) for name in parameter_columns]
+            row += [point["outputs"].get(name) for name in output_columns]
+            rows.append(row)
+        return {"columns": columns, "rows": rows}
+
+    def to_dict(self, include_table: bool = True) -> Dict[str, Any]:
+        """JSON-friendly summary of the sweep."""
+        data = {
+            "sweep_id": self.sweep_id,
+            "model_name": self.model_name,
+            "status": self.status,
+            "created": self.created,
+            "completed": self.completed,
+            "concurrency": self.concurrency,
+            "total_points": len(self.points),
+            "counts": self.counts(),
+            "points": [
+                {key: point[key] for key in ("index", "parameters", "status", "simulation_id", "error")}
+                for point in self.points
+            ]
+        }
+        if self.statistics is not None:
+            data["statistics"] = self.statistics.summary()
+        if include_table:
+            data["results"] = self.result_table()
+        return data
+
+
+class SweepRunner:
+    """Runs sweep points with at most `concurrency` simulations in flight."""
+
+    def __init__(self, default_concurrency: Optional[int] = None):
+        self.default_concurrency = default_concurrency or int(os.getenv("ANYLOGIC_SWEEP_CONCURRENCY", "4"))
+        self.sweeps: Dict[str, ParameterSweep] = {}
+
+    def create(self, sweep_id: str, model_name: str, parameter_sets: List[Dict[str, Any]],
+               concurrency: Optional[int] = None) -> ParameterSweep:
+        """Register a new sweep."""
+        concurrency = max(1, concurrency or self.default_concurrency)
+        sweep = ParameterSweep(sweep_id, model_name, parameter_sets, concurrency)
+        self.sweeps[sweep_id] = sweep
+        return sweep
+
+    def get(self, sweep_id: str) -> Optional[ParameterSweep]:
+        """Look up a sweep by id."""
+        return self.sweeps.get(sweep_id)
+
+    async def run(self, sweep: ParameterSweep,
+                  run_point: Callable[[Dict[str, Any]], Awaitable[Dict[str, Any]]],
+                  on_progress: Optional[Callable[[ParameterSweep, Dict[str, Any]], Awaitable[None]]] = None
+                  ) -> ParameterSweep:
+        """
+        Run every pending point of a sweep.
+
+        Args:
+            sweep: Sweep to run
+            run_point: Coroutine taking a point and returning {"simulation_id", "outputs"};
+                it may set point["simulation_id"] as soon as the run is created
+            on_progress: Awaited after each point finishes (e.g. to report MCP progress)
+
+        Returns:
+            The finished sweep; failed points carry their error instead of raising
+        """
+        semaphore = asyncio.Semaphore(sweep.concurrency)
+
+        async def run_one(point: Dict[str, Any]) -> None:
+            async with semaphore:
+                point["status"] = "running"
+                try:
+                    result = await run_point(point)
+                    point["simulation_id"] = result.get("simulation_id", point["simulation_id"])
+                    point["outputs"] = table_values(result.get("outputs"))
+                    point["status"] = "completed"
+                    if sweep.statistics is not None:
+                        sweep.statistics.add(point["outputs"])
+                except Exception as e:
+                    logger.warning(f"Sweep {sweep.sweep_id} point {point['index']} failed: {e}")
+                    point["error"] = str(e)
+                    point["status"] = "failed"
+            if on_progress:
+                try:
+                    await on_progress(sweep, point)
+                except Exception as e:
+                    logger.debug(f"Sweep progress callback failed: {e}")
+
+        await asyncio.gather(*(run_one(point) for point in sweep.points if point["status"] == "pending"))
+        sweep.completed = datetime.now().isoformat()
+        logger.info(f"Sweep {sweep.sweep_id} finished: {sweep.counts()}")
+        return sweep
+
+# Global sweep registry shared by all tools in a server process
+sweep_runner = SweepRunner()
@@ -0,0 +1,117 @@
+"""
+Streaming statistics for Monte Carlo replications.
+Aggregates numeric outputs one replication at a time (Welford's algorithm), so the
+summary is available mid-run without re-reading stored outputs.
+"""
+
+import math
+from typing import Any, Dict, Optional
+
+# Two-sided Student t critical values for df = 1..30; larger samples use the normal quantile
+_T_CRITICAL = {
+    0.90: [6.314, 2.920, 2.353, 2.132, 2.015, 1.943, 1.895, 1.860, 1.833, 1.812,
+           1.796, 1.782, 1.771, 1.761, 1.753, 1.746, 1.740, 1.734, 1.729, 1.725,
+           1.721, 1.717, 1.714, 1.711, 1.708, 1.706, 1.703, 1.701, 1.699, 1.697],
+    0.95: [12.706, 4.303, 3.182, 2.776, 2.571, 2.447, 2.365, 2.306, 2.262, 2.228,
+           2.201, 2.179, 2.160, 2.145, 2.131, 2.120, 2.110, 2.101, 2.093, 2.086,
+           2.080, 2.074, 2.069, 2.064, 2.060, 2.056, 2.052, 2.048, 2.045, 2.042],
+    0.99: [63.657, 9.925, 5.841, 4.604, 4.032, 3.707, 3.499, 3.355, 3.250, 3.169,
+           3.106, 3.055, 3.012, 2.977, 2.947, 2.921, 2.898, 2.878, 2.861, 2.845,
+           2.831, 2.819, 2.807, 2.797, 2.787, 2.779, 2.771, 2.763, 2.756, 2.750]
+}
+_Z_CRITICAL = {0.90: 1.645, 0.95: 1.960, 0.99: 2.576}
+
+SUPPORTED_CONFIDENCE_LEVELS = tuple(sorted(_T_CRITICAL))
+
+
+def t_critical(confidence: float, df: int) -> float:
+    """Two-sided critical value for a confidence interval with df degrees of freedom."""
+    if confidence not in _T_CRITICAL:
+        raise ValueError(f"Confidence level must be one of {SUPPORTED_CONFIDENCE_LEVELS}")
+    if df <= 0:
+        return math.nan
+    table = _T_CRITICAL[confidence]
+    return table[df - 1] if df <= len(table) else _Z_CRITICAL[confidence]
+
+
+class RunningStats:
+    """Welford running mean/variance with min and max for one output."""
+
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self._m2 = 0.0
+        self.minimum = math.inf
+        self.maximum = -math.inf
+
+    def add(self, value: float) -> None:
+        """Fold one observation into the statistics."""
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self._m2 += delta * (value - self.mean)
+        self.minimum = min(self.minimum, value)
+        self.maximum = max(self.maximum, value)
+
+    @property
+    def variance(self) -> float:
+        """Sample variance (n - 1 denominator); 0 for fewer than two observations."""
+        return self._m2 / (self.count - 1) if self.count > 1 else 0.0
+
+    @property
+    def std_dev(self) -> float:
+        return math.sqrt(self.variance)
+
+    def confidence_interval(self, confidence: float = 0.95) -> Optional[Dict[str, float]]:
+        """Confidence interval of the mean, None until two observations exist."""
+        if self.count < 2:
+            return None
+        half_width = t_critical(confidence, self.count - 1) * self.std_dev / math.sqrt(self.count)
+        return {
+            "level": confidence,
+            "lower": self.mean - half_width,
+            "upper": self.mean + half_width,
+            "half_width": half_width
+        }
+
+    def summary(self, confidence: float = 0.95) -> Dict[str, Any]:
+        """JSON-friendly statistics."""
+        return {
+            "count": self.count,
+            "mean": self.mean,
+            "std_dev": self.std_dev,
+            "variance": self.variance,
+            "min": self.minimum if self.count else None,
+            "max": self.maximum if self.count else None,
+            "confidence_interval": self.confidence_interval(confidence)
+        }
+
+
+class ReplicationStatistics:
+    """Per-output running statistics across the replications of one scenario."""
+
+    def __init__(self, confidence: float = 0.95):
+        if confidence not in _T_CRITICAL:
+            raise ValueError(f"Confidence level must be one of {SUPPORTED_CONFIDENCE_LEVELS}")
+        self.confidence = confidence
+        self.replications = 0
+        self.outputs: Dict[str, RunningStats] = {}
+
+    def add(self, outputs: Dict[str, Any]) -> None:
+        """Fold one replication's scalar outputs in; non-numeric values are ignored."""
+        self.replications += 1
+        for name, value in outputs.items():
+            if isinstance(value, bool) or not isinstance(value, (int, float)) or math.isnan(value):
+                continue
+            stats = self.outputs.get(name)
+            if stats is None:
+                stats = self.outputs[name] = RunningStats()
+            stats.add(float(value))
+
+    def summary(self) -> Dict[str, Any]:
+        """Statistics for every numeric output seen so far."""
+        return {
+            "replications": self.replications,
+            "confidence_level": self.confidence,
+            "outputs": {name: stats.summary(self.confidence) for name, stats in self.outputs.items()}
+        }
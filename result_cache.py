@@ -0,0 +1,193 @@
+"""
+Content-addressed cache of AnyLogic simulation outputs.
+Identical runs (same model version, parameters and seed) reuse stored outputs instead of
+spending cloud minutes again.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import re
+import shutil
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from artifact_compression import read_json_artifact, remove_artifact
+from artifact_writer import artifact_writer
+
+logger = logging.getLogger(__name__)
+
+# Input names that carry the run's random seed
+SEED_PARAMETERS = ("{RANDOM_SEED}",)
+
+_UNSAFE_PATH_CHARS = re.compile(r"[^\w.-]+")
+
+
+def _canonical(value: Any) -> Any:
+    """Normalise a parameter value so equivalent inputs hash identically (2 == 2.0)."""
+    if isinstance(value, bool):
+        return value
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    if isinstance(value, dict):
+        return {str(k): _canonical(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_canonical(v) for v in value]
+    return value
+
+
+def run_cache_key(model_id: Any, version_id: Any, parameters: Optional[Dict[str, Any]]) -> str:
+    """
+    Canonical SHA-256 key of a simulation request.
+
+    Args:
+        model_id: AnyLogic model id
+        version_id: AnyLogic model version id
+        parameters: Input overrides; a seed input is hashed as its own field
+
+    Returns:
+        Hex digest identifying the run
+    """
+    parameters = dict(parameters or {})
+    seed = None
+    for name in SEED_PARAMETERS:
+        if name in parameters:
+            seed = parameters.pop(name)
+
+    payload = {
+        "model_id": str(model_id),
+        "version_id": str(version_id),
+        "parameters": _canonical(parameters),
+        "seed": _canonical(seed)
+    }
+    encoded = json.dumps(payload, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+def _path_part(value: Any) -> str:
+    return _UNSAFE_PATH_CHARS.sub("_", str(value)) or "_"
+
+
+class ResultCache:
+    """
+    Persistent run-output cache stored as cache_dir/<model id>/<version id>/<key>.json.
+
+    Entries survive restarts. Because the version id is part of both the key and the
+    path, a new model version never hits old outputs; the model catalog prunes the old
+    entries (invalidate_model) when it reports a new latest version.
+    """
+
+    def __init__(self, cache_dir: Optional[Path] = None, enabled: Optional[bool] = None):
+        self._configured_dir = cache_dir or os.getenv("ANYLOGIC_RESULT_CACHE_DIR")
+        self.cache_dir = Path(self._configured_dir or "simulations/cache")
+        self.enabled = (
+            enabled if enabled is not None
+            else os.getenv("ANYLOGIC_RESULT_CACHE", "true").lower() in ("1", "true", "yes")
+        )
+
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+        self.invalidations = 0
+
+    def use_storage_dir(self, storage_dir: Path) -> None:
+        """
+        Keep the cache in a server's storage directory (storage_dir/cache), next to its results.
+
+        An explicitly configured directory (argument or ANYLOGIC_RESULT_CACHE_DIR) wins.
+        """
+        if not self._configured_dir:
+            self.cache_dir = Path(storage_dir).absolute() / "cache"
+
+    def _entry_path(self, model_id: Any, version_id: Any, key: str) -> Path:
+        return self.cache_dir / _path_part(model_id) / _path_part(version_id) / f"{key}.json"
+
+    def lookup(self, model_id: Any, version_id: Any, parameters: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+        """
+        Find stored outputs for an identical run.
+
+        Returns:
+            Cache entry with "key", "outputs" and "source_simulation", or None on a miss
+        """
+        if not self.enabled:
+            return None
+
+        key = run_cache_key(model_id, version_id, parameters)
+        path = self._entry_path(model_id, version_id, key)
+        try:
+            entry = read_json_artifact(path)
+        except FileNotFoundError:
+            self.misses += 1
+            return None
+        except Exception as e:
+            logger.warning(f"Discarding unreadable cache entry {path}: {e}")
+            remove_artifact(path)
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        return entry
+
+    def store(self, model_id: Any, version_id: Any, parameters: Optional[Dict[str, Any]],
+              outputs: Any, sim_id: str) -> Optional[str]:
+        """Store a completed run's outputs; returns the cache key (None when disabled)."""
+        if not self.enabled:
+            return None
+
+        key = run_cache_key(model_id, version_id, parameters)
+        path = self._entry_path(model_id, version_id, key)
+        entry = {
+            "key": key,
+            "model_id": str(model_id),
+            "version_id": str(version_id),
+            "parameters": parameters or {},
+            "source_simulation": sim_id,
+            "cached_at": datetime.now().isoformat(),
+            "outputs": outputs
+        }
+
+        try:
+            artifact_writer.write_json(path, entry, compress=True)
+        except Exception as e:
+            logger.warning(f"Could not cache outputs of {sim_id}: {e}")
+            return None
+
+        self.stores += 1
+        return key
+
+    def invalidate_model(self, model_id: Any, keep_version: Any = None) -> int:
+        """Delete cached entries for a model, except those of keep_version; returns versions removed."""
+        model_dir = self.cache_dir / _path_part(model_id)
+        if not model_dir.is_dir():
+            return 0
+
+        keep = _path_part(keep_version) if keep_version is not None else None
+        removed = 0
+        for version_dir in model_dir.iterdir():
+            if version_dir.is_dir() and version_dir.name != keep:
+                shutil.rmtree(version_dir, ignore_errors=True)
+                removed += 1
+
+        if removed:
+            self.invalidations += removed
+            logger.info(f"Dropped cached results for {removed} outdated version(s) of model {model_id}")
+        return removed
+
+    def clear(self) -> None:
+        """Delete every cached entry."""
+        shutil.rmtree(self.cache_dir, ignore_errors=True)
+
+    def stats(self) -> Dict[str, Any]:
+        """Cache statistics for status resources."""
+        return {
+            "enabled": self.enabled,
+            "hits": self.hits,
+            "misses": self.misses,
+            "stores": self.stores,
+            "invalidations": self.invalidations
+        }
+
+# Global cache shared by all tools in a server process
+result_cache = ResultCache()
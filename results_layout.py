@@ -0,0 +1,217 @@
+"""
+Directory layout of the simulation results store.
+With hundreds of thousands of runs a single flat results/ directory makes listing and
+lookups slow, so simulation directories can be fanned out by creation date
+(results/2025/01/31/sim_...) or by a hash prefix (results/3f/a2/sim_...). The path of a
+simulation is computed from its ID alone, and directories still in the flat layout are
+found as a fallback and moved into place by a background migrator.
+"""
+
+import hashlib
+import logging
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Dict, Iterator, Optional
+
+import serialization
+from simulation_ids import id_timestamp, is_simulation_id
+
+logger = logging.getLogger(__name__)
+
+LAYOUTS = ("flat", "date", "hash")
+# Deepest shard nesting of any layout (date: year/month/day)
+_MAX_DEPTH = 3
+# Statuses after which no server writes to a simulation directory again
+_TERMINAL_STATUSES = ("completed", "failed")
+
+
+def _is_shard_name(name: str) -> bool:
+    """Whether a directory name is a shard level of some layout (year, month/day, hash prefix)."""
+    if name == "undated":
+        return True
+    if len(name) == 4:
+        return name.isdigit()
+    return len(name) == 2 and all(c in "0123456789abcdef" for c in name)
+
+
+def _recorded_status(path: Path) -> Optional[str]:
+    """Status in a simulation directory's metadata.json, or None if it has none."""
+    try:
+        metadata = serialization.loads((path / "metadata.json").read_bytes())
+    except (OSError, ValueError):
+        return None
+    return metadata.get("status") if isinstance(metadata, dict) else None
+
+
+class ResultsLayout:
+    """Maps simulation IDs to their directories under one results directory."""
+
+    def __init__(self, results_dir: Path, scheme: Optional[str] = None, min_idle_seconds: Optional[float] = None):
+        self.results_dir = Path(results_dir)
+        self.scheme = (scheme or os.getenv("ANYLOGIC_RESULTS_LAYOUT", "flat")).lower()
+        if self.scheme not in LAYOUTS:
+            raise ValueError(f"Results layout must be one of {LAYOUTS}, got '{self.scheme}'")
+        # Directories written to more recently than this are left for a later migration pass
+        self.min_idle_seconds = min_idle_seconds if min_idle_seconds is not None else float(
+            os.getenv("ANYLOGIC_RESULTS_MIGRATE_MIN_IDLE", "300")
+        )
+        self._migration: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self.migrated = 0
+
+    def shard_path(self, sim_id: str) -> Path:
+        """Directory of a simulation under the configured layout."""
+        if self.scheme == "date":
+            created = id_timestamp(sim_id)
+            if created is None:
+                return self.results_dir / "undated" / sim_id
+            return self.results_dir / f"{created:%Y}" / f"{created:%m}" / f"{created:%d}" / sim_id
+        if self.scheme == "hash":
+            digest = hashlib.sha1(sim_id.encode("utf-8")).hexdigest()
+            return self.results_dir / digest[:2] / digest[2:4] / sim_id
+        return self.results_dir / sim_id
+
+    def sim_dir(self, sim_id: str) -> Path:
+        """
+        Directory of a simulation, wherever it currently is.
+
+        Checks the configured location, then the legacy flat location, so reads keep
+        working before and during migration; new simulations get the configured location.
+        """
+        path = self.shard_path(sim_id)
+        if self.scheme == "flat" or path.exists():
+            return path
+        flat_path = self.results_dir / sim_id
+        if flat_path.exists():
+            return flat_path
+        # Re-check in case the migrator moved it between the two lookups
+        return path
+
+    def iter_sim_dirs(self) -> Iterator[Path]:
+        """Every simulation directory, in any layout (including mixed layouts mid-migration)."""
+        stack = [(self.results_dir, 0)]
+        while stack:
+            directory, depth = stack.pop()
+            try:
+                entries = list(os.scandir(directory))
+            except FileNotFoundError:
+                continue
+            for entry in entries:
+                if not entry.is_dir():
+                    continue
+                # Top-level directories that are not shards are simulations, whatever their name
+                if is_simulation_id(entry.name) or (depth == 0 and not _is_shard_name(entry.name)):
+                    yield Path(entry.path)
+                elif depth < _MAX_DEPTH:
+                    stack.append((Path(entry.path), depth + 1))
+
+    def migrate(self, limit: Optional[int] = None,
+                on_moved: Optional[Callable[[str, Path], None]] = None) -> Dict[str, int]:
+        """
+        Move simulation directories that are not where the configured layout puts them.
+
+        Directories modified in the last `min_idle_seconds`, and those whose
+        metadata.json records a status other than completed or failed, are skipped:
+        a run still in flight may write its outputs at any time, however long it has
+        been idle. Status changes are journaled, so a finished run is moved once
+        compaction has folded its final status into metadata.json.
+
+        Returns:
+            Counts of directories moved, skipped as busy and skipped because of a conflict
+        """
+        counts = {"moved": 0, "busy": 0, "conflicts": 0}
+        now = time.time()
+        for path in list(self.iter_sim_dirs()):
+            if self._stop.is_set() or (limit is not None and counts["moved"] >= limit):
+                break
+            sim_id = path.name
+            target = self.shard_path(sim_id)
+            if path == target:
+                continue
+            try:
+                if now - path.stat().st_mtime < self.min_idle_seconds:
+                    counts["busy"] += 1
+                    continue
+                status = _recorded_status(path)
+                if status is not None and status not in _TERMINAL_STATUSES:
+                    counts["busy"] += 1
+                    continue
+                if target.exists():
+                    logger.warning(f"Not migrating {path}: {target} already exists")
+                    counts["conflicts"] += 1
+                    continue
+                target.parent.mkdir(parents=True, exist_ok=True)
+                os.rename(path, target)
+            except FileNotFoundError:
+                # Removed by cleanup while migrating
+                continue
+            counts["moved"] += 1
+            self.migrated += 1
+            if on_moved:
+                on_moved(sim_id, target)
+        self._prune_empty_shards()
+        return counts
+
+    def _prune_empty_shards(self, directory: Optional[Path] = None, depth: int = 0) -> None:
+        """Remove shard directories left empty by migration or cleanup (never simulation directories)."""
+        directory = directory or self.results_dir
+        try:
+            entries = list(os.scandir(directory))
+        except FileNotFoundError:
+            return
+        for entry in entries:
+            if entry.is_dir() and _is_shard_name(entry.name) and depth < _MAX_DEPTH:
+                self._prune_empty_shards(Path(entry.path), depth + 1)
+        if directory != self.results_dir:
+            try:
+                directory.rmdir()
+            except OSError:
+                # Not empty
+                pass
+
+    def needs_migration(self) -> bool:
+        """Whether any simulation directory is outside its configured location."""
+        return any(path != self.shard_path(path.name) for path in self.iter_sim_dirs())
+
+    def start_background_migration(self, interval: Optional[float] = None) -> threading.Thread:
+        """
+        Migrate to the configured layout on a daemon thread, repeating until nothing is left.
+
+        Returns:
+            The migration thread
+        """
+        if self._migration is not None and self._migration.is_alive():
+            return self._migration
+        interval = interval if interval is not None else float(os.getenv("ANYLOGIC_RESULTS_MIGRATE_INTERVAL", "60"))
+
+        def run() -> None:
+            if not self.needs_migration():
+                return
+            logger.info(f"Migrating simulation results to the '{self.scheme}' layout")
+            while not self._stop.is_set():
+                counts = self.migrate()
+                if counts["moved"]:
+                    logger.info(f"Results migration: {counts}")
+                if not counts["busy"]:
+                    break
+                self._stop.wait(interval)
+            logger.info(f"Results migration finished; {self.migrated} directories moved")
+
+        self._stop.clear()
+        self._migration = threading.Thread(target=run, name="results-layout-migration", daemon=True)
+        self._migration.start()
+        return self._migration
+
+    def stop(self) -> None:
+        """Stop a running background migration after the current directory."""
+        self._stop.set()
+
+    def stats(self) -> Dict[str, object]:
+        """Layout settings and migration progress for status resources."""
+        return {
+            "layout": self.scheme,
+            "migrating": self._migration is not None and self._migration.is_alive(),
+            "migrated": self.migrated
+        }
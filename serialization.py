@@ -0,0 +1,289 @@
+"""
+JSON serialization for stored artifacts and tool responses.
+Uses orjson when it is installed and the standard library otherwise; iter_json()
+streams large responses and project_fields() trims them to the requested keys.
+"""
+
+import json
+import logging
+import os
+from datetime import date, datetime
+from decimal import Decimal
+from enum import Enum
+from pathlib import Path
+from collections.abc import Iterator, Mapping
+from typing import Any, Dict, Iterable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    orjson = None
+    ORJSON_AVAILABLE = False
+
+
+def to_jsonable(value: Any) -> Any:
+    """
+    Convert one value the JSON encoders do not support natively.
+
+    Used as the encoders' `default` hook: containers returned here are walked by
+    the encoder itself, so nested AnyLogic objects are converted in the same pass.
+    """
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, Decimal):
+        return float(value)
+    if isinstance(value, (set, frozenset)):
+        return list(value)
+    if isinstance(value, Path):
+        return str(value)
+    if isinstance(value, (bytes, bytearray)):
+        return value.decode("utf-8", errors="replace")
+    if hasattr(value, "tolist"):
+        # numpy arrays and scalars
+        return value.tolist()
+    if hasattr(value, "to_dict"):
+        return value.to_dict()
+    if hasattr(value, "__dict__"):
+        return vars(value)
+    return str(value)
+
+
+class Serializer:
+    """Encodes values to bytes and back."""
+
+    name = "base"
+    content_type = "application/octet-stream"
+
+    def dumps(self, value: Any, indent: bool = False) -> bytes:
+        raise NotImplementedError
+
+    def loads(self, data: bytes) -> Any:
+        raise NotImplementedError
+
+
+class StdlibJsonSerializer(Serializer):
+    """Standard library json, compact unless indentation is requested."""
+
+    name = "json"
+    content_type = "application/json"
+
+    def dumps(self, value: Any, indent: bool = False) -> bytes:
+        if indent:
+            text = json.dumps(value, indent=2, default=to_jsonable)
+        else:
+            text = json.dumps(value, separators=(",", ":"), default=to_jsonable)
+        return text.encode("utf-8")
+
+    def loads(self, data: bytes) -> Any:
+        return json.loads(data)
+
+
+class OrjsonSerializer(StdlibJsonSerializer):
+    """orjson, falling back to the standard library for values orjson rejects (e.g. huge ints)."""
+
+    name = "orjson"
+
+    def dumps(self, value: Any, indent: bool = False) -> bytes:
+        option = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        try:
+            return orjson.dumps(value, default=to_jsonable, option=option)
+        except TypeError:
+            return super().dumps(value, indent)
+
+    def loads(self, data: bytes) -> Any:
+        return orjson.loads(data)
+
+
+def available_serializers() -> Dict[str, Serializer]:
+    """Serializers whose libraries are installed, by name."""
+    serializers: Dict[str, Serializer] = {"json": StdlibJsonSerializer()}
+    if ORJSON_AVAILABLE:
+        serializers["orjson"] = OrjsonSerializer()
+    return serializers
+
+
+def get_serializer(name: Optional[str] = None) -> Serializer:
+    """
+    Look up a serializer by name; "auto" picks the fastest installed JSON encoder.
+
+    Raises:
+        ValueError: Unknown serializer or its library is not installed
+    """
+    name = (name or "auto").lower()
+    serializers = available_serializers()
+    if name == "auto":
+        return serializers.get("orjson", serializers["json"])
+    if name not in serializers:
+        raise ValueError(f"Serializer '{name}' is not available; installed: {sorted(serializers)}")
+    return serializers[name]
+
+
+def _json_serializer_from_env() -> Serializer:
+    name = os.getenv("ANYLOGIC_JSON_SERIALIZER", "auto")
+    try:
+        serializer = get_serializer(name)
+    except ValueError as e:
+        logger.warning(f"{e}; using the default JSON serializer")
+        return get_serializer("auto")
+    return serializer
+
+# Global JSON serializer shared by all tools in a server process
+json_serializer = _json_serializer_from_env()
+
+
+def dumps(value: Any, indent: bool = False) -> bytes:
+    """Encode a value as JSON bytes (compact by default)."""
+    return json_serializer.dumps(value, indent)
+
+
+def dumps_text(value: Any, indent: bool = False) -> str:
+    """Encode a value as a JSON string, e.g. for tool responses."""
+    return json_serializer.dumps(value, indent).decode("utf-8")
+
+
+def loads(data: Any) -> Any:
+    """Decode JSON bytes or text."""
+    return json_serializer.loads(data)
+
+
+def _json_pieces(value: Any, indent: bool = False, depth: int = 0) -> Iterable[bytes]:
+    # Indented output matches dumps(indent=True): two spaces per level, ": " after keys
+    pad = b"\n" + b"  " * (depth + 1) if indent else b""
+    close = b"\n" + b"  " * depth if indent else b""
+    if isinstance(value, Mapping):
+        yield b"{"
+        count = 0
+        for key, item in value.items():
+            yield (b"," if count else b"") + pad + dumps(key if isinstance(key, str) else str(key)) + (
+                b": " if indent else b":")
+            yield from _json_pieces(item, indent, depth + 1)
+            count += 1
+        yield (close if count else b"") + b"}"
+    elif isinstance(value, Iterator):
+        yield b"["
+        count = 0
+        for item in value:
+            yield (b"," if count else b"") + pad
+            # Items (e.g. registry records) are encoded whole; only nested generators are streamed
+            yield from _json_pieces(item, indent, depth + 1) if isinstance(item, Iterator) else (
+                _indented(dumps(item, indent), depth + 1) if indent else dumps(item),)
+            count += 1
+        yield (close if count else b"") + b"]"
+    else:
+        yield _indented(dumps(value, indent), depth) if indent else dumps(value)
+
+
+def _indented(encoded: bytes, depth: int) -> bytes:
+    """Shift an indented document encoded at the top level to a nesting depth."""
+    return encoded.replace(b"\n", b"\n" + b"  " * depth) if depth else encoded
+
+
+def iter_json(value: Any, chunk_size: Optional[int] = None, indent: bool = False) -> Iterable[bytes]:
+    """
+    Encode a value as JSON, yielding chunks of about chunk_size bytes.
+
+    Dicts are written key by key and iterators (e.g. generators over the registry)
+    become arrays written item by item, so only one item and one chunk are held in
+    memory at a time. Other values are encoded whole by the configured serializer.
+
+    Args:
+        value: Value to encode; iterators in it are consumed
+        chunk_size: Target chunk size (default ANYLOGIC_STREAM_CHUNK_BYTES, 64 KiB)
+        indent: Indent like dumps(indent=True) instead of writing compact JSON
+    """
+    chunk_size = chunk_size or int(os.getenv("ANYLOGIC_STREAM_CHUNK_BYTES", "65536"))
+    buffer = bytearray()
+    for piece in _json_pieces(value, indent):
+        buffer += piece
+        if len(buffer) >= chunk_size:
+            yield bytes(buffer)
+            buffer.clear()
+    if buffer:
+        yield bytes(buffer)
+
+
+def dumps_streamed(value: Any) -> str:
+    """
+    JSON string of a value that may contain generators (see iter_json), for MCP responses.
+
+    MCP results are a single string, so the encoded document is still buffered here;
+    only the generator entries are never collected into lists first. Like
+    dumps_response(), the output is indented unless ANYLOGIC_RESPONSE_MODE=compact.
+    """
+    return b"".join(iter_json(value, indent=not compact_responses())).decode("utf-8")
+
+
+def _response_mode_from_env() -> str:
+    mode = os.getenv("ANYLOGIC_RESPONSE_MODE", "pretty").strip().lower()
+    if mode not in ("pretty", "compact"):
+        logger.warning(f"Unknown ANYLOGIC_RESPONSE_MODE {mode!r}, using pretty")
+        return "pretty"
+    return mode
+
+# Global response mode shared by all tools in a server process
+response_mode = _response_mode_from_env()
+
+
+def compact_responses() -> bool:
+    """Whether tool responses are compact JSON rather than indented JSON or markdown."""
+    return response_mode == "compact"
+
+
+def dumps_response(value: Any) -> str:
+    """Encode a tool response: indented JSON, or compact JSON when ANYLOGIC_RESPONSE_MODE=compact."""
+    return dumps_text(value, indent=not compact_responses())
+
+
+def parse_fields(fields: Any) -> Optional[List[str]]:
+    """
+    Normalize a `fields` tool argument to a list of key paths.
+
+    Accepts a comma-separated string ("id,status,metadata.model_name") or a list of
+    names. Returns None when no projection was requested.
+    """
+    if fields is None:
+        return None
+    if isinstance(fields, str):
+        fields = fields.split(",")
+    names = [str(name).strip() for name in fields if str(name).strip()]
+    return names or None
+
+
+def project_fields(value: Any, fields: Any) -> Any:
+    """
+    Keep only the requested keys of a dict (or of each dict in a list).
+
+    Dotted names select nested keys, e.g. "metadata.model_name" keeps only
+    model_name inside metadata. Keys missing from the value are skipped.
+    """
+    names = parse_fields(fields)
+    if names is None:
+        return value
+    if isinstance(value, list):
+        return [project_fields(item, names) for item in value]
+    if not isinstance(value, Mapping):
+        return value
+
+    nested: Dict[str, Optional[List[str]]] = {}
+    for name in names:
+        head, _, rest = name.partition(".")
+        if not rest:
+            nested[head] = None
+        elif nested.get(head, []) is not None:
+            nested.setdefault(head, []).append(rest)
+
+    projected = {}
+    for key, item in value.items():
+        key_name = key if isinstance(key, str) else str(key)
+        if key_name not in nested:
+            continue
+        paths = nested[key_name]
+        projected[key] = item if paths is None else project_fields(item, paths)
+    return projected
@@ -0,0 +1,101 @@
+"""
+Collision-free, time-sortable simulation IDs.
+IDs look like sim_20250101_120000_123_9f3a1c_0000: a local timestamp with milliseconds,
+a per-process node component and a monotonic sequence, so concurrent coroutines,
+threads and processes never mint the same ID and IDs sort in creation order.
+"""
+
+import hashlib
+import os
+import re
+import socket
+import threading
+import time
+from datetime import datetime
+from typing import Optional
+
+# New-style IDs: <prefix>_YYYYmmdd_HHMMSS_mmm_<node>_<seq>
+_NEW_ID = re.compile(r"^(?P<prefix>[a-z]+)_(?P<stamp>\d{8}_\d{6})_(?P<ms>\d{3})_(?P<node>[0-9a-f]{6})_(?P<seq>[0-9a-f]{4})$")
+# Legacy IDs minted as sim_YYYYmmdd_HHMMSS, optionally with a suffix (e.g. sweep points)
+_LEGACY_ID = re.compile(r"^(?P<prefix>[a-z]+)_(?P<stamp>\d{8}_\d{6})(?:_.*)?$")
+
+_MAX_SEQUENCE = 0xFFFF
+
+
+def _default_node() -> str:
+    """Six hex digits identifying this process: hostname, pid and random salt."""
+    seed = f"{socket.gethostname()}|{os.getpid()}|{os.urandom(8).hex()}"
+    return hashlib.sha1(seed.encode("utf-8")).hexdigest()[:6]
+
+
+class SimulationIdGenerator:
+    """
+    Mints monotonic IDs for one process.
+
+    Within a millisecond the sequence increments; if the clock stands still past
+    the sequence range, or moves backwards, the generator keeps counting from its
+    last timestamp so IDs never repeat or go out of order.
+    """
+
+    def __init__(self, node: Optional[str] = None):
+        self.node = node or os.getenv("ANYLOGIC_NODE_ID") or _default_node()
+        self.node = re.sub(r"[^0-9a-f]", "", self.node.lower())[:6].rjust(6, "0")
+        self._lock = threading.Lock()
+        self._last_ms = 0
+        self._sequence = 0
+        self._pid = os.getpid()
+
+    def new(self, prefix: str = "sim") -> str:
+        """Mint a new ID such as sim_20250101_120000_123_9f3a1c_0000."""
+        with self._lock:
+            if os.getpid() != self._pid:
+                # Forked child: take a fresh node so it cannot repeat the parent's IDs
+                self._pid = os.getpid()
+                self.node = _default_node()
+                self._last_ms, self._sequence = 0, 0
+
+            now_ms = time.time_ns() // 1_000_000
+            if now_ms > self._last_ms:
+                self._last_ms, self._sequence = now_ms, 0
+            elif self._sequence < _MAX_SEQUENCE:
+                self._sequence += 1
+            else:
+                self._last_ms, self._sequence = self._last_ms + 1, 0
+            stamp_ms, sequence = self._last_ms, self._sequence
+
+        moment = datetime.fromtimestamp(stamp_ms / 1000)
+        return f"{prefix}_{moment.strftime('%Y%m%d_%H%M%S')}_{stamp_ms % 1000:03d}_{self.node}_{sequence:04x}"
+
+
+def id_timestamp(sim_id: str) -> Optional[datetime]:
+    """
+    Creation time encoded in a simulation ID, for both new and legacy (sim_YYYYmmdd_HHMMSS) IDs.
+
+    Returns:
+        Local naive datetime, or None if the ID carries no timestamp
+    """
+    match = _NEW_ID.match(sim_id)
+    if match:
+        moment = datetime.strptime(match.group("stamp"), "%Y%m%d_%H%M%S")
+        return moment.replace(microsecond=int(match.group("ms")) * 1000)
+
+    match = _LEGACY_ID.match(sim_id)
+    if match:
+        try:
+            return datetime.strptime(match.group("stamp"), "%Y%m%d_%H%M%S")
+        except ValueError:
+            return None
+    return None
+
+
+def is_simulation_id(name: str) -> bool:
+    """Whether a results directory name is a simulation ID (new or legacy)."""
+    return name.startswith("sim_") and id_timestamp(name) is not None
+
+# Global generator shared by all tools in a server process
+simulation_ids = SimulationIdGenerator()
+
+
+def new_simulation_id() -> str:
+    """Mint a new simulation ID."""
+    return simulation_ids.new("sim")
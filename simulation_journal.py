@@ -0,0 +1,213 @@
+"""
+Append-only lifecycle journal for simulation metadata.
+metadata.json is written once when a simulation is created; later status changes
+are appended to a single journal as small field updates and periodically folded
+back into the metadata.json snapshots (compaction).
+"""
+
+import logging
+import os
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import serialization
+from artifact_writer import artifact_writer
+from results_layout import ResultsLayout
+
+logger = logging.getLogger(__name__)
+
+_MISSING = object()
+
+
+def apply_event(state: Dict[str, Any], event: Dict[str, Any]) -> Dict[str, Any]:
+    """Apply one journal event (field sets and unsets) to a metadata dict in place."""
+    state.update(event.get("set", {}))
+    for key in event.get("unset", []):
+        state.pop(key, None)
+    return state
+
+
+class SimulationJournal:
+    """
+    Journal of metadata changes for the simulations under one results directory.
+
+    Each event is one JSON line: {"id", "ts", "set": {changed fields}, "unset": [removed fields]}.
+    Readers rebuild a simulation's current metadata by loading its metadata.json
+    snapshot and replaying its events. Compaction applies all events to the
+    snapshots and starts a new, empty journal.
+    """
+
+    def __init__(self, results_dir: Path, journal_path: Optional[Path] = None,
+                 compact_every: Optional[int] = None, layout: Optional[ResultsLayout] = None):
+        self.results_dir = Path(results_dir)
+        self.layout = layout or ResultsLayout(self.results_dir)
+        self.journal_path = Path(
+            journal_path or os.getenv("ANYLOGIC_JOURNAL_PATH", str(self.results_dir.parent / "journal.jsonl"))
+        )
+        self.compact_every = compact_every or int(os.getenv("ANYLOGIC_JOURNAL_COMPACT_EVERY", "1000"))
+
+        self._lock = threading.RLock()
+        # Last known metadata per simulation, used to journal only the fields that changed
+        self._state: Dict[str, Dict[str, Any]] = {}
+        self._events_since_compaction = 0
+        self._compaction: Optional[threading.Thread] = None
+
+        self.snapshots_written = 0
+        self.events_appended = 0
+        self.compactions = 0
+
+    def _snapshot_path(self, sim_id: str) -> Path:
+        return self.layout.sim_dir(sim_id) / "metadata.json"
+
+    def write(self, sim_id: str, metadata: Dict[str, Any]) -> None:
+        """
+        Record a simulation's current metadata.
+
+        The first write creates metadata.json; later writes append only the
+        fields that changed since the last write.
+        """
+        metadata = serialization.loads(serialization.dumps(metadata))
+        with self._lock:
+            previous = self._state.get(sim_id)
+            if previous is None:
+                previous = self.read(sim_id)
+
+            if previous is None:
+                artifact_writer.write_json(self._snapshot_path(sim_id), metadata)
+                self.snapshots_written += 1
+            else:
+                changed = {k: v for k, v in metadata.items() if previous.get(k, _MISSING) != v}
+                removed = [k for k in previous if k not in metadata]
+                if not changed and not removed:
+                    self._state[sim_id] = metadata
+                    return
+                event = {"id": sim_id, "ts": datetime.now().isoformat(), "set": changed}
+                if removed:
+                    event["unset"] = removed
+                self._append(event)
+
+            self._state[sim_id] = metadata
+
+        if self._events_since_compaction >= self.compact_every:
+            self.start_background_compaction()
+
+    def _append(self, event: Dict[str, Any]) -> None:
+        """Append one event line (opened per write so a rotated journal is never written to)."""
+        line = serialization.dumps_text(event) + "\n"
+        artifact_writer.append_text(self.journal_path, line)
+        self.events_appended += 1
+        self._events_since_compaction += 1
+
+    def _events(self, path: Optional[Path] = None) -> List[Dict[str, Any]]:
+        """All events in a journal file, skipping a torn final line."""
+        path = path or self.journal_path
+        events = []
+        try:
+            with open(path, "rb") as f:
+                for line in f:
+                    try:
+                        events.append(serialization.loads(line))
+                    except ValueError:
+                        logger.warning(f"Skipping unreadable journal line in {path}")
+        except FileNotFoundError:
+            pass
+        return events
+
+    def read(self, sim_id: str) -> Optional[Dict[str, Any]]:
+        """Current metadata of a simulation: its snapshot with its journal events replayed."""
+        try:
+            with open(self._snapshot_path(sim_id), "rb") as f:
+                state = serialization.loads(f.read())
+        except FileNotFoundError:
+            return None
+
+        with self._lock:
+            for event in self._events():
+                if event.get("id") == sim_id:
+                    apply_event(state, event)
+        return state
+
+    def forget(self, sim_id: str) -> None:
+        """Drop cached state for a simulation whose directory was removed."""
+        with self._lock:
+            self._state.pop(sim_id, None)
+
+    def start_background_compaction(self) -> threading.Thread:
+        """
+        Compact on a daemon thread so the writer that crossed compact_every is not held up.
+
+        Returns:
+            The compaction thread (the running one if a compaction is already under way)
+        """
+        with self._lock:
+            if self._compaction is not None and self._compaction.is_alive():
+                return self._compaction
+            self._compaction = threading.Thread(target=self._compact_quietly, name="journal-compaction",
+                                                daemon=True)
+            self._compaction.start()
+            return self._compaction
+
+    def _compact_quietly(self) -> None:
+        try:
+            self.compact()
+        except Exception as e:
+            logger.error(f"Journal compaction failed: {e}")
+
+    def compact(self) -> int:
+        """
+        Fold every journal event into the metadata.json snapshots.
+
+        The journal is renamed before it is read, so events appended meanwhile
+        (by this or another process) land in a fresh journal and are kept.
+
+        Returns:
+            Number of snapshots rewritten
+        """
+        with self._lock:
+            if not self.journal_path.exists():
+                self._events_since_compaction = 0
+                return 0
+
+            compacting_path = self.journal_path.with_suffix(self.journal_path.suffix + ".compacting")
+            if not compacting_path.exists():
+                os.replace(self.journal_path, compacting_path)
+
+            pending: Dict[str, List[Dict[str, Any]]] = {}
+            for event in self._events(compacting_path):
+                pending.setdefault(event.get("id"), []).append(event)
+
+            rewritten = 0
+            for sim_id, events in pending.items():
+                snapshot_path = self._snapshot_path(sim_id)
+                try:
+                    with open(snapshot_path, "rb") as f:
+                        state = serialization.loads(f.read())
+                except FileNotFoundError:
+                    # Simulation was cleaned up; its events are obsolete
+                    continue
+                for event in events:
+                    apply_event(state, event)
+                artifact_writer.write_json(snapshot_path, state)
+                rewritten += 1
+
+            # The old journal is only dropped once the snapshots replacing it are durable
+            artifact_writer.flush()
+            compacting_path.unlink(missing_ok=True)
+            self._state.clear()
+            self._events_since_compaction = 0
+            self.compactions += 1
+
+        logger.info(f"Compacted simulation journal into {rewritten} snapshots")
+        return rewritten
+
+    def stats(self) -> Dict[str, Any]:
+        """Journal statistics for status resources."""
+        return {
+            "snapshots_written": self.snapshots_written,
+            "events_appended": self.events_appended,
+            "events_since_compaction": self._events_since_compaction,
+            "compact_every": self.compact_every,
+            "compactions": self.compactions
+        }
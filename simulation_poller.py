@@ -0,0 +1,245 @@
+"""
+Central status poller for running AnyLogic simulations.
+One background task checks every tracked run with per-run exponential backoff and
+persists outputs as soon as a run completes, so clients read results from disk.
+"""
+
+import asyncio
+import logging
+import os
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+from cloud_executor import cloud_executor
+
+logger = logging.getLogger(__name__)
+
+# AnyLogic Cloud run states that end polling
+COMPLETED_STATES = {"COMPLETED"}
+FAILED_STATES = {"FAILED", "ERROR", "STOPPED", "CANCELLED"}
+
+
+class DurationEstimator:
+    """Exponential moving average of run durations per model."""
+
+    def __init__(self, default: Optional[float] = None, alpha: float = 0.3):
+        self.default = (
+            default if default is not None
+            else float(os.getenv("ANYLOGIC_POLL_DEFAULT_DURATION", "30"))
+        )
+        self.alpha = alpha
+        self._estimates: Dict[str, float] = {}
+
+    def expected(self, model_name: str) -> float:
+        """Typical duration of a run of this model in seconds."""
+        return self._estimates.get(model_name, self.default)
+
+    def record(self, model_name: str, duration: float) -> None:
+        """Fold an observed run duration into the model's estimate."""
+        previous = self._estimates.get(model_name)
+        if previous is None:
+            self._estimates[model_name] = duration
+        else:
+            self._estimates[model_name] = self.alpha * duration + (1 - self.alpha) * previous
+
+    def snapshot(self) -> Dict[str, float]:
+        """Current estimates, rounded for status resources."""
+        return {name: round(value, 1) for name, value in self._estimates.items()}
+
+
+class SimulationPoller:
+    """
+    Polls tracked simulations from a single background task.
+
+    A run's first check is scheduled at a fraction of its model's typical duration;
+    every inconclusive check doubles the delay up to max_interval. All checks that
+    are due together are issued concurrently through the cloud executor.
+    """
+
+    def __init__(self,
+                 on_complete: Optional[Callable[[str, Any], None]] = None,
+                 on_failure: Optional[Callable[[str, str], None]] = None,
+                 min_interval: Optional[float] = None,
+                 max_interval: Optional[float] = None,
+                 batch_size: Optional[int] = None,
+                 estimator: Optional[DurationEstimator] = None):
+        self.on_complete = on_complete
+        self.on_failure = on_failure
+        self.min_interval = (
+            min_interval if min_interval is not None
+            else float(os.getenv("ANYLOGIC_POLL_MIN_INTERVAL", "2"))
+        )
+        self.max_interval = (
+            max_interval if max_interval is not None
+            else float(os.getenv("ANYLOGIC_POLL_MAX_INTERVAL", "60"))
+        )
+        self.batch_size = batch_size or int(os.getenv("ANYLOGIC_POLL_BATCH_SIZE", "20"))
+        self.durations = estimator or DurationEstimator()
+
+        self._runs: Dict[str, Dict[str, Any]] = {}
+        self._task: Optional[asyncio.Task] = None
+        self._wakeup: Optional[asyncio.Event] = None
+
+        self.checks = 0
+        self.completed = 0
+        self.failed = 0
+        self.errors = 0
+
+    def _clamp(self, delay: float) -> float:
+        return max(self.min_interval, min(self.max_interval, delay))
+
+    def track(self, sim_id: str, simulation: Any, model_name: str) -> None:
+        """
+        Start polling a running simulation.
+
+        Args:
+            sim_id: Simulation ID
+            simulation: AnyLogic simulation object (must support get_status/get_outputs)
+            model_name: Model name used for the duration estimate
+        """
+        delay = self._clamp(self.durations.expected(model_name) / 4)
+        now = time.monotonic()
+        self._runs[sim_id] = {
+            "simulation": simulation,
+            "model_name": model_name,
+            "started": now,
+            "delay": delay,
+            "next_check": now + delay,
+            "checks": 0,
+            "status": "RUNNING"
+        }
+        self._ensure_running()
+        self._wakeup.set()
+
+    def untrack(self, sim_id: str) -> None:
+        """Stop polling a simulation."""
+        self._runs.pop(sim_id, None)
+
+    def is_tracking(self, sim_id: str) -> bool:
+        """Whether the poller is still waiting for this simulation."""
+        return sim_id in self._runs
+
+    def describe(self, sim_id: str) -> Optional[Dict[str, Any]]:
+        """Polling state of one simulation for tool responses."""
+        run = self._runs.get(sim_id)
+        if run is None:
+            return None
+        return {
+            "last_status": run["status"],
+            "checks": run["checks"],
+            "next_check_in_seconds": round(max(0.0, run["next_check"] - time.monotonic()), 1),
+            "expected_duration_seconds": round(self.durations.expected(run["model_name"]), 1)
+        }
+
+    def _ensure_running(self) -> None:
+        """Start the polling task on the current event loop if it is not running."""
+        loop = asyncio.get_running_loop()
+        if self._task is None or self._task.done() or self._task.get_loop() is not loop:
+            self._wakeup = asyncio.Event()
+            self._task = loop.create_task(self._run(), name="simulation-poller")
+
+    async def _run(self) -> None:
+        """Sleep until the next run is due, check every due run, repeat."""
+        while True:
+            if not self._runs:
+                self._wakeup.clear()
+                await self._wakeup.wait()
+                continue
+
+            now = time.monotonic()
+            due = sorted(
+                (sim_id for sim_id, run in self._runs.items() if run["next_check"] <= now),
+                key=lambda sim_id: self._runs[sim_id]["next_check"]
+            )[:self.batch_size]
+
+            if not due:
+                wait = min(run["next_check"] for run in self._runs.values()) - now
+                self._wakeup.clear()
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=wait)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            await self.poll_once(due)
+
+    async def poll_once(self, sim_ids: Optional[List[str]] = None) -> None:
+        """Check the given (or all tracked) simulations concurrently and act on the results."""
+        sim_ids = [sim_id for sim_id in (sim_ids or list(self._runs)) if sim_id in self._runs]
+        statuses = await asyncio.gather(
+            *(cloud_executor.call(self._runs[sim_id]["simulation"].get_status) for sim_id in sim_ids),
+            return_exceptions=True
+        )
+        for sim_id, status in zip(sim_ids, statuses):
+            await self._handle_status(sim_id, status)
+
+    async def _handle_status(self, sim_id: str, status: Any) -> None:
+        """Persist finished runs and back off on the rest."""
+        run = self._runs.get(sim_id)
+        if run is None:
+            return
+        self.checks += 1
+        run["checks"] += 1
+
+        if isinstance(status, Exception):
+            self.errors += 1
+            logger.warning(f"Status check for {sim_id} failed: {status}")
+            self._reschedule(run)
+            return
+
+        status = str(status).upper()
+        run["status"] = status
+
+        if status in COMPLETED_STATES:
+            try:
+                outputs = await cloud_executor.call(run["simulation"].get_outputs)
+            except Exception as e:
+                self.errors += 1
+                logger.warning(f"Fetching outputs for {sim_id} failed: {e}")
+                self._reschedule(run)
+                return
+            self._runs.pop(sim_id, None)
+            self.durations.record(run["model_name"], time.monotonic() - run["started"])
+            self.completed += 1
+            logger.info(f"Simulation {sim_id} completed after {run['checks']} status checks")
+            if self.on_complete:
+                await self._notify(self.on_complete, sim_id, outputs)
+        elif status in FAILED_STATES:
+            self._runs.pop(sim_id, None)
+            self.failed += 1
+            logger.warning(f"Simulation {sim_id} ended with status {status}")
+            if self.on_failure:
+                await self._notify(self.on_failure, sim_id, status)
+        else:
+            self._reschedule(run)
+
+    def _reschedule(self, run: Dict[str, Any]) -> None:
+        run["delay"] = self._clamp(run["delay"] * 2)
+        run["next_check"] = time.monotonic() + run["delay"]
+
+    @staticmethod
+    async def _notify(callback: Callable, sim_id: str, value: Any) -> None:
+        """Run a persistence callback off the event loop without letting its errors stop the poller."""
+        try:
+            await asyncio.to_thread(callback, sim_id, value)
+        except Exception as e:
+            logger.error(f"Failed to persist simulation {sim_id}: {e}")
+
+    def stop(self) -> None:
+        """Cancel the polling task (tracked runs are kept)."""
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    def stats(self) -> Dict[str, Any]:
+        """Poller statistics for status resources."""
+        return {
+            "tracked": len(self._runs),
+            "checks": self.checks,
+            "completed": self.completed,
+            "failed": self.failed,
+            "errors": self.errors,
+            "min_interval_seconds": self.min_interval,
+            "max_interval_seconds": self.max_interval,
+            "expected_durations": self.durations.snapshot()
+        }
@@ -0,0 +1,703 @@
+"""
+SQLite-backed simulation registry.
+Replaces the startup scan of every sim_* metadata.json with an embedded database
+(WAL mode) indexed on status, model, user and creation time. Behaves like the
+current_simulations dict the servers already use. Every write and removal takes
+the next value of a per-variant version counter, which drives the change feed.
+"""
+
+import asyncio
+import base64
+import binascii
+import logging
+import os
+import sqlite3
+import threading
+import time
+from collections.abc import Mapping, MutableMapping
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+import serialization
+from results_layout import ResultsLayout
+from simulation_ids import id_timestamp, is_simulation_id
+
+logger = logging.getLogger(__name__)
+
+# Statuses after which a run's live cloud object is no longer needed
+TERMINAL_STATUSES = {"completed", "failed"}
+
+# Keys that hold live (non-JSON) objects and are never persisted
+LIVE_KEYS = ("simulation",)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS simulations (
+    variant TEXT NOT NULL,
+    id TEXT NOT NULL,
+    status TEXT,
+    model_name TEXT,
+    user TEXT,
+    created TEXT NOT NULL,
+    updated TEXT,
+    -- Registry version of the row's last write, for the change feed
+    version INTEGER NOT NULL DEFAULT 0,
+    record TEXT NOT NULL,
+    PRIMARY KEY (variant, id)
+);
+-- Every index ends in (created, id), the listing order, so a filtered page reads only
+-- its own rows without a sort
+CREATE INDEX IF NOT EXISTS idx_simulations_status_created ON simulations (variant, status, created, id);
+CREATE INDEX IF NOT EXISTS idx_simulations_model_created ON simulations (variant, model_name, created, id);
+CREATE INDEX IF NOT EXISTS idx_simulations_user_created ON simulations (variant, user, created, id);
+CREATE INDEX IF NOT EXISTS idx_simulations_created_id ON simulations (variant, created, id);
+CREATE INDEX IF NOT EXISTS idx_simulations_version ON simulations (variant, version);
+CREATE TABLE IF NOT EXISTS registry_meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+-- Removed simulations, so the change feed can report deletions
+CREATE TABLE IF NOT EXISTS simulation_removals (
+    variant TEXT NOT NULL,
+    id TEXT NOT NULL,
+    version INTEGER NOT NULL,
+    PRIMARY KEY (variant, id)
+);
+CREATE INDEX IF NOT EXISTS idx_removals_version ON simulation_removals (variant, version);
+"""
+
+
+def _indexed_fields(record: Dict[str, Any]) -> Tuple[Optional[str], Optional[str], Optional[str], Optional[str]]:
+    """Pull status, model, user and created time out of any server's record shape."""
+    metadata = record.get("metadata") if isinstance(record.get("metadata"), dict) else {}
+    status = record.get("status") or metadata.get("status")
+    model_name = record.get("model_name") or metadata.get("model_name")
+    user = record.get("user") or metadata.get("user")
+    created = record.get("created") or record.get("start_time") or metadata.get("created")
+    return status, model_name, user, created or None
+
+
+def _sort_created(sim_id: str, created: Optional[str]) -> str:
+    """Created time used for ordering: the record's, else the one encoded in the ID, else ''."""
+    if created:
+        return created
+    moment = id_timestamp(sim_id)
+    return moment.isoformat() if moment else ""
+
+
+def encode_cursor(created: str, sim_id: str) -> str:
+    """Opaque pagination cursor pointing just past (created, id)."""
+    return base64.urlsafe_b64encode(serialization.dumps([created, sim_id])).decode("ascii")
+
+
+def decode_cursor(cursor: str) -> Tuple[str, str]:
+    """
+    (created, id) position of a cursor from encode_cursor.
+
+    Raises:
+        ValueError: The cursor is malformed
+    """
+    try:
+        created, sim_id = serialization.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+    except (binascii.Error, TypeError, ValueError, UnicodeEncodeError) as e:
+        raise ValueError(f"Invalid cursor '{cursor}'") from e
+    if not isinstance(created, str) or not isinstance(sim_id, str):
+        raise ValueError(f"Invalid cursor '{cursor}'")
+    return created, sim_id
+
+
+class SimulationRegistry(MutableMapping):
+    """
+    Dict-like store of simulation records for one server variant.
+
+    Records are persisted as JSON (without live keys such as the AnyLogic
+    simulation object). Records that carry a live simulation object stay in an
+    in-memory overlay until they reach a terminal status, so in-place updates by
+    running tasks are visible to readers. Every other read decodes from SQLite,
+    keeping memory independent of history size. Writing a record back
+    (registry[sim_id] = record) persists in-place changes.
+    """
+
+    def __init__(self, db_path: Path, variant: str = "default"):
+        self.db_path = Path(db_path)
+        self.variant = variant
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("PRAGMA busy_timeout=5000")
+        self._conn.executescript(_SCHEMA)
+
+        self._live: Dict[str, Dict[str, Any]] = {}
+
+        # Directory the registry is hydrated from, and whether that import has finished
+        self._results_dir: Optional[Path] = None
+        self._layout: Optional[ResultsLayout] = None
+        self._record_from_metadata: Optional[Callable[[str, Dict[str, Any]], Dict[str, Any]]] = None
+        self._hydrated = threading.Event()
+
+    @property
+    def _scan_key(self) -> str:
+        # Start time (epoch seconds) of the last directory scan
+        return f"scanned:{self.variant}"
+
+    @property
+    def hydrated(self) -> bool:
+        """Whether result directories have been scanned since the registry was opened."""
+        return self._hydrated.is_set()
+
+    # -- Mapping interface -------------------------------------------------
+
+    def __getitem__(self, sim_id: str) -> Dict[str, Any]:
+        live = self._live.get(sim_id)
+        if live is not None:
+            return live
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT record FROM simulations WHERE variant = ? AND id = ?", (self.variant, sim_id)
+            ).fetchone()
+        if row is None:
+            record = self._read_from_disk(sim_id)
+            if record is None:
+                raise KeyError(sim_id)
+            return record
+        return self._decode(row[0])
+
+    def __setitem__(self, sim_id: str, record: Dict[str, Any]) -> None:
+        if any(record.get(key) is not None for key in LIVE_KEYS) and record.get("status") not in TERMINAL_STATUSES:
+            self._live[sim_id] = record
+        else:
+            self._live.pop(sim_id, None)
+        self._write([(sim_id, record)])
+
+    def __delitem__(self, sim_id: str) -> None:
+        self._live.pop(sim_id, None)
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                cursor = self._conn.execute(
+                    "DELETE FROM simulations WHERE variant = ? AND id = ?", (self.variant, sim_id)
+                )
+                if cursor.rowcount:
+                    self._conn.execute(
+                        "INSERT OR REPLACE INTO simulation_removals (variant, id, version) VALUES (?, ?, ?)",
+                        (self.variant, sim_id, self._bump_version(1))
+                    )
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+        if cursor.rowcount == 0:
+            raise KeyError(sim_id)
+
+    def __contains__(self, sim_id: object) -> bool:
+        if sim_id in self._live:
+            return True
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT 1 FROM simulations WHERE variant = ? AND id = ?", (self.variant, sim_id)
+            ).fetchone()
+        return row is not None or self._read_from_disk(sim_id) is not None
+
+    def __iter__(self) -> Iterator[str]:
+        with self._lock:
+            ids = [row[0] for row in self._conn.execute(
+                "SELECT id FROM simulations WHERE variant = ? ORDER BY id", (self.variant,)
+            )]
+        return iter(ids)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute(
+                "SELECT COUNT(*) FROM simulations WHERE variant = ?", (self.variant,)
+            ).fetchone()[0]
+
+    def items(self) -> List[Tuple[str, Dict[str, Any]]]:
+        """All (id, record) pairs in creation order, in one query."""
+        return self.query()
+
+    def values(self) -> List[Dict[str, Any]]:
+        return [record for _, record in self.query()]
+
+    # -- Queries ---------------------------------------------------------------
+
+    def query(self, status: Optional[str] = None, model_name: Optional[str] = None,
+              user: Optional[str] = None, created_after: Optional[str] = None,
+              created_before: Optional[str] = None, limit: Optional[int] = None,
+              descending: bool = False, after: Optional[Tuple[str, str]] = None) -> List[Tuple[str, Dict[str, Any]]]:
+        """
+        Select records using the indexed columns, ordered by (created, id).
+
+        Args:
+            status: Exact status
+            model_name: Exact model name
+            user: Exact user name
+            created_after: ISO timestamp lower bound (inclusive)
+            created_before: ISO timestamp upper bound (exclusive)
+            limit: Maximum number of records
+            descending: Newest first
+            after: (created, id) position to continue from, exclusive (keyset pagination)
+
+        Returns:
+            List of (id, record) pairs
+        """
+        return [(sim_id, record) for sim_id, _, record in self._select(
+            status, model_name, user, created_after, created_before, limit, descending, after
+        )]
+
+    def count(self, status: Optional[str] = None, model_name: Optional[str] = None,
+              user: Optional[str] = None, created_after: Optional[str] = None,
+              created_before: Optional[str] = None) -> int:
+        """Number of records matching the filters, counted on an index."""
+        where, params = self._where(status, model_name, user, created_after, created_before)
+        with self._lock:
+            return self._conn.execute(f"SELECT COUNT(*) FROM simulations WHERE {where}", params).fetchone()[0]
+
+    def _where(self, status: Optional[str], model_name: Optional[str], user: Optional[str],
+               created_after: Optional[str], created_before: Optional[str]) -> Tuple[str, List[Any]]:
+        clauses = ["variant = ?"]
+        params: List[Any] = [self.variant]
+        for column, value in (("status", status), ("model_name", model_name), ("user", user)):
+            if value is not None:
+                clauses.append(f"{column} = ?")
+                params.append(value)
+        if created_after is not None:
+            clauses.append("created >= ?")
+            params.append(created_after)
+        if created_before is not None:
+            clauses.append("created < ?")
+            params.append(created_before)
+        return " AND ".join(clauses), params
+
+    def _select(self, status: Optional[str], model_name: Optional[str], user: Optional[str],
+                created_after: Optional[str], created_before: Optional[str], limit: Optional[int],
+                descending: bool, after: Optional[Tuple[str, str]]) -> List[Tuple[str, str, Dict[str, Any]]]:
+        """Matching (id, created, record) rows in (created, id) order."""
+        where, params = self._where(status, model_name, user, created_after, created_before)
+        if after is not None:
+            where += f" AND (created, id) {'<' if descending else '>'} (?, ?)"
+            params.extend(after)
+
+        direction = " DESC" if descending else ""
+        sql = f"SELECT id, created, record FROM simulations WHERE {where} ORDER BY created{direction}, id{direction}"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(int(limit))
+
+        with self._lock:
+            rows = self._conn.execute(sql, params).fetchall()
+        return [(sim_id, created, self._live.get(sim_id) or self._decode(record)) for sim_id, created, record in rows]
+
+    @property
+    def version(self) -> int:
+        """Version of the latest change; increases with every write and removal."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value FROM registry_meta WHERE key = ?", (self._version_key,)
+            ).fetchone()
+        return int(row[0]) if row else 0
+
+    def changes(self, since: int = 0, limit: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Simulations created, changed or removed after a version.
+
+        Args:
+            since: Version from a previous call (0 for everything)
+            limit: Maximum number of changed simulations
+
+        Returns:
+            {"simulations": [(id, record), ...] in change order, "removed": [ids],
+             "version": version to pass as `since` next time, "more": whether changes were cut off}
+        """
+        with self._lock:
+            # Read the counter first: versions up to it are committed, later ones are left for the next call
+            version = self.version
+            params: List[Any] = [self.variant, int(since), version]
+            sql = ("SELECT id, version, record FROM simulations "
+                   "WHERE variant = ? AND version > ? AND version <= ? ORDER BY version")
+            if limit is not None:
+                sql += " LIMIT ?"
+                params.append(int(limit) + 1)
+            rows = self._conn.execute(sql, params).fetchall()
+            more = limit is not None and len(rows) > limit
+            if more:
+                # Stop at the page's last version so nothing in between is skipped
+                rows = rows[:limit]
+                version = rows[-1][1]
+            removed = [row[0] for row in self._conn.execute(
+                "SELECT id FROM simulation_removals WHERE variant = ? AND version > ? AND version <= ? ORDER BY version",
+                (self.variant, int(since), version)
+            )]
+        return {
+            "simulations": [(sim_id, self._live.get(sim_id) or self._decode(record)) for sim_id, _, record in rows],
+            "removed": removed,
+            "version": version,
+            "more": more
+        }
+
+    def count_by_status(self) -> Dict[str, int]:
+        """Number of simulations per status."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT status, COUNT(*) FROM simulations WHERE variant = ? GROUP BY status", (self.variant,)
+            ).fetchall()
+        return {status or "unknown": count for status, count in rows}
+
+    # -- Import and persistence ---------------------------------------------
+
+    def attach_directory(self, results_dir: Path,
+                         record_from_metadata: Callable[[str, Dict[str, Any]], Dict[str, Any]]) -> None:
+        """Set the result directory used for hydration and for reads before hydration finishes."""
+        self._results_dir = Path(results_dir)
+        self._layout = ResultsLayout(self._results_dir)
+        self._record_from_metadata = record_from_metadata
+
+    def hydrate(self) -> int:
+        """Import new or changed runs from the attached result directory; returns records written."""
+        if self._results_dir is None or self._record_from_metadata is None:
+            self._hydrated.set()
+            return 0
+        return self.import_directories(self._results_dir, self._record_from_metadata)
+
+    def start_background_hydration(self) -> Optional[asyncio.Future]:
+        """
+        Hydrate on a worker thread so the server can answer requests immediately.
+
+        Until hydration finishes, lookups of IDs not yet in the database fall back to
+        reading that simulation's metadata.json directly.
+
+        Returns:
+            Future for the import, or None if the registry is already hydrated
+        """
+        if self.hydrated:
+            return None
+        future = asyncio.get_running_loop().run_in_executor(None, self.hydrate)
+        future.add_done_callback(self._log_hydration_failure)
+        return future
+
+    @staticmethod
+    def _log_hydration_failure(future: asyncio.Future) -> None:
+        if not future.cancelled() and future.exception() is not None:
+            logger.error(f"Simulation registry hydration failed: {future.exception()}")
+
+    def _read_from_disk(self, sim_id: Any) -> Optional[Dict[str, Any]]:
+        """Load one simulation straight from its directory while hydration is still running."""
+        if self.hydrated or self._results_dir is None or not isinstance(sim_id, str) or not is_simulation_id(sim_id):
+            return None
+        metadata_file = self._layout.sim_dir(sim_id) / "metadata.json"
+        try:
+            with open(metadata_file, "rb") as f:
+                record = self._record_from_metadata(sim_id, serialization.loads(f.read()))
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.warning(f"Failed to read simulation {sim_id} from disk: {e}")
+            return None
+        # Keep it so later reads hit the database; hydration will not overwrite it
+        self._write([(sim_id, record)], replace=False)
+        return record
+
+    def import_directories(self, results_dir: Path,
+                           record_from_metadata: Callable[[str, Dict[str, Any]], Dict[str, Any]],
+                           force: bool = False) -> int:
+        """
+        Import sim_* result directories added or changed since the last scan.
+
+        Directories whose ID is not in the registry are imported, and those whose
+        metadata.json changed after the previous scan started (e.g. runs written by
+        another variant or process sharing the storage) replace their row. Other
+        directories are only stat'ed, so startup does not re-read the whole history.
+
+        Args:
+            results_dir: Results directory (flat or sharded layout)
+            record_from_metadata: Builds this server's record from a metadata.json dict
+            force: Re-read every directory, not just new or changed ones
+
+        Returns:
+            Number of records imported or refreshed
+        """
+        scan_started = time.time()
+        with self._lock:
+            row = self._conn.execute("SELECT value FROM registry_meta WHERE key = ?", (self._scan_key,)).fetchone()
+            known = {sim_id for (sim_id,) in self._conn.execute(
+                "SELECT id FROM simulations WHERE variant = ?", (self.variant,)
+            )}
+        last_scan = float(row[0]) if row and not force else 0.0
+
+        added, changed = [], []
+        for sim_dir in ResultsLayout(results_dir).iter_sim_dirs():
+            sim_id = sim_dir.name
+            metadata_file = sim_dir / "metadata.json"
+            try:
+                modified = metadata_file.stat().st_mtime
+            except FileNotFoundError:
+                continue
+            # Files written after this scan started belong to runs this process is recording
+            if sim_id in known and (sim_id in self._live or not last_scan < modified < scan_started):
+                continue
+            try:
+                with open(metadata_file, "rb") as f:
+                    record = record_from_metadata(sim_id, serialization.loads(f.read()))
+            except Exception as e:
+                logger.warning(f"Skipping simulation {sim_id} during registry import: {e}")
+                continue
+            (changed if sim_id in known else added).append((sim_id, record))
+
+        imported = self._write(added, replace=False) + self._write(changed)
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO registry_meta (key, value) VALUES (?, ?)",
+                (self._scan_key, repr(scan_started))
+            )
+        self._hydrated.set()
+        logger.info(f"Imported {imported} new or changed simulations from {results_dir} into {self.db_path}")
+        return imported
+
+    def _write(self, records: List[Tuple[str, Dict[str, Any]]], replace: bool = True) -> int:
+        """Persist records in one transaction; returns the number of rows written."""
+        if not records:
+            return 0
+        verb = "INSERT OR REPLACE" if replace else "INSERT OR IGNORE"
+        now = datetime.now().isoformat()
+        rows = []
+        for sim_id, record in records:
+            status, model_name, user, created = _indexed_fields(record)
+            rows.append([self.variant, sim_id, status, model_name, user, _sort_created(sim_id, created), now,
+                         self._encode(record)])
+
+        with self._lock:
+            before = self._conn.total_changes
+            # IMMEDIATE takes the write lock up front, so concurrent writers get distinct versions
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                first = self._bump_version(len(rows)) - len(rows) + 1
+                for offset, row in enumerate(rows):
+                    row.append(first + offset)
+                self._conn.executemany(
+                    f"{verb} INTO simulations (variant, id, status, model_name, user, created, updated, record, version) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    rows
+                )
+                self._conn.executemany(
+                    "DELETE FROM simulation_removals WHERE variant = ? AND id = ?",
+                    [(self.variant, row[1]) for row in rows]
+                )
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+            return self._conn.total_changes - before
+
+    @property
+    def _version_key(self) -> str:
+        return f"version:{self.variant}"
+
+    def _bump_version(self, count: int) -> int:
+        """Reserve `count` versions inside the caller's transaction; returns the last one."""
+        row = self._conn.execute("SELECT value FROM registry_meta WHERE key = ?", (self._version_key,)).fetchone()
+        last = (int(row[0]) if row else 0) + count
+        self._conn.execute(
+            "INSERT OR REPLACE INTO registry_meta (key, value) VALUES (?, ?)", (self._version_key, str(last))
+        )
+        return last
+
+    @staticmethod
+    def _encode(record: Dict[str, Any]) -> str:
+        return serialization.dumps_text({k: v for k, v in record.items() if k not in LIVE_KEYS})
+
+    @staticmethod
+    def _decode(text: str) -> Dict[str, Any]:
+        record = serialization.loads(text)
+        for key in LIVE_KEYS:
+            record.setdefault(key, None)
+        return record
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            self._conn.close()
+
+
+def _filter_mapping(simulations: Mapping[str, Dict[str, Any]], status: Optional[str],
+                    model_name: Optional[str], user: Optional[str], created_after: Optional[str],
+                    created_before: Optional[str], descending: bool) -> List[Tuple[str, str, Dict[str, Any]]]:
+    """Scan a plain dict store with the registry's filter and ordering semantics."""
+    matches = []
+    for sim_id, record in simulations.items():
+        record_status, record_model, record_user, created = _indexed_fields(record)
+        created = _sort_created(sim_id, created)
+        if ((status is not None and record_status != status)
+                or (model_name is not None and record_model != model_name)
+                or (user is not None and record_user != user)
+                or (created_after is not None and created < created_after)
+                or (created_before is not None and created >= created_before)):
+            continue
+        matches.append((sim_id, created, record))
+    matches.sort(key=lambda match: (match[1], match[0]), reverse=descending)
+    return matches
+
+
+def query_simulations(simulations: Mapping[str, Dict[str, Any]], status: Optional[str] = None,
+                      model_name: Optional[str] = None, user: Optional[str] = None,
+                      created_after: Optional[str] = None, created_before: Optional[str] = None,
+                      limit: Optional[int] = None, descending: bool = True) -> List[Tuple[str, Dict[str, Any]]]:
+    """
+    Filter any simulation store the servers use, newest first by default.
+
+    A SimulationRegistry answers from its indexes, touching only matching rows; the
+    plain dict of the "memory" backend is scanned with the same semantics.
+    See SimulationRegistry.query for the arguments.
+    """
+    if isinstance(simulations, SimulationRegistry):
+        return simulations.query(status=status, model_name=model_name, user=user,
+                                 created_after=created_after, created_before=created_before,
+                                 limit=limit, descending=descending)
+    matches = _filter_mapping(simulations, status, model_name, user, created_after, created_before, descending)
+    return [(sim_id, record) for sim_id, _, record in matches[:limit]]
+
+
+def iter_simulations(simulations: Mapping[str, Dict[str, Any]], status: Optional[str] = None,
+                     model_name: Optional[str] = None, user: Optional[str] = None,
+                     created_after: Optional[str] = None, created_before: Optional[str] = None,
+                     batch_size: int = 500) -> Iterator[Tuple[str, Dict[str, Any]]]:
+    """
+    Generate matching (id, record) pairs, newest first, for streaming responses.
+
+    A SimulationRegistry is read in keyset batches of batch_size rows, so neither the
+    whole history nor an open database cursor is held between items.
+    """
+    filters = dict(status=status, model_name=model_name, user=user,
+                   created_after=created_after, created_before=created_before)
+    if not isinstance(simulations, SimulationRegistry):
+        for sim_id, _, record in _filter_mapping(simulations, descending=True, **filters):
+            yield sim_id, record
+        return
+
+    after = None
+    while True:
+        rows = simulations._select(limit=batch_size, descending=True, after=after, **filters)
+        for sim_id, _, record in rows:
+            yield sim_id, record
+        if len(rows) < batch_size:
+            return
+        after = (rows[-1][1], rows[-1][0])
+
+
+def page_simulations(simulations: Mapping[str, Dict[str, Any]], cursor: Optional[str] = None,
+                     page_size: Optional[int] = None, status: Optional[str] = None,
+                     model_name: Optional[str] = None, user: Optional[str] = None,
+                     created_after: Optional[str] = None,
+                     created_before: Optional[str] = None) -> Dict[str, Any]:
+    """
+    One page of simulations, newest first, in stable (created, id) order.
+
+    Args:
+        simulations: Any simulation store the servers use
+        cursor: next_cursor of the previous page, or None for the first page
+        page_size: Simulations per page (default ANYLOGIC_PAGE_SIZE, capped at ANYLOGIC_MAX_PAGE_SIZE)
+        status, model_name, user, created_after, created_before: Filters as in query_simulations
+
+    Returns:
+        {"simulations": [(id, record), ...], "next_cursor": str or None, "total": matching count}
+
+    Raises:
+        ValueError: The cursor is malformed
+    """
+    max_page_size = int(os.getenv("ANYLOGIC_MAX_PAGE_SIZE", "500"))
+    page_size = int(page_size or os.getenv("ANYLOGIC_PAGE_SIZE", "50"))
+    page_size = max(1, min(page_size, max_page_size))
+    after = decode_cursor(cursor) if cursor else None
+    filters = dict(status=status, model_name=model_name, user=user,
+                   created_after=created_after, created_before=created_before)
+
+    if isinstance(simulations, SimulationRegistry):
+        # One row past the page tells whether there is a next one
+        rows = simulations._select(limit=page_size + 1, descending=True, after=after, **filters)
+        total = simulations.count(**filters)
+    else:
+        rows = _filter_mapping(simulations, descending=True, **filters)
+        total = len(rows)
+        if after is not None:
+            rows = [row for row in rows if (row[1], row[0]) < after]
+        rows = rows[:page_size + 1]
+
+    page = rows[:page_size]
+    next_cursor = encode_cursor(page[-1][1], page[-1][0]) if len(rows) > page_size else None
+    return {
+        "simulations": [(sim_id, record) for sim_id, _, record in page],
+        "next_cursor": next_cursor,
+        "total": total
+    }
+
+
+def simulation_changes(simulations: Mapping[str, Dict[str, Any]], since: int = 0,
+                       limit: Optional[int] = None) -> Dict[str, Any]:
+    """
+    Change feed of any simulation store: what was created, changed or removed since a version.
+
+    Limited to ANYLOGIC_MAX_PAGE_SIZE simulations per call; when "more" is set, call again
+    with the returned version. The "memory" backend keeps no versions, so it always
+    returns every simulation with version 0.
+    See SimulationRegistry.changes for the result.
+    """
+    max_page_size = int(os.getenv("ANYLOGIC_MAX_PAGE_SIZE", "500"))
+    limit = max(1, min(int(limit or max_page_size), max_page_size))
+    if isinstance(simulations, SimulationRegistry):
+        return simulations.changes(since=since, limit=limit)
+    return {"simulations": list(simulations.items()), "removed": [], "version": 0, "more": False}
+
+
+def status_counts(simulations: Mapping[str, Dict[str, Any]]) -> Dict[str, int]:
+    """Number of simulations per status, from the status index when available."""
+    if isinstance(simulations, SimulationRegistry):
+        return simulations.count_by_status()
+    counts: Dict[str, int] = {}
+    for record in simulations.values():
+        status = _indexed_fields(record)[0] or "unknown"
+        counts[status] = counts.get(status, 0) + 1
+    return counts
+
+
+def open_simulation_registry(results_dir: Path,
+                             record_from_metadata: Callable[[str, Dict[str, Any]], Dict[str, Any]],
+                             variant: str = "default", background: bool = False) -> MutableMapping:
+    """
+    Open the simulation store configured by ANYLOGIC_SIMULATION_REGISTRY.
+
+    "sqlite" (default) opens the registry database and imports result directories
+    added or changed since the last scan. "memory" keeps the old behaviour: read
+    every metadata.json into a plain dict.
+
+    Args:
+        results_dir: simulations/results directory
+        record_from_metadata: Builds this server's record from a metadata.json dict
+        variant: Server variant name; each variant keeps its own record shape
+        background: Skip the initial import; the caller starts it later with
+            start_background_hydration() (sqlite backend only)
+
+    Returns:
+        A mutable mapping of simulation ID to record
+    """
+    backend = os.getenv("ANYLOGIC_SIMULATION_REGISTRY", "sqlite").lower()
+    results_dir = Path(results_dir)
+
+    if backend == "memory":
+        simulations: Dict[str, Any] = {}
+        for sim_dir in sorted(ResultsLayout(results_dir).iter_sim_dirs(), key=lambda path: path.name):
+            metadata_file = sim_dir / "metadata.json"
+            if metadata_file.exists():
+                try:
+                    with open(metadata_file, "rb") as f:
+                        simulations[sim_dir.name] = record_from_metadata(sim_dir.name, serialization.loads(f.read()))
+                except Exception as e:
+                    logger.warning(f"Failed to load simulation {sim_dir.name}: {e}")
+        return simulations
+
+    db_path = Path(os.getenv("ANYLOGIC_REGISTRY_DB", str(results_dir.parent / "registry.db")))
+    registry = SimulationRegistry(db_path, variant)
+    registry.attach_directory(results_dir, record_from_metadata)
+    if not background:
+        registry.hydrate()
+    return registry
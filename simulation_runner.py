@@ -0,0 +1,221 @@
+"""
+Background simulation execution for AnyLogic MCP servers.
+Lets run_simulation return immediately while an asyncio task waits for the cloud run.
+"""
+
+import asyncio
+import logging
+import os
+import socket
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from output_arrays import decode_output_value
+from simulation_registry import query_simulations
+
+logger = logging.getLogger(__name__)
+
+
+def _boot_id() -> str:
+    try:
+        return Path("/proc/sys/kernel/random/boot_id").read_text().strip()
+    except OSError:
+        return ""
+
+
+def process_owner() -> Dict[str, Any]:
+    """Identify this server process, recorded on each run it starts."""
+    return {"host": socket.gethostname(), "pid": os.getpid(), "boot_id": _boot_id()}
+
+
+def owner_alive(owner: Any) -> bool:
+    """
+    Whether the process recorded as a run's owner may still be working on it.
+
+    Runs without an owner, owned by this process, or owned by a process that has
+    exited (or by an earlier boot of this host) are not. Owners on other hosts
+    sharing the storage cannot be checked and are assumed alive.
+    """
+    if not isinstance(owner, dict) or not isinstance(owner.get("pid"), int):
+        return False
+    current = process_owner()
+    if owner.get("host") != current["host"]:
+        return True
+    if owner.get("boot_id") != current["boot_id"] or owner["pid"] == current["pid"]:
+        return False
+    if os.name == "nt":
+        # Signal 0 is not a liveness probe on Windows; keep the previous behaviour
+        return False
+    try:
+        os.kill(owner["pid"], 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        # The process exists but belongs to another user
+        pass
+    return True
+
+
+def serialize_run_outputs(sim_id: str, model_name: str, parameters: Dict[str, Any], outputs: Any) -> Dict[str, Any]:
+    """
+    Convert AnyLogic run outputs into the outputs.json structure.
+
+    Args:
+        sim_id: Simulation ID
+        model_name: Resolved model name
+        parameters: Input parameters used for the run
+        outputs: AnyLogic SingleRunOutputs object
+
+    Returns:
+        JSON-serializable output data
+    """
+    output_data = {
+        "simulation_id": sim_id,
+        "model_name": model_name,
+        "parameters": parameters,
+        "completion_time": datetime.now().isoformat(),
+        "status": "completed"
+    }
+
+    # Try to get raw outputs safely
+    if hasattr(outputs, 'get_raw_outputs'):
+        try:
+            raw_outputs = outputs.get_raw_outputs()
+            logger.info(f"Raw outputs type: {type(raw_outputs)}")
+
+            # Convert raw outputs to serializable format
+            serializable_outputs = []
+            if isinstance(raw_outputs, list):
+                for item in raw_outputs:
+                    try:
+                        # Extract basic info from each output item; data sets and time series
+                        # are decoded into numbers rather than kept as their string form
+                        output_item = {
+                            "name": getattr(item, 'name', str(item)),
+                            "value": decode_output_value(getattr(item, 'value', None)),
+                            "type": str(type(item).__name__)
+                        }
+                        if output_item["value"] is None:
+                            output_item["string_representation"] = str(item)
+                        serializable_outputs.append(output_item)
+                    except Exception as e:
+                        logger.warning(f"Failed to serialize output item: {e}")
+                        serializable_outputs.append({"error": str(e), "raw_str": str(item)})
+
+            output_data["raw_outputs"] = serializable_outputs
+            logger.info(f"Processed {len(serializable_outputs)} output items")
+
+        except Exception as e:
+            logger.warning(f"Failed to process raw outputs: {e}")
+            output_data["raw_outputs"] = {"error": str(e)}
+
+    # Try to get output names
+    if hasattr(outputs, 'names'):
+        try:
+            names = outputs.names()
+            output_data["output_names"] = names if isinstance(names, (list, tuple)) else [str(names)]
+        except Exception as e:
+            logger.warning(f"Failed to get output names: {e}")
+            output_data["output_names"] = {"error": str(e)}
+
+    # Try to get individual output values by name
+    if hasattr(outputs, 'names') and hasattr(outputs, 'value'):
+        try:
+            names = outputs.names()
+            individual_outputs = {}
+            for name in names:
+                try:
+                    individual_outputs[name] = decode_output_value(outputs.value(name))
+                except Exception as e:
+                    individual_outputs[name] = {"error": str(e)}
+            output_data["individual_outputs"] = individual_outputs
+        except Exception as e:
+            logger.warning(f"Failed to get individual outputs: {e}")
+            output_data["individual_outputs"] = {"error": str(e)}
+
+    return output_data
+
+
+class BackgroundRunManager:
+    """Tracks asyncio tasks that finish submitted simulations."""
+
+    def __init__(self):
+        # Strong references so running tasks are not garbage collected
+        self._tasks: Dict[str, asyncio.Task] = {}
+        # Stored on each run record so other processes can tell whether it is still owned
+        self.owner = process_owner()
+
+    def submit(self, sim_id: str, completion: Awaitable[Any]) -> asyncio.Task:
+        """
+        Schedule a coroutine that completes a submitted simulation.
+
+        Args:
+            sim_id: Simulation ID the task belongs to
+            completion: Coroutine that waits for the run and persists its results
+
+        Returns:
+            The scheduled task
+        """
+        task = asyncio.get_running_loop().create_task(completion, name=f"simulation-{sim_id}")
+        self._tasks[sim_id] = task
+        task.add_done_callback(lambda finished: self._finished(sim_id, finished))
+        return task
+
+    def _finished(self, sim_id: str, task: asyncio.Task) -> None:
+        """Drop the task reference and log failures nobody awaited."""
+        if self._tasks.get(sim_id) is task:
+            del self._tasks[sim_id]
+        if not task.cancelled() and task.exception() is not None:
+            logger.error(f"Background simulation {sim_id} failed: {task.exception()}")
+
+    def is_active(self, sim_id: str) -> bool:
+        """Whether a background task is still working on the simulation."""
+        return sim_id in self._tasks
+
+    def active_ids(self) -> List[str]:
+        """IDs of simulations still being completed in the background."""
+        return list(self._tasks)
+
+    async def wait(self, sim_id: str, timeout: Optional[float] = None) -> None:
+        """Wait for a background simulation to finish (mainly for tests and shutdown)."""
+        task = self._tasks.get(sim_id)
+        if task is not None:
+            await asyncio.wait_for(asyncio.shield(task), timeout=timeout)
+
+    def fail_orphaned(self, simulations: Any, save: Callable[[str, Dict[str, Any]], None]) -> List[str]:
+        """
+        Mark queued or running records whose owning process is gone as failed.
+
+        A run saved as queued or running by a process that stopped before it
+        finished would otherwise report "still running" forever. Runs owned by
+        another live process sharing the storage are left alone.
+
+        Args:
+            simulations: Simulation registry (or dict) of metadata records
+            save: Persists an updated record (the server's metadata save function)
+
+        Returns:
+            IDs of the records marked failed
+        """
+        orphaned = []
+        for status in ("queued", "running"):
+            for sim_id, record in query_simulations(simulations, status=status):
+                if self.is_active(sim_id) or owner_alive(record.get("owner")):
+                    continue
+                record["status"] = "failed"
+                record["error"] = f"Interrupted while {status}: the server stopped before the run finished"
+                record["completion_time"] = datetime.now().isoformat()
+                save(sim_id, record)
+                orphaned.append(sim_id)
+        if orphaned:
+            logger.warning(f"Marked {len(orphaned)} interrupted simulations as failed")
+        return orphaned
+
+    def cancel_all(self) -> None:
+        """Cancel every background task."""
+        for task in list(self._tasks.values()):
+            task.cancel()
+
+# Global manager shared by all tools in a server process
+background_runs = BackgroundRunManager()
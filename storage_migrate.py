@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+Storage migrations for the simulations directory.
+
+    python storage_migrate.py compress --codec zstd --min-bytes 16384
+    python storage_migrate.py decompress
+    python storage_migrate.py shard --layout hash
+
+compress rewrites existing outputs.json / raw_results.json files and result cache
+entries with the given codec (files below the threshold stay plain); decompress
+turns every compressed artifact back into plain JSON. shard moves simulation
+directories into a date- or hash-sharded layout (servers started with
+ANYLOGIC_RESULTS_LAYOUT do the same in the background). All are safe to re-run and
+to interrupt: each artifact or directory is replaced or moved atomically.
+"""
+
+import argparse
+import sys
+from pathlib import Path
+from typing import Dict, Iterable, Iterator
+
+from artifact_compression import (
+    CODEC_SUFFIXES,
+    COMPRESSIBLE_FILES,
+    CompressionPolicy,
+    find_artifact,
+    read_artifact,
+)
+from artifact_writer import ArtifactWriter
+from results_layout import LAYOUTS, ResultsLayout
+
+
+def _logical_path(path: Path) -> Path:
+    """Artifact path without a codec suffix (outputs.json.zst -> outputs.json)."""
+    for suffix in CODEC_SUFFIXES.values():
+        if path.name.endswith(suffix):
+            return path.with_name(path.name[:-len(suffix)])
+    return path
+
+
+def iter_artifacts(results_dir: Path, cache_dir: Path) -> Iterator[Path]:
+    """Logical paths of every compressible artifact under the results and cache directories."""
+    candidates = []
+    for sim_dir in sorted(ResultsLayout(results_dir).iter_sim_dirs()):
+        candidates.extend(path for path in sim_dir.iterdir() if _logical_path(path).name in COMPRESSIBLE_FILES)
+    if cache_dir.is_dir():
+        candidates.extend(sorted(cache_dir.rglob("*.json*")))
+
+    seen = set()
+    for path in candidates:
+        if path.name.startswith(".") or not path.is_file():
+            continue
+        logical = _logical_path(path)
+        if logical not in seen:
+            seen.add(logical)
+            yield logical
+
+
+def migrate(artifacts: Iterable[Path], policy: CompressionPolicy, dry_run: bool = False) -> Dict[str, int]:
+    """
+    Rewrite artifacts under a compression policy.
+
+    Returns:
+        Counts of artifacts examined and rewritten, and their stored sizes before and after
+    """
+    writer = ArtifactWriter(durability="batched", compression=policy)
+    stats = {"artifacts": 0, "rewritten": 0, "bytes_before": 0, "bytes_after": 0}
+
+    for logical in artifacts:
+        stored = find_artifact(logical)
+        if stored is None:
+            continue
+        stats["artifacts"] += 1
+        size_before = stored.stat().st_size
+        data = read_artifact(logical)
+        target, payload = policy.encode(logical, data)
+        stats["bytes_before"] += size_before
+        stats["bytes_after"] += len(payload)
+        if target == stored and len(payload) == size_before:
+            continue
+        stats["rewritten"] += 1
+        if not dry_run:
+            writer.write_bytes(logical, data, compress=True)
+
+    writer.flush()
+    return stats
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Migrate stored simulation artifacts")
+    parser.add_argument("command", choices=["compress", "decompress", "shard"])
+    parser.add_argument("--results-dir", default="simulations/results", type=Path)
+    parser.add_argument("--cache-dir", default="simulations/cache", type=Path)
+    parser.add_argument("--codec", choices=sorted(CODEC_SUFFIXES), default=None,
+                        help="Compression codec (default: ANYLOGIC_COMPRESSION, else gzip)")
+    parser.add_argument("--min-bytes", type=int, default=None,
+                        help="Keep files smaller than this plain (default: ANYLOGIC_COMPRESSION_MIN_BYTES)")
+    parser.add_argument("--level", type=int, default=None)
+    parser.add_argument("--layout", choices=LAYOUTS, default=None,
+                        help="Target layout for shard (default: ANYLOGIC_RESULTS_LAYOUT)")
+    parser.add_argument("--dry-run", action="store_true", help="Report what would change without writing")
+    args = parser.parse_args(argv)
+
+    if args.command == "shard":
+        try:
+            layout = ResultsLayout(args.results_dir, scheme=args.layout, min_idle_seconds=0)
+        except ValueError as e:
+            print(f"❌ {e}", file=sys.stderr)
+            return 2
+        if args.dry_run:
+            pending = sum(1 for path in layout.iter_sim_dirs() if path != layout.shard_path(path.name))
+            print(f"Would move {pending} simulation directories to the '{layout.scheme}' layout")
+            return 0
+        counts = layout.migrate()
+        print(f"Moved {counts['moved']} simulation directories to the '{layout.scheme}' layout "
+              f"({counts['conflicts']} conflicts)")
+        return 0
+
+    try:
+        if args.command == "decompress":
+            policy = CompressionPolicy(codec="none")
+        else:
+            default_codec = CompressionPolicy().codec
+            codec = args.codec or (default_codec if default_codec != "none" else "gzip")
+            policy = CompressionPolicy(codec=codec, min_bytes=args.min_bytes, level=args.level)
+    except ValueError as e:
+        print(f"❌ {e}", file=sys.stderr)
+        return 2
+
+    stats = migrate(iter_artifacts(args.results_dir, args.cache_dir), policy, dry_run=args.dry_run)
+    saved = stats["bytes_before"] - stats["bytes_after"]
+    prefix = "Would rewrite" if args.dry_run else "Rewrote"
+    print(f"{prefix} {stats['rewritten']} of {stats['artifacts']} artifacts "
+          f"({stats['bytes_before']:,} -> {stats['bytes_after']:,} bytes, {saved:,} saved)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
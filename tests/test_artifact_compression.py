@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Tests for transparent artifact compression and the storage migration command.
+"""
+
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from artifact_compression import CompressionPolicy, artifact_exists, find_artifact, read_json_artifact
+from artifact_writer import ArtifactWriter
+from storage_migrate import iter_artifacts, main as migrate_main
+
+
+def _writer(min_bytes=100, codec="gzip"):
+    return ArtifactWriter(durability="none", compression=CompressionPolicy(codec=codec, min_bytes=min_bytes))
+
+
+def test_large_artifacts_are_compressed_and_read_transparently(tmp_path):
+    writer = _writer()
+    target = tmp_path / "sim_1" / "outputs.json"
+    large = {"series": list(range(200))}
+
+    written = writer.write_json(target, large, compress=True)
+    assert written.name == "outputs.json.gz"
+    assert not target.exists()
+    assert artifact_exists(target)
+    assert read_json_artifact(target) == large
+
+    # Shrinking below the threshold stores it plain and drops the compressed copy
+    written = writer.write_json(target, {"series": []}, compress=True)
+    assert written == target
+    assert [path.name for path in target.parent.iterdir()] == ["outputs.json"]
+    assert read_json_artifact(target) == {"series": []}
+
+
+def test_uncompressed_writes_and_missing_artifacts(tmp_path):
+    writer = _writer(min_bytes=0)
+    target = tmp_path / "metadata.json"
+    writer.write_json(target, {"status": "running"})
+    assert find_artifact(target) == target
+
+    assert not artifact_exists(tmp_path / "outputs.json")
+    with pytest.raises(FileNotFoundError):
+        read_json_artifact(tmp_path / "outputs.json")
+
+
+def test_unavailable_or_unknown_codec():
+    with pytest.raises(ValueError):
+        CompressionPolicy(codec="lz77")
+
+
+def test_migration_compresses_and_decompresses(tmp_path):
+    results_dir, cache_dir = tmp_path / "results", tmp_path / "cache"
+    outputs = {"series": list(range(500))}
+    for sim_id in ("sim_1", "sim_2"):
+        (results_dir / sim_id).mkdir(parents=True)
+        (results_dir / sim_id / "outputs.json").write_text(json.dumps(outputs, indent=2))
+        (results_dir / sim_id / "metadata.json").write_text(json.dumps({"status": "completed"}))
+    (cache_dir / "m1" / "v1").mkdir(parents=True)
+    (cache_dir / "m1" / "v1" / "abc.json").write_text(json.dumps({"outputs": outputs}))
+
+    assert len(list(iter_artifacts(results_dir, cache_dir))) == 3
+
+    common = ["--results-dir", str(results_dir), "--cache-dir", str(cache_dir)]
+    assert migrate_main(["compress", "--codec", "gzip", "--min-bytes", "100"] + common) == 0
+    assert (results_dir / "sim_1" / "outputs.json.gz").exists()
+    assert (results_dir / "sim_1" / "metadata.json").exists()
+    assert (cache_dir / "m1" / "v1" / "abc.json.gz").exists()
+    assert read_json_artifact(results_dir / "sim_2" / "outputs.json") == outputs
+
+    assert migrate_main(["decompress"] + common) == 0
+    assert json.loads((results_dir / "sim_1" / "outputs.json").read_text()) == outputs
+    assert not (results_dir / "sim_1" / "outputs.json.gz").exists()
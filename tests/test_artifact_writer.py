@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Tests for atomic, group-committed artifact writes.
+"""
+
+import json
+import sys
+import threading
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import artifact_writer
+from artifact_writer import ArtifactWriter
+
+
+@pytest.mark.parametrize("durability", ["strict", "batched", "none"])
+def test_write_json_replaces_target(tmp_path, durability):
+    writer = ArtifactWriter(durability=durability, group_commit_ms=5)
+    target = tmp_path / "sim_1" / "metadata.json"
+
+    writer.write_json(target, {"status": "running"})
+    writer.write_json(target, {"status": "completed"})
+    assert writer.flush(timeout=5)
+
+    assert json.loads(target.read_text()) == {"status": "completed"}
+    assert [path.name for path in target.parent.iterdir()] == ["metadata.json"]
+    if durability == "none":
+        assert writer.fsyncs == 0
+    else:
+        assert writer.fsyncs > 0
+
+
+def test_unserializable_value_keeps_existing_file(tmp_path):
+    writer = ArtifactWriter(durability="none")
+    target = tmp_path / "outputs.json"
+    writer.write_json(target, {"value": 1})
+
+    circular = {}
+    circular["self"] = circular
+    with pytest.raises((TypeError, ValueError)):
+        writer.write_json(target, circular)
+    assert json.loads(target.read_text()) == {"value": 1}
+    assert list(tmp_path.iterdir()) == [target]
+
+
+def test_batched_writes_share_group_commits(tmp_path):
+    writer = ArtifactWriter(durability="batched", group_commit_ms=50)
+
+    def write_many(worker):
+        for index in range(20):
+            writer.write_json(tmp_path / f"w{worker}_{index}.json", {"index": index})
+
+    threads = [threading.Thread(target=write_many, args=(worker,)) for worker in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert writer.flush(timeout=5)
+    assert writer.writes == 80
+    assert 1 <= writer.group_commits < 80
+    assert writer.stats()["pending"] == 0
+
+
+def test_append_text_and_invalid_mode(tmp_path):
+    writer = ArtifactWriter(durability="strict")
+    log = tmp_path / "journal.jsonl"
+    writer.append_text(log, "a\n")
+    writer.append_text(log, "b\n")
+    assert log.read_text() == "a\nb\n"
+
+    with pytest.raises(ValueError):
+        ArtifactWriter(durability="sometimes")
+
+
+def test_batched_write_syncs_data_before_rename(tmp_path, monkeypatch):
+    synced = []
+    real_fsync_path = artifact_writer._fsync_path
+
+    def recording_fsync_path(path):
+        synced.append((path.name, (tmp_path / "outputs.json").exists()))
+        real_fsync_path(path)
+
+    monkeypatch.setattr(artifact_writer, "_fsync_path", recording_fsync_path)
+    writer = ArtifactWriter(durability="batched", group_commit_ms=5)
+    writer.write_json(tmp_path / "outputs.json", {"series": [1, 2, 3]})
+    assert writer.flush(timeout=5)
+
+    temp_syncs = [exists for name, exists in synced if name.startswith(".outputs.json.")]
+    # The temporary file was synced while the target did not exist yet, then the directory
+    assert temp_syncs == [False]
+    assert synced[-1] == (tmp_path.name, True)
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+
+"""
+Tests for the bounded AnyLogic Cloud call executor
+"""
+
+import asyncio
+import sys
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+# Add the project directory to Python path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from cloud_executor import CloudCallExecutor, CloudCallTimeoutError
+
+
+async def test_call_runs_off_event_loop():
+    """Blocking calls execute on a worker thread and return their result"""
+    executor = CloudCallExecutor(max_workers=2, call_timeout=5)
+    loop_thread = threading.get_ident()
+
+    def blocking_call(value):
+        return value, threading.get_ident()
+
+    value, worker_thread = await executor.call(blocking_call, 42)
+    assert value == 42
+    assert worker_thread != loop_thread
+    assert executor.metrics()["completed"] == 1
+    executor.shutdown()
+
+
+async def test_event_loop_stays_responsive():
+    """A slow cloud call does not block other coroutines"""
+    executor = CloudCallExecutor(max_workers=2, call_timeout=5)
+    ticks = []
+
+    async def ticker():
+        for _ in range(5):
+            ticks.append(time.monotonic())
+            await asyncio.sleep(0.01)
+
+    await asyncio.gather(executor.call(time.sleep, 0.2), ticker())
+    assert len(ticks) == 5
+    assert ticks[-1] - ticks[0] < 0.15
+    executor.shutdown()
+
+
+async def test_in_flight_metrics():
+    """In-flight calls are counted per operation while they run"""
+    executor = CloudCallExecutor(max_workers=2, call_timeout=5)
+    release = threading.Event()
+
+    def get_models():
+        release.wait(2)
+        return []
+
+    task = asyncio.ensure_future(executor.call(get_models))
+    await asyncio.sleep(0.05)
+    metrics = executor.metrics()
+    assert metrics["in_flight"] == 1
+    assert metrics["in_flight_by_operation"] == {"get_models": 1}
+
+    release.set()
+    await task
+    metrics = executor.metrics()
+    assert metrics["in_flight"] == 0
+    assert metrics["peak_in_flight"] == 1
+    executor.shutdown()
+
+
+async def test_call_timeout():
+    """Calls exceeding their timeout raise and are counted"""
+    executor = CloudCallExecutor(max_workers=1, call_timeout=0.05)
+
+    with pytest.raises(CloudCallTimeoutError):
+        await executor.call(time.sleep, 0.3)
+
+    # A call queued behind the slow one times out without ever running
+    with pytest.raises(CloudCallTimeoutError):
+        await executor.call(time.sleep, 0, timeout=0.01)
+
+    metrics = executor.metrics()
+    assert metrics["timed_out"] == 2
+    assert metrics["queued"] == 0
+    executor.shutdown(wait=True)
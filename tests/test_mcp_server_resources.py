@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+Tests for the low-level server's MCP resources and its JSON tool responses.
+"""
+
+import json
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from mcp.types import (
+    ListResourceTemplatesRequest,
+    ReadResourceRequest,
+    ReadResourceRequestParams,
+)
+
+import serialization
+from anylogic_mcp_server import AnyLogicMCPServer
+
+
+async def _read(server, uri):
+    request = ReadResourceRequest(method="resources/read", params=ReadResourceRequestParams(uri=uri))
+    result = await server.server.request_handlers[ReadResourceRequest](request)
+    contents = result.root.contents
+    assert len(contents) == 1 and contents[0].mimeType == "application/json"
+    return json.loads(contents[0].text)
+
+
+async def test_resources_and_templates_are_readable():
+    server = AnyLogicMCPServer()
+    server.current_simulations = {
+        f"sim_2025010{day}_090000": {"simulation": None, "model_name": "Queue", "status": "completed",
+                                     "created": f"2025-01-0{day}T09:00:00", "parameters": {}}
+        for day in range(1, 4)
+    }
+
+    status = await _read(server, "anylogic://connection-status")
+    assert status["connected"] is False
+
+    first = await _read(server, "anylogic://simulations/history?limit=2")
+    assert [sim["id"] for sim in first["simulations"]] == ["sim_20250103_090000", "sim_20250102_090000"]
+    rest = await _read(server, f"anylogic://simulations/history?cursor={first['next_cursor']}")
+    assert [sim["id"] for sim in rest["simulations"]] == ["sim_20250101_090000"]
+
+    simulation = await _read(server, "anylogic://simulation/sim_20250102_090000")
+    assert simulation["model_name"] == "Queue" and "simulation" not in simulation
+
+    templates = await server.server.request_handlers[ListResourceTemplatesRequest](
+        ListResourceTemplatesRequest(method="resources/templates/list")
+    )
+    assert {template.uriTemplate for template in templates.root.resourceTemplates} == {
+        "anylogic://simulation/{simulation_id}", "anylogic://simulations/history{?cursor}"
+    }
+
+
+async def test_json_mode_errors_are_json(monkeypatch):
+    server = AnyLogicMCPServer()
+    server.current_simulations = {
+        "sim_20250101_090000": {"simulation": None, "model_name": "Queue", "status": "running",
+                                "created": "2025-01-01T09:00:00", "parameters": {}}
+    }
+
+    async def results(**arguments):
+        result = await server._get_simulation_results(arguments)
+        return json.loads(result.content[0].text)
+
+    running = await results(simulation_id="sim_20250101_090000", fields="Throughput")
+    assert running["success"] is False and running["status"] == "running"
+
+    monkeypatch.setattr(serialization, "response_mode", "compact")
+    missing = await results(simulation_id="sim_20250109_090000")
+    assert missing == {"success": False, "error": "Simulation ID 'sim_20250109_090000' not found"}
+    models = json.loads((await server._list_models({})).content[0].text)
+    assert models["success"] is False
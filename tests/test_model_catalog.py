@@ -0,0 +1,275 @@
+#!/usr/bin/env python3
+
+"""
+Tests for the cached AnyLogic Cloud model catalog
+"""
+
+import asyncio
+import sys
+import threading
+import time
+from pathlib import Path
+
+# Add the project directory to Python path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import pytest
+
+import model_versions
+from model_catalog import ModelCatalog, ModelCatalogRegistry
+from model_index import ModelIndex, ModelLookupError
+from result_cache import ResultCache
+
+
+class FakeModel:
+    def __init__(self, model_id, name):
+        self.id = model_id
+        self.name = name
+
+
+class FakeCloudClient:
+    """Counts get_models() round trips"""
+
+    def __init__(self, models=None, delay=0.0):
+        self.models = models if models is not None else [FakeModel("m1", "Service System Demo")]
+        self.delay = delay
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def get_models(self):
+        with self._lock:
+            self.calls += 1
+        time.sleep(self.delay)
+        return list(self.models)
+
+
+async def test_burst_makes_one_catalog_call():
+    """Fifty concurrent readers share one get_models() round trip"""
+    client = FakeCloudClient(delay=0.05)
+    catalog = ModelCatalog(client, ttl=60, stale_ttl=60)
+
+    results = await asyncio.gather(*[catalog.get_models() for _ in range(50)])
+
+    assert client.calls == 1
+    assert all(len(models) == 1 for models in results)
+    await catalog.get_models()
+    assert client.calls == 1
+    assert catalog.stats()["hits"] >= 1
+
+
+async def test_stale_while_revalidate():
+    """Stale entries are served immediately while a background refresh runs"""
+    client = FakeCloudClient()
+    catalog = ModelCatalog(client, ttl=0.05, stale_ttl=60)
+    await catalog.get_models()
+
+    await asyncio.sleep(0.06)
+    client.models = [FakeModel("m1", "Service System Demo"), FakeModel("m2", "Supply Chain")]
+    models = await catalog.get_models()
+    assert len(models) == 1  # stale copy served without waiting
+    assert catalog.stats()["stale_hits"] == 1
+
+    await asyncio.sleep(0.05)
+    assert client.calls == 2
+    assert len(await catalog.get_models()) == 2
+
+
+async def test_expired_catalog_blocks_on_refresh():
+    """Catalogs past the stale window are fetched again before returning"""
+    client = FakeCloudClient()
+    catalog = ModelCatalog(client, ttl=0.01, stale_ttl=0.01)
+    await catalog.get_models()
+    await asyncio.sleep(0.03)
+
+    client.models = []
+    assert await catalog.get_models() == []
+    assert client.calls == 2
+
+
+async def test_force_refresh():
+    """Manual refresh bypasses a fresh cache entry"""
+    client = FakeCloudClient()
+    catalog = ModelCatalog(client, ttl=60, stale_ttl=60)
+    await catalog.get_models()
+    await catalog.get_models(force_refresh=True)
+    assert client.calls == 2
+
+
+def test_registry_keeps_one_catalog_per_key():
+    """Reconnecting with the same key keeps the cache and swaps the client"""
+    registry = ModelCatalogRegistry()
+    first_client, second_client = FakeCloudClient(), FakeCloudClient()
+
+    catalog = registry.get("key-a", first_client)
+    assert registry.get("key-a", second_client) is catalog
+    assert catalog.client is second_client
+    assert registry.get("key-b", first_client) is not catalog
+
+
+CATALOG = [
+    FakeModel("a1", "Service System Demo"),
+    FakeModel("b2", "Supply Chain"),
+    FakeModel("c3", "Global Supply Chain"),
+    FakeModel("d4", "Supply Chain and Market"),
+    FakeModel("e5", "Bank Queue Simulation With Many Tellers"),
+]
+
+
+def test_index_exact_lookups():
+    """Ids and normalised names resolve without a scan"""
+    index = ModelIndex(CATALOG)
+    assert index.resolve("c3").name == "Global Supply Chain"
+    assert index.resolve("supply  CHAIN").id == "b2"
+    assert index.resolve("service-system demo").id == "a1"
+
+
+def test_index_fuzzy_ranking():
+    """Fuzzy matches are ranked and typos still resolve"""
+    index = ModelIndex(CATALOG)
+    ranked = index.search("suply chain")
+    assert ranked[0][0].id == "b2"
+    assert [score for _, score in ranked] == sorted((score for _, score in ranked), reverse=True)
+
+    assert index.resolve("Servce System").id == "a1"
+    # Substrings of long names still resolve like the old containment scan
+    assert index.resolve("queue").id == "e5"
+
+
+def test_index_rejects_weak_and_ambiguous_matches():
+    """Unrelated or ambiguous references raise with ranked candidates"""
+    index = ModelIndex(CATALOG + [FakeModel("f6", "Supply Chain")])
+
+    with pytest.raises(ModelLookupError) as excinfo:
+        index.resolve("supply chain")
+    assert {c["id"] for c in excinfo.value.candidates} == {"b2", "f6"}
+
+    with pytest.raises(ModelLookupError):
+        index.resolve("hospital emergency department")
+
+
+async def test_catalog_resolve_uses_index():
+    """Catalog lookups build the index once per load"""
+    client = FakeCloudClient(models=CATALOG)
+    catalog = ModelCatalog(client, ttl=60, stale_ttl=60)
+
+    assert (await catalog.resolve("global supply chain")).id == "c3"
+    assert (await catalog.resolve("d4")).name == "Supply Chain and Market"
+    assert client.calls == 1
+
+
+class FakeVersion:
+    def __init__(self, version_id):
+        self.id = version_id
+
+
+class FakeInputs:
+    def __init__(self, version):
+        self.version = version
+        self.values = {"Arrival rate": 1.0}
+
+    def set_input(self, name, value):
+        self.values[name] = value
+
+
+class VersionedCloudClient(FakeCloudClient):
+    """Fake client that also serves model versions and default inputs"""
+
+    def __init__(self, models):
+        super().__init__(models=models)
+        self.version_calls = 0
+        self.input_calls = 0
+
+    def get_latest_model_version(self, model):
+        self.version_calls += 1
+        return FakeVersion(model.model_versions[-1])
+
+    def get_model_version_by_id(self, model, version_id):
+        self.version_calls += 1
+        return FakeVersion(version_id)
+
+    def create_default_inputs(self, version):
+        self.input_calls += 1
+        return FakeInputs(version)
+
+
+async def test_default_inputs_cached_per_version():
+    """Repeat runs reuse the version and input template but get private copies"""
+    model = FakeModel("a1", "Service System Demo")
+    model.model_versions = ["v1"]
+    client = VersionedCloudClient([model])
+    catalog = ModelCatalog(client, ttl=60, stale_ttl=60)
+
+    version, first = await catalog.default_inputs(model)
+    first.set_input("Arrival rate", 5.0)
+    same_version, second = await catalog.default_inputs(model)
+
+    assert version.id == "v1" and same_version is version
+    assert second.values == {"Arrival rate": 1.0}
+    assert second.version is version
+    assert client.version_calls == 1
+    assert client.input_calls == 1
+
+    # "latest" was stored under its real id, so an explicit request for it is a hit
+    await catalog.default_inputs(model, "v1")
+    assert client.version_calls == 1
+
+
+async def test_concurrent_first_runs_fetch_latest_version_once():
+    """Simultaneous runs of an uncached model share one version and one inputs fetch"""
+    model = FakeModel("a1", "Service System Demo")
+    model.model_versions = ["v1"]
+
+    class SlowClient(VersionedCloudClient):
+        def get_latest_model_version(self, model):
+            time.sleep(0.02)
+            return super().get_latest_model_version(model)
+
+    client = SlowClient([model])
+    catalog = ModelCatalog(client, ttl=60, stale_ttl=60)
+
+    results = await asyncio.gather(*(catalog.default_inputs(model) for _ in range(20)))
+
+    assert {version.id for version, _ in results} == {"v1"}
+    assert client.version_calls == 1
+    assert client.input_calls == 1
+
+
+async def test_new_catalog_version_invalidates_cache():
+    """A catalog refresh reporting a new version drops the cached template"""
+    model = FakeModel("a1", "Service System Demo")
+    model.model_versions = ["v1"]
+    client = VersionedCloudClient([model])
+    catalog = ModelCatalog(client, ttl=60, stale_ttl=60)
+    await catalog.get_models()
+    await catalog.default_inputs(model)
+
+    updated = FakeModel("a1", "Service System Demo")
+    updated.model_versions = ["v1", "v2"]
+    client.models = [updated]
+    await catalog.refresh()
+
+    version, _ = await catalog.default_inputs(updated)
+    assert version.id == "v2"
+    assert client.input_calls == 2
+
+
+async def test_new_latest_version_prunes_result_cache(tmp_path, monkeypatch):
+    """Stored outputs of earlier versions are dropped only when the catalog reports a new latest version"""
+    cache = ResultCache(tmp_path, enabled=True)
+    monkeypatch.setattr(model_versions, "result_cache", cache)
+    model = FakeModel("a1", "Service System Demo")
+    model.model_versions = ["v1"]
+    client = VersionedCloudClient([model])
+    catalog = ModelCatalog(client, ttl=60, stale_ttl=60)
+    await catalog.get_models()
+    await catalog.default_inputs(model)
+    cache.store("a1", "v1", {}, {"x": 1}, "sim_1")
+
+    await catalog.refresh()
+    assert cache.lookup("a1", "v1", {}) is not None
+
+    updated = FakeModel("a1", "Service System Demo")
+    updated.model_versions = ["v1", "v2"]
+    client.models = [updated]
+    await catalog.refresh()
+    assert cache.lookup("a1", "v1", {}) is None
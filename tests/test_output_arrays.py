@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Tests for array-backed storage of time-series and dataset outputs.
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import output_arrays
+from output_arrays import OutputArrayStore, decode_output_value, is_array_ref, numeric_shape
+
+
+class _DataSet:
+    def __init__(self):
+        self.dataX = [0.0, 1.0, 2.0]
+        self.dataY = [5, 6, 7]
+
+
+def test_decode_output_value():
+    assert decode_output_value('{"dataX": [0, 1], "dataY": [2, 3]}') == {"dataX": [0, 1], "dataY": [2, 3]}
+    assert decode_output_value("[1, 2, 3]") == [1, 2, 3]
+    assert decode_output_value("{not json") == "{not json"
+    assert decode_output_value("Queue") == "Queue"
+    assert decode_output_value(_DataSet()) == {"dataX": [0.0, 1.0, 2.0], "dataY": [5, 6, 7]}
+    assert decode_output_value((1, "[2]")) == [1, [2]]
+
+
+def test_numeric_shape():
+    assert numeric_shape([1, 2.5, 3]) == (3,)
+    assert numeric_shape([[0, 1], [1, 4], [2, 9]]) == (3, 2)
+    assert numeric_shape([[0, 1], [1]]) is None
+    assert numeric_shape([True, False]) is None
+    assert numeric_shape(["a", 1]) is None
+    assert numeric_shape([]) is None
+
+
+def test_outputs_stay_inline_without_numpy(tmp_path, monkeypatch):
+    monkeypatch.setattr(output_arrays, "NUMPY_AVAILABLE", False)
+    store = OutputArrayStore(tmp_path, min_length=2)
+    data = {"individual_outputs": {"Queue": list(range(10))}}
+
+    assert store.extract("sim_1", data) is data
+    assert store.manifest("sim_1") == {}
+    assert list(store.iter_arrays("sim_1")) == []
+
+
+def test_series_stored_as_memory_mapped_arrays(tmp_path):
+    np = pytest.importorskip("numpy")
+    store = OutputArrayStore(tmp_path, min_length=4)
+    data = {
+        "parameters": {"Levels": [1, 2, 3, 4, 5]},
+        "individual_outputs": {
+            "Queue length": {"dataX": list(range(6)), "dataY": [0, 2, 4, 2, 1, 3]},
+            "Throughput": 12.5,
+            "Short": [1, 2]
+        }
+    }
+
+    stored = store.extract("sim_1", data)
+    ref = stored["individual_outputs"]["Queue length"]["dataY"]
+    assert is_array_ref(ref)
+    assert ref["shape"] == [6]
+    assert stored["parameters"] == {"Levels": [1, 2, 3, 4, 5]}
+    assert stored["individual_outputs"]["Short"] == [1, 2]
+    assert (tmp_path / "sim_1" / ref["file"]).exists()
+
+    array = store.load("sim_1", ref["$array"])
+    assert isinstance(array, np.memmap)
+    assert array.tolist() == [0, 2, 4, 2, 1, 3]
+
+    summarized = store.resolve("sim_1", stored)
+    assert summarized["individual_outputs"]["Queue length"]["dataY"]["max"] == 4
+    assert store.resolve("sim_1", stored, materialize=True) == data
+
+
+def test_series_reported_twice_are_stored_once(tmp_path):
+    pytest.importorskip("numpy")
+    store = OutputArrayStore(tmp_path, min_length=4)
+    series = '{"dataX": [0, 1, 2, 3, 4], "dataY": [3, 1, 4, 1, 5]}'
+    data = {
+        "raw_outputs": [{"name": "Queue length", "value": decode_output_value(series)}],
+        "individual_outputs": {"Queue length": decode_output_value(series)}
+    }
+
+    stored = store.extract("sim_1", data)
+    raw = stored["raw_outputs"][0]["value"]["dataY"]
+    individual = stored["individual_outputs"]["Queue length"]["dataY"]
+    assert raw["$array"] != individual["$array"]
+    assert raw["file"] == individual["file"]
+    manifest = store.manifest("sim_1")
+    assert len(manifest) == 4
+    assert len({entry["file"] for entry in manifest.values()}) == 2
+    assert len(list((tmp_path / "sim_1" / "arrays").iterdir())) == 2
+    assert store.resolve("sim_1", stored, materialize=True) == data
@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Tests for the in-process cache of parsed simulation outputs.
+"""
+
+import json
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from artifact_compression import CompressionPolicy
+from artifact_writer import ArtifactWriter
+from outputs_cache import OutputsCache
+
+
+def _write(path, data):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(data))
+    return path.stat().st_size
+
+
+def test_repeated_loads_are_served_from_memory(tmp_path):
+    cache = OutputsCache(max_bytes=10_000)
+    path = tmp_path / "sim_1" / "outputs.json"
+    _write(path, {"Throughput": 12})
+
+    first = cache.load(path)
+    assert cache.load(path) is first
+    assert cache.stats()["hits"] == 1 and cache.stats()["misses"] == 1
+
+    # A rewrite on disk is picked up even without explicit invalidation
+    _write(path, {"Throughput": 13, "Queue": 2})
+    os.utime(path, ns=(path.stat().st_atime_ns, path.stat().st_mtime_ns + 1_000_000))
+    assert cache.load(path) == {"Throughput": 13, "Queue": 2}
+
+
+def test_compressed_artifacts_and_missing_files(tmp_path):
+    cache = OutputsCache(max_bytes=10_000)
+    writer = ArtifactWriter(durability="none", compression=CompressionPolicy(codec="gzip", min_bytes=0))
+    path = tmp_path / "outputs.json"
+    writer.write_json(path, {"series": [1, 2, 3]}, compress=True)
+    assert cache.load(path) == {"series": [1, 2, 3]}
+
+    (tmp_path / "outputs.json.gz").unlink()
+    with pytest.raises(FileNotFoundError):
+        cache.load(path)
+    assert cache.stats()["entries"] == 0
+
+
+def test_eviction_is_bounded_by_bytes(tmp_path):
+    sizes = [_write(tmp_path / f"sim_{i}" / "outputs.json", {"values": [i] * 20}) for i in range(3)]
+    cache = OutputsCache(max_bytes=sizes[0] * 2)
+
+    for i in range(3):
+        cache.load(tmp_path / f"sim_{i}" / "outputs.json")
+    assert cache.stats()["entries"] == 2
+    assert cache.current_bytes <= cache.max_bytes
+
+    # The least recently used entry (sim_0) was evicted
+    cache.load(tmp_path / "sim_0" / "outputs.json")
+    assert cache.stats()["misses"] == 4
+
+    cache.invalidate_dir(tmp_path / "sim_0")
+    assert cache.stats()["entries"] == 1
+
+    tiny = OutputsCache(max_bytes=1)
+    tiny.load(tmp_path / "sim_1" / "outputs.json")
+    assert tiny.stats()["entries"] == 0
@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+Tests for parameter sweep expansion and bounded concurrent execution.
+"""
+
+import asyncio
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from parameter_sweep import SweepDefinitionError, SweepRunner, build_points, expand_grid
+
+
+def test_grid_expands_to_every_combination():
+    points = expand_grid({"Rate": [1, 2], "Servers": [3, 4]})
+    assert points == [
+        {"Rate": 1, "Servers": 3}, {"Rate": 1, "Servers": 4},
+        {"Rate": 2, "Servers": 3}, {"Rate": 2, "Servers": 4}
+    ]
+
+
+def test_build_points_combines_grid_and_explicit_sets():
+    points = build_points({"Rate": [1, 2]}, [{"Rate": 10}])
+    assert points == [{"Rate": 1}, {"Rate": 2}, {"Rate": 10}]
+
+    with pytest.raises(SweepDefinitionError):
+        build_points()
+    with pytest.raises(SweepDefinitionError):
+        build_points({"Rate": list(range(10))}, max_points=5)
+
+
+async def test_concurrency_limit_and_result_table():
+    runner = SweepRunner()
+    sweep = runner.create("sweep_1", "Model", build_points({"Rate": [1, 2, 3, 4, 5]}), concurrency=2)
+    in_flight = 0
+    peak = 0
+    progress = []
+
+    async def run_point(point):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        if point["parameters"]["Rate"] == 3:
+            raise RuntimeError("cloud error")
+        return {"simulation_id": f"sim_{point['index']}",
+                "outputs": {"individual_outputs": {"Throughput": point["parameters"]["Rate"] * 10}}}
+
+    async def on_progress(sweep, point):
+        progress.append(point["index"])
+
+    await runner.run(sweep, run_point, on_progress)
+
+    assert peak == 2
+    assert sorted(progress) == [0, 1, 2, 3, 4]
+    assert sweep.counts() == {"pending": 0, "running": 0, "completed": 4, "failed": 1}
+    assert sweep.status == "completed"
+
+    table = sweep.result_table()
+    assert table["columns"] == ["point", "simulation_id", "status", "Rate", "Throughput"]
+    assert table["rows"][0] == [0, "sim_0", "completed", 1, 10]
+    assert table["rows"][2][2] == "failed"
+    assert runner.get("sweep_1") is sweep
@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+Tests for streaming replication statistics.
+"""
+
+import statistics
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from parameter_sweep import SweepRunner
+from replication_stats import ReplicationStatistics, RunningStats, t_critical
+
+
+def test_running_stats_match_batch_statistics():
+    values = [12.5, 9.0, 11.25, 14.0, 10.5, 13.75]
+    stats = RunningStats()
+    for value in values:
+        stats.add(value)
+
+    assert stats.count == len(values)
+    assert stats.mean == pytest.approx(statistics.mean(values))
+    assert stats.variance == pytest.approx(statistics.variance(values))
+    assert (stats.minimum, stats.maximum) == (9.0, 14.0)
+
+    interval = stats.confidence_interval(0.95)
+    half_width = t_critical(0.95, 5) * statistics.stdev(values) / len(values) ** 0.5
+    assert interval["lower"] == pytest.approx(stats.mean - half_width)
+    assert interval["upper"] == pytest.approx(stats.mean + half_width)
+
+
+def test_single_observation_has_no_interval():
+    stats = RunningStats()
+    stats.add(3.0)
+    assert stats.variance == 0.0
+    assert stats.confidence_interval() is None
+
+
+def test_replication_statistics_skip_non_numeric_outputs():
+    aggregate = ReplicationStatistics()
+    aggregate.add({"Throughput": 10, "Label": "a", "Ok": True})
+    aggregate.add({"Throughput": 14})
+    summary = aggregate.summary()
+    assert summary["replications"] == 2
+    assert list(summary["outputs"]) == ["Throughput"]
+    assert summary["outputs"]["Throughput"]["mean"] == 12
+
+    with pytest.raises(ValueError):
+        ReplicationStatistics(0.42)
+
+
+async def test_statistics_update_as_replications_land():
+    runner = SweepRunner()
+    sweep = runner.create("sweep_1", "Model", [{"{RANDOM_SEED}": seed} for seed in range(4)], concurrency=2)
+    sweep.statistics = ReplicationStatistics()
+    seen = []
+
+    async def run_point(point):
+        return {"outputs": {"Throughput": float(point["parameters"]["{RANDOM_SEED}"])}}
+
+    async def on_progress(sweep, point):
+        seen.append(sweep.statistics.replications)
+
+    await runner.run(sweep, run_point, on_progress)
+    assert seen == [1, 2, 3, 4]
+    assert sweep.to_dict()["statistics"]["outputs"]["Throughput"]["mean"] == pytest.approx(1.5)
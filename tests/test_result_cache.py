@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+Tests for the content-addressed simulation result cache.
+"""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from result_cache import ResultCache, run_cache_key
+
+
+def test_key_is_canonical():
+    key = run_cache_key("m1", "v1", {"b": 2, "a": 1.0})
+    assert key == run_cache_key("m1", "v1", {"a": 1, "b": 2.0})
+    assert key != run_cache_key("m1", "v2", {"a": 1, "b": 2})
+    assert key != run_cache_key("m1", "v1", {"a": 1, "b": 2, "{RANDOM_SEED}": 7})
+    assert run_cache_key("m1", "v1", {"{RANDOM_SEED}": 7}) != run_cache_key("m1", "v1", {"{RANDOM_SEED}": 8})
+
+
+def test_store_and_lookup_survive_restart(tmp_path):
+    cache = ResultCache(tmp_path, enabled=True)
+    assert cache.lookup("m1", "v1", {"a": 1}) is None
+    cache.store("m1", "v1", {"a": 1}, {"individual_outputs": {"Throughput": 42}}, "sim_1")
+
+    restarted = ResultCache(tmp_path, enabled=True)
+    entry = restarted.lookup("m1", "v1", {"a": 1})
+    assert entry["source_simulation"] == "sim_1"
+    assert entry["outputs"]["individual_outputs"]["Throughput"] == 42
+    assert restarted.lookup("m1", "v1", {"a": 2}) is None
+
+
+def test_lookups_never_drop_other_versions(tmp_path):
+    cache = ResultCache(tmp_path, enabled=True)
+    cache.store("m1", "v1", {}, {"x": 1}, "sim_1")
+    cache.store("m1", "v2", {}, {"x": 2}, "sim_2")
+
+    assert cache.lookup("m1", "v3", {}) is None
+    assert cache.lookup("m1", "v1", {})["source_simulation"] == "sim_1"
+    assert cache.lookup("m1", "v2", {})["source_simulation"] == "sim_2"
+    assert cache.stats()["invalidations"] == 0
+
+
+def test_invalidate_model_keeps_one_version(tmp_path):
+    cache = ResultCache(tmp_path, enabled=True)
+    cache.store("m1", "v1", {}, {"x": 1}, "sim_1")
+    cache.store("m1", "v2", {}, {"x": 1}, "sim_2")
+    cache.store("m2", "v1", {}, {"x": 2}, "sim_3")
+
+    assert cache.invalidate_model("m1", keep_version="v2") == 1
+    assert not (tmp_path / "m1" / "v1").exists()
+    assert cache.lookup("m1", "v2", {}) is not None
+    assert cache.lookup("m2", "v1", {}) is not None
+
+
+def test_disabled_cache_never_hits(tmp_path):
+    cache = ResultCache(tmp_path, enabled=False)
+    assert cache.store("m1", "v1", {}, {"x": 1}, "sim_1") is None
+    assert cache.lookup("m1", "v1", {}) is None
+
+
+def test_storage_dir_places_cache_next_to_results(tmp_path, monkeypatch):
+    monkeypatch.delenv("ANYLOGIC_RESULT_CACHE_DIR", raising=False)
+    cache = ResultCache(enabled=True)
+    cache.use_storage_dir(tmp_path / "simulations")
+    cache.store("m1", "v1", {}, {"x": 1}, "sim_1")
+    assert cache.cache_dir == tmp_path / "simulations" / "cache"
+    assert cache.lookup("m1", "v1", {})["source_simulation"] == "sim_1"
+
+    explicit = ResultCache(tmp_path / "elsewhere", enabled=True)
+    explicit.use_storage_dir(tmp_path / "simulations")
+    assert explicit.cache_dir == tmp_path / "elsewhere"
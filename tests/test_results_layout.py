@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Tests for the sharded results directory layout and its migration.
+"""
+
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from results_layout import ResultsLayout
+from simulation_registry import SimulationRegistry
+from storage_migrate import iter_artifacts, main as migrate_main
+
+SIM_ID = "sim_20250131_142501_123_ab12_0001"
+LEGACY_ID = "sim_20240105_090000"
+
+
+def _make_sim(path, status="completed"):
+    path.mkdir(parents=True)
+    (path / "metadata.json").write_text(json.dumps({"simulation_id": path.name, "status": status}))
+    (path / "outputs.json").write_text(json.dumps({"series": [1, 2, 3]}))
+    return path
+
+
+def test_shard_paths(tmp_path):
+    assert ResultsLayout(tmp_path, scheme="flat").shard_path(SIM_ID) == tmp_path / SIM_ID
+    assert ResultsLayout(tmp_path, scheme="date").shard_path(SIM_ID) == tmp_path / "2025" / "01" / "31" / SIM_ID
+    assert ResultsLayout(tmp_path, scheme="date").shard_path(LEGACY_ID) == tmp_path / "2024" / "01" / "05" / LEGACY_ID
+
+    hashed = ResultsLayout(tmp_path, scheme="hash").shard_path(SIM_ID)
+    assert hashed.name == SIM_ID
+    assert len(hashed.parent.name) == 2 and len(hashed.parent.parent.name) == 2
+    assert hashed.parent.parent.parent == tmp_path
+
+    with pytest.raises(ValueError):
+        ResultsLayout(tmp_path, scheme="random")
+
+
+def test_flat_directories_found_before_migration(tmp_path):
+    flat = _make_sim(tmp_path / SIM_ID)
+    layout = ResultsLayout(tmp_path, scheme="hash")
+
+    assert layout.sim_dir(SIM_ID) == flat
+    assert layout.sim_dir("sim_20250131_142501_123_ab12_0002") == layout.shard_path("sim_20250131_142501_123_ab12_0002")
+    assert layout.needs_migration()
+
+
+def test_migrate_moves_idle_directories_and_prunes_empty_shards(tmp_path):
+    _make_sim(tmp_path / SIM_ID)
+    _make_sim(tmp_path / LEGACY_ID)
+
+    busy = ResultsLayout(tmp_path, scheme="date", min_idle_seconds=3600)
+    assert busy.migrate() == {"moved": 0, "busy": 2, "conflicts": 0}
+
+    layout = ResultsLayout(tmp_path, scheme="date", min_idle_seconds=0)
+    moved = []
+    assert layout.migrate(on_moved=lambda sim_id, path: moved.append(sim_id))["moved"] == 2
+    assert sorted(moved) == sorted([SIM_ID, LEGACY_ID])
+    assert (tmp_path / "2025" / "01" / "31" / SIM_ID / "outputs.json").exists()
+    assert not layout.needs_migration()
+
+    # Switching schemes again leaves no empty date shards behind
+    rehashed = ResultsLayout(tmp_path, scheme="hash", min_idle_seconds=0)
+    assert rehashed.migrate()["moved"] == 2
+    assert not (tmp_path / "2025").exists()
+    assert sorted(path.name for path in rehashed.iter_sim_dirs()) == sorted([SIM_ID, LEGACY_ID])
+
+
+def test_migrate_leaves_runs_in_flight(tmp_path):
+    _make_sim(tmp_path / SIM_ID, status="running")
+    _make_sim(tmp_path / LEGACY_ID, status="failed")
+
+    layout = ResultsLayout(tmp_path, scheme="date", min_idle_seconds=0)
+    assert layout.migrate() == {"moved": 1, "busy": 1, "conflicts": 0}
+    assert (tmp_path / SIM_ID / "metadata.json").exists()
+    assert layout.sim_dir(LEGACY_ID) == layout.shard_path(LEGACY_ID)
+
+
+def test_registry_and_storage_tools_see_mixed_layouts(tmp_path):
+    layout = ResultsLayout(tmp_path, scheme="hash")
+    _make_sim(tmp_path / LEGACY_ID)
+    _make_sim(layout.shard_path(SIM_ID), status="running")
+
+    registry = SimulationRegistry(tmp_path / "registry.db")
+    registry.import_directories(tmp_path, lambda sim_id, metadata: {"status": metadata["status"]})
+    assert set(registry) == {SIM_ID, LEGACY_ID}
+    assert registry[SIM_ID]["status"] == "running"
+
+    assert len(list(iter_artifacts(tmp_path, tmp_path / "cache"))) == 2
+    assert migrate_main(["shard", "--layout", "hash", "--results-dir", str(tmp_path)]) == 0
+    assert (layout.shard_path(LEGACY_ID) / "metadata.json").exists()
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Tests for the pluggable artifact and response serializers.
+"""
+
+import json
+import sys
+from datetime import datetime
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import serialization
+from serialization import StdlibJsonSerializer, available_serializers, get_serializer, to_jsonable
+
+
+class _OutputItem:
+    def __init__(self, name, value):
+        self.name = name
+        self.value = value
+
+
+class _Outputs:
+    def __init__(self):
+        self.items = [_OutputItem("Throughput", 42.5), _OutputItem("Finished", datetime(2025, 1, 2, 3, 4, 5))]
+
+    def to_dict(self):
+        return {"items": self.items}
+
+
+@pytest.mark.parametrize("name", sorted(available_serializers()))
+def test_round_trip_converts_objects_in_one_pass(name):
+    serializer = get_serializer(name)
+    encoded = serializer.dumps({"results": _Outputs(), "tags": {"a"}, 1: "int key"})
+
+    assert serializer.loads(encoded) == {
+        "results": {"items": [
+            {"name": "Throughput", "value": 42.5},
+            {"name": "Finished", "value": "2025-01-02T03:04:05"}
+        ]},
+        "tags": ["a"],
+        "1": "int key"
+    }
+
+
+def test_stored_json_is_compact_and_responses_can_be_indented():
+    compact = serialization.dumps({"a": [1, 2]})
+    assert compact == b'{"a":[1,2]}'
+    assert serialization.dumps_text({"a": 1}, indent=True) == '{\n  "a": 1\n}'
+    assert serialization.loads(compact) == {"a": [1, 2]}
+
+
+def test_values_orjson_rejects_fall_back_to_stdlib():
+    huge = 2 ** 80
+    assert serialization.loads(get_serializer("auto").dumps({"n": huge})) == {"n": huge}
+
+
+def test_lookup_and_fallback_conversion():
+    assert get_serializer("json").name == "json"
+    with pytest.raises(ValueError):
+        get_serializer("pickle")
+    assert to_jsonable(object.__new__(object)).startswith("<object object")
+    assert StdlibJsonSerializer().dumps(Path("a/b")) == b'"a/b"'
+
+
+def test_iter_json_streams_generators_in_chunks(monkeypatch):
+    records = ({"id": f"sim_{i}", "values": [i, i + 1]} for i in range(100))
+    chunks = list(serialization.iter_json({"total": 100, "simulations": records, "nested": {"a": (x for x in [1])}},
+                                          chunk_size=256))
+
+    assert len(chunks) > 1
+    assert all(len(chunk) < 256 + 64 for chunk in chunks[:-1])
+    decoded = json.loads(b"".join(chunks))
+    assert decoded["total"] == 100
+    assert decoded["simulations"][99] == {"id": "sim_99", "values": [99, 100]}
+    assert decoded["nested"] == {"a": [1]}
+
+    monkeypatch.setattr(serialization, "response_mode", "compact")
+    assert serialization.dumps_streamed({"empty": iter([]), 1: None}) == '{"empty":[],"1":null}'
+
+    # Pretty mode indents streamed documents exactly like dumps_response
+    monkeypatch.setattr(serialization, "response_mode", "pretty")
+    streamed = {"runs": (run for run in [{"id": "a", "tags": [1]}, {}]), "nested": {"a": iter([iter([1])]), "e": {}}}
+    expected = {"runs": [{"id": "a", "tags": [1]}, {}], "nested": {"a": [[1]], "e": {}}}
+    assert serialization.dumps_streamed(streamed) == serialization.dumps_response(expected)
+
+
+def test_project_fields_keeps_requested_keys(monkeypatch):
+    record = {"id": "sim_1", "status": "completed", "metadata": {"model_name": "A", "user": "ana"}}
+
+    assert serialization.project_fields(record, None) is record
+    assert serialization.project_fields(record, "id, metadata.model_name, missing") == {
+        "id": "sim_1", "metadata": {"model_name": "A"}
+    }
+    assert serialization.project_fields([record, record], ["status"]) == [{"status": "completed"}] * 2
+    assert serialization.project_fields(record, "metadata.user,metadata")["metadata"] == record["metadata"]
+    assert serialization.parse_fields(" , ") is None
+
+    monkeypatch.setattr(serialization, "response_mode", "compact")
+    assert serialization.dumps_response({"a": [1]}) == '{"a":[1]}'
+    monkeypatch.setattr(serialization, "response_mode", "pretty")
+    assert serialization.dumps_response({"a": 1}) == '{\n  "a": 1\n}'
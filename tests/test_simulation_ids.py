@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+Tests for collision-free, time-sortable simulation IDs.
+"""
+
+import sys
+import threading
+from datetime import datetime
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from simulation_ids import SimulationIdGenerator, id_timestamp, is_simulation_id
+
+
+def test_ids_are_unique_and_sorted_across_threads():
+    generator = SimulationIdGenerator(node="abc123")
+    minted = []
+    lock = threading.Lock()
+
+    def mint():
+        ids = [generator.new() for _ in range(500)]
+        with lock:
+            minted.extend(ids)
+
+    threads = [threading.Thread(target=mint) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(set(minted)) == len(minted) == 4000
+
+    sequential = [generator.new() for _ in range(1000)]
+    assert sequential == sorted(sequential)
+
+
+def test_different_nodes_never_collide():
+    first = SimulationIdGenerator(node="000001")
+    second = SimulationIdGenerator(node="000002")
+    assert not {first.new() for _ in range(100)} & {second.new() for _ in range(100)}
+
+
+def test_sequence_overflow_advances_the_timestamp():
+    generator = SimulationIdGenerator(node="abc123")
+    generator._last_ms = 4102444800000  # far future: the clock appears to stand still
+    generator._sequence = 0xFFFF
+    sim_id = generator.new()
+    assert sim_id.endswith("_abc123_0000")
+    assert generator._last_ms == 4102444800001
+
+
+def test_timestamps_of_new_and_legacy_ids():
+    sim_id = SimulationIdGenerator(node="abc123").new()
+    assert is_simulation_id(sim_id)
+    assert abs((id_timestamp(sim_id) - datetime.now()).total_seconds()) < 5
+
+    assert id_timestamp("sim_20250101_120000") == datetime(2025, 1, 1, 12, 0, 0)
+    assert is_simulation_id("sim_20250101_120000")
+    assert "sim_20250101_120000" < "sim_20250101_120000_001_abc123_0000" < "sim_20250101_120001"
+    assert not is_simulation_id("sim_notes")
+    assert id_timestamp("random") is None
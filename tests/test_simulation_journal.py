@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Tests for the append-only simulation lifecycle journal.
+"""
+
+import json
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from simulation_journal import SimulationJournal
+
+
+def _snapshot(results_dir, sim_id):
+    with open(results_dir / sim_id / "metadata.json") as f:
+        return json.load(f)
+
+
+def test_snapshot_written_once_then_changes_appended(tmp_path):
+    results_dir = tmp_path / "results"
+    journal = SimulationJournal(results_dir, compact_every=100)
+
+    journal.write("sim_1", {"id": "sim_1", "status": "running", "parameters": {"a": 1}})
+    journal.write("sim_1", {"id": "sim_1", "status": "completed", "parameters": {"a": 1}, "completed": "t1"})
+
+    assert _snapshot(results_dir, "sim_1")["status"] == "running"
+    events = [json.loads(line) for line in journal.journal_path.read_text().splitlines()]
+    assert events == [{"id": "sim_1", "ts": events[0]["ts"], "set": {"status": "completed", "completed": "t1"}}]
+    assert journal.read("sim_1") == {"id": "sim_1", "status": "completed", "parameters": {"a": 1}, "completed": "t1"}
+
+
+def test_unchanged_and_removed_fields(tmp_path):
+    journal = SimulationJournal(tmp_path / "results", compact_every=100)
+    journal.write("sim_1", {"status": "running", "error": "transient"})
+    journal.write("sim_1", {"status": "running", "error": "transient"})
+    assert journal.events_appended == 0
+
+    journal.write("sim_1", {"status": "running"})
+    assert journal.read("sim_1") == {"status": "running"}
+
+
+def test_compaction_folds_events_into_snapshots(tmp_path):
+    results_dir = tmp_path / "results"
+    journal = SimulationJournal(results_dir, compact_every=3)
+    for sim_id in ("sim_1", "sim_2"):
+        journal.write(sim_id, {"status": "queued"})
+        journal.write(sim_id, {"status": "running"})
+    assert journal.compactions == 0
+
+    journal.write("sim_1", {"status": "completed"})
+    journal.start_background_compaction().join(timeout=5)
+    assert journal.compactions == 1
+    assert not journal.journal_path.exists()
+    assert _snapshot(results_dir, "sim_1")["status"] == "completed"
+    assert _snapshot(results_dir, "sim_2")["status"] == "running"
+
+
+def test_restart_replays_then_compacts(tmp_path):
+    results_dir = tmp_path / "results"
+    journal = SimulationJournal(results_dir, compact_every=100)
+    journal.write("sim_1", {"status": "running"})
+    journal.write("sim_1", {"status": "failed", "error": "boom"})
+    journal.write("sim_gone", {"status": "running"})
+    journal.write("sim_gone", {"status": "completed"})
+    (results_dir / "sim_gone" / "metadata.json").unlink()
+
+    restarted = SimulationJournal(results_dir, compact_every=100)
+    assert restarted.read("sim_1") == {"status": "failed", "error": "boom"}
+    assert restarted.compact() == 1
+    assert _snapshot(results_dir, "sim_1") == {"status": "failed", "error": "boom"}
+
+
+def test_torn_last_line_is_ignored(tmp_path):
+    journal = SimulationJournal(tmp_path / "results", compact_every=100)
+    journal.write("sim_1", {"status": "running"})
+    journal.write("sim_1", {"status": "completed"})
+    with open(journal.journal_path, "a") as f:
+        f.write('{"id": "sim_1", "set": {"sta')
+
+    assert journal.read("sim_1") == {"status": "completed"}
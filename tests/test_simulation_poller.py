@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Tests for the central simulation status poller.
+"""
+
+import asyncio
+import sys
+import threading
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from simulation_poller import DurationEstimator, SimulationPoller
+
+
+class FakeSimulation:
+    def __init__(self, statuses):
+        self.statuses = list(statuses)
+        self.status_calls = 0
+
+    def get_status(self):
+        self.status_calls += 1
+        return self.statuses.pop(0) if len(self.statuses) > 1 else self.statuses[0]
+
+    def get_outputs(self):
+        return {"Throughput": 42}
+
+
+def test_duration_estimator_seeds_from_default_then_tracks_runs():
+    estimator = DurationEstimator(default=30, alpha=0.5)
+    assert estimator.expected("Model") == 30
+    estimator.record("Model", 10)
+    assert estimator.expected("Model") == 10
+    estimator.record("Model", 20)
+    assert estimator.expected("Model") == 15
+
+
+async def test_backoff_doubles_until_completion_is_persisted():
+    completed = {}
+    persisted_on = []
+
+    def persist(sim_id, outputs):
+        persisted_on.append(threading.current_thread())
+        completed[sim_id] = outputs
+
+    poller = SimulationPoller(on_complete=persist,
+                              min_interval=0.01, max_interval=0.04,
+                              estimator=DurationEstimator(default=0.04))
+    simulation = FakeSimulation(["RUNNING", "RUNNING", "COMPLETED"])
+    poller.track("sim_1", simulation, "Model")
+    first_delay = poller._runs["sim_1"]["delay"]
+
+    await poller.poll_once()
+    assert poller._runs["sim_1"]["delay"] == first_delay * 2
+
+    for _ in range(50):
+        if "sim_1" in completed:
+            break
+        await asyncio.sleep(0.01)
+
+    assert completed == {"sim_1": {"Throughput": 42}}
+    # Persistence (fsynced writes) runs off the event loop thread
+    assert persisted_on != [threading.current_thread()]
+    assert not poller.is_tracking("sim_1")
+    assert "Model" in poller.durations.snapshot()
+    poller.stop()
+
+
+async def test_due_runs_are_checked_in_one_batch():
+    poller = SimulationPoller(min_interval=0.01, max_interval=1, batch_size=10)
+    simulations = {f"sim_{i}": FakeSimulation(["RUNNING"]) for i in range(5)}
+    for sim_id, simulation in simulations.items():
+        poller.track(sim_id, simulation, "Model")
+    poller.stop()
+
+    await poller.poll_once()
+    assert all(simulation.status_calls == 1 for simulation in simulations.values())
+    assert poller.stats()["tracked"] == 5
+
+
+async def test_failed_runs_stop_polling_and_notify():
+    failures = []
+    poller = SimulationPoller(on_failure=lambda sim_id, status: failures.append((sim_id, status)))
+    poller.track("sim_1", FakeSimulation(["FAILED"]), "Model")
+    poller.stop()
+
+    await poller.poll_once()
+    assert failures == [("sim_1", "FAILED")]
+    assert not poller.is_tracking("sim_1")
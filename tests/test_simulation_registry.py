@@ -0,0 +1,205 @@
+#!/usr/bin/env python3
+"""
+Tests for the SQLite-backed simulation registry.
+"""
+
+import json
+import os
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from simulation_registry import (
+    SimulationRegistry,
+    iter_simulations,
+    open_simulation_registry,
+    page_simulations,
+    query_simulations,
+    simulation_changes,
+    status_counts,
+)
+
+
+def _write_run(results_dir, sim_id, **metadata):
+    sim_dir = results_dir / sim_id
+    sim_dir.mkdir(parents=True)
+    with open(sim_dir / "metadata.json", "w") as f:
+        json.dump(metadata, f)
+
+
+def test_reopening_imports_new_and_changed_directories(tmp_path):
+    results_dir = tmp_path / "results"
+    _write_run(results_dir, "sim_20250101_120000", status="completed", model_name="A",
+               created="2025-01-01T12:00:00")
+    _write_run(results_dir, "sim_20250102_120000_000_abc123_0000", status="running", model_name="B",
+               created="2025-01-02T12:00:00")
+    (results_dir / "notes").mkdir()
+
+    registry = open_simulation_registry(results_dir, lambda sim_id, metadata: metadata, variant="test")
+    assert len(registry) == 2
+    assert registry["sim_20250101_120000"]["model_name"] == "A"
+    registry.close()
+
+    # Another process adds a run and finishes one; an unchanged directory is not re-read
+    time.sleep(0.01)
+    _write_run(results_dir, "sim_20250103_120000", status="completed", model_name="C")
+    with open(results_dir / "sim_20250102_120000_000_abc123_0000" / "metadata.json", "w") as f:
+        json.dump({"status": "completed", "model_name": "B", "created": "2025-01-02T12:00:00"}, f)
+    unchanged = results_dir / "sim_20250101_120000" / "metadata.json"
+    with open(unchanged, "w") as f:
+        json.dump({"status": "failed", "model_name": "A"}, f)
+    os.utime(unchanged, (1_000_000, 1_000_000))
+    time.sleep(0.01)
+
+    reopened = open_simulation_registry(results_dir, lambda sim_id, metadata: metadata, variant="test")
+    assert list(reopened) == ["sim_20250101_120000", "sim_20250102_120000_000_abc123_0000", "sim_20250103_120000"]
+    assert reopened["sim_20250102_120000_000_abc123_0000"]["status"] == "completed"
+    assert reopened["sim_20250101_120000"]["status"] == "completed"
+
+
+def test_queries_use_indexed_columns(tmp_path):
+    registry = SimulationRegistry(tmp_path / "registry.db")
+    registry["sim_1"] = {"status": "completed", "model_name": "A", "user": "ana", "created": "2025-01-01T00:00:00"}
+    registry["sim_2"] = {"status": "running", "model_name": "A", "user": "bo", "created": "2025-01-02T00:00:00"}
+    registry["sim_3"] = {"status": "completed", "model_name": "B", "user": "ana", "created": "2025-01-03T00:00:00"}
+
+    assert [sim_id for sim_id, _ in registry.query(status="completed")] == ["sim_1", "sim_3"]
+    assert [sim_id for sim_id, _ in registry.query(model_name="A", user="bo")] == ["sim_2"]
+    assert [sim_id for sim_id, _ in registry.query(created_after="2025-01-02")] == ["sim_2", "sim_3"]
+    assert [sim_id for sim_id, _ in registry.query(limit=1, descending=True)] == ["sim_3"]
+    assert registry.count_by_status() == {"completed": 2, "running": 1}
+
+    mode = registry._conn.execute("PRAGMA journal_mode").fetchone()[0]
+    assert mode == "wal"
+
+
+def test_live_records_stay_in_memory_until_terminal(tmp_path):
+    registry = SimulationRegistry(tmp_path / "registry.db")
+    live_object = object()
+    record = {"simulation": live_object, "status": "running", "model_name": "A"}
+    registry["sim_1"] = record
+
+    assert registry["sim_1"] is record
+    record["status"] = "completed"
+    registry["sim_1"] = record
+
+    stored = registry["sim_1"]
+    assert stored is not record
+    assert stored["simulation"] is None
+    assert stored["status"] == "completed"
+
+    del registry["sim_1"]
+    assert "sim_1" not in registry
+
+
+async def test_background_hydration_with_disk_fallback(tmp_path):
+    results_dir = tmp_path / "results"
+    for day in range(1, 6):
+        _write_run(results_dir, f"sim_2025010{day}_120000", status="completed", model_name="A")
+
+    registry = open_simulation_registry(results_dir, lambda sim_id, metadata: metadata,
+                                        variant="test", background=True)
+    assert not registry.hydrated
+    assert len(registry) == 0
+
+    # Not imported yet, so the lookup reads the directory directly
+    assert "sim_20250103_120000" in registry
+    assert registry["sim_20250104_120000"]["model_name"] == "A"
+    assert "sim_20250109_120000" not in registry
+
+    await registry.start_background_hydration()
+    assert registry.hydrated
+    assert len(registry) == 5
+    assert registry.start_background_hydration() is None
+
+
+def test_query_simulations_filters_registry_and_dict_alike(tmp_path):
+    records = {
+        "sim_20250101_090000": {"status": "completed", "model_name": "Bass", "user": "ana", "created": "2025-01-01T09:00:00"},
+        "sim_20250102_090000": {"status": "failed", "model_name": "Bass", "user": "ben", "created": "2025-01-02T09:00:00"},
+        "sim_20250103_090000": {"status": "completed", "model_name": "Queue", "user": "ana", "created": "2025-01-03T09:00:00"},
+    }
+    registry = SimulationRegistry(tmp_path / "registry.db")
+    for sim_id, record in records.items():
+        registry[sim_id] = record
+
+    for store in (registry, dict(records)):
+        ids = lambda **filters: [sim_id for sim_id, _ in query_simulations(store, **filters)]
+        assert ids() == ["sim_20250103_090000", "sim_20250102_090000", "sim_20250101_090000"]
+        assert ids(status="completed", user="ana") == ["sim_20250103_090000", "sim_20250101_090000"]
+        assert ids(model_name="Bass", descending=False) == ["sim_20250101_090000", "sim_20250102_090000"]
+        assert ids(created_after="2025-01-02", created_before="2025-01-03") == ["sim_20250102_090000"]
+        assert ids(status="completed", limit=1) == ["sim_20250103_090000"]
+        assert status_counts(store) == {"completed": 2, "failed": 1}
+
+
+def test_cursor_pagination_is_stable_across_inserts(tmp_path):
+    records = {f"sim_2025010{day}_090000": {"status": "completed", "created": f"2025-01-0{day}T09:00:00"}
+               for day in range(1, 6)}
+    # Same created time as another run: ordered by ID within it
+    records["sim_20250103_090000_000_aa11_0002"] = {"status": "failed", "created": "2025-01-03T09:00:00"}
+    registry = SimulationRegistry(tmp_path / "registry.db")
+    for sim_id, record in records.items():
+        registry[sim_id] = record
+
+    for store in (registry, dict(records)):
+        seen, cursor = [], None
+        while True:
+            page = page_simulations(store, cursor=cursor, page_size=4)
+            assert page["total"] == (6 if cursor is None else 7)
+            seen.extend(sim_id for sim_id, _ in page["simulations"])
+            cursor = page["next_cursor"]
+            if cursor is None:
+                break
+            # A run created while paging lands before the cursor and does not shift later pages
+            store["sim_20250109_090000"] = {"status": "running", "created": "2025-01-09T09:00:00"}
+        assert seen == ["sim_20250105_090000", "sim_20250104_090000", "sim_20250103_090000_000_aa11_0002",
+                        "sim_20250103_090000", "sim_20250102_090000", "sim_20250101_090000"]
+
+    assert page_simulations(registry, page_size=10, status="completed")["total"] == 5
+    with pytest.raises(ValueError):
+        page_simulations(registry, cursor="not-a-cursor")
+
+
+def test_change_feed_reports_writes_and_removals_since_a_version(tmp_path):
+    registry = SimulationRegistry(tmp_path / "registry.db")
+    registry["sim_20250101_090000"] = {"status": "running"}
+    registry["sim_20250102_090000"] = {"status": "running"}
+    start = registry.changes()
+    assert [sim_id for sim_id, _ in start["simulations"]] == ["sim_20250101_090000", "sim_20250102_090000"]
+    assert start["version"] == registry.version == 2
+
+    registry["sim_20250101_090000"] = {"status": "completed"}
+    del registry["sim_20250102_090000"]
+    registry["sim_20250103_090000"] = {"status": "running"}
+
+    changes = registry.changes(since=start["version"])
+    assert [(sim_id, record["status"]) for sim_id, record in changes["simulations"]] == [
+        ("sim_20250101_090000", "completed"), ("sim_20250103_090000", "running")
+    ]
+    assert changes["removed"] == ["sim_20250102_090000"]
+    assert registry.changes(since=changes["version"])["simulations"] == []
+
+    # A cut-off page resumes exactly where it stopped
+    first = simulation_changes(registry, since=start["version"], limit=1)
+    assert first["more"] and [sim_id for sim_id, _ in first["simulations"]] == ["sim_20250101_090000"]
+    rest = simulation_changes(registry, since=first["version"], limit=10)
+    assert [sim_id for sim_id, _ in rest["simulations"]] == ["sim_20250103_090000"]
+    assert rest["removed"] == ["sim_20250102_090000"] and not rest["more"]
+
+    # Versions survive reopening the database
+    assert SimulationRegistry(tmp_path / "registry.db").version == registry.version
+
+
+def test_iter_simulations_reads_in_batches(tmp_path):
+    registry = SimulationRegistry(tmp_path / "registry.db")
+    ids = [f"sim_202501{day:02d}_090000" for day in range(1, 12)]
+    for sim_id in ids:
+        registry[sim_id] = {"status": "completed"}
+
+    assert [sim_id for sim_id, _ in iter_simulations(registry, batch_size=3)] == ids[::-1]
+    assert [sim_id for sim_id, _ in iter_simulations(dict(registry.items()), created_after="2025-01-10")] == ids[:8:-1]
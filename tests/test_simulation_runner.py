@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Tests for background simulation completion and output serialization.
+"""
+
+import asyncio
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from simulation_runner import BackgroundRunManager, owner_alive, process_owner, serialize_run_outputs
+
+
+class FakeOutputs:
+    def names(self):
+        return ["Throughput", "Utilization"]
+
+    def value(self, name):
+        if name == "Utilization":
+            raise KeyError(name)
+        return 42
+
+    def get_raw_outputs(self):
+        return []
+
+
+def test_serialize_run_outputs_captures_values_and_errors():
+    data = serialize_run_outputs("sim_1", "Model", {"Rate": 1}, FakeOutputs())
+    assert data["simulation_id"] == "sim_1"
+    assert data["status"] == "completed"
+    assert data["output_names"] == ["Throughput", "Utilization"]
+    assert data["individual_outputs"]["Throughput"] == 42
+    assert "error" in data["individual_outputs"]["Utilization"]
+
+
+async def test_submit_returns_before_run_finishes():
+    manager = BackgroundRunManager()
+    release = asyncio.Event()
+    finished = []
+
+    async def completion():
+        await release.wait()
+        finished.append(True)
+
+    manager.submit("sim_1", completion())
+    await asyncio.sleep(0)
+    assert manager.is_active("sim_1")
+    assert not finished
+
+    release.set()
+    await manager.wait("sim_1", timeout=1)
+    await asyncio.sleep(0)
+    assert finished == [True]
+    assert manager.active_ids() == []
+
+
+async def test_failed_background_run_is_dropped():
+    manager = BackgroundRunManager()
+
+    async def completion():
+        raise RuntimeError("cloud down")
+
+    task = manager.submit("sim_2", completion())
+    await asyncio.gather(task, return_exceptions=True)
+    await asyncio.sleep(0)
+    assert not manager.is_active("sim_2")
+
+
+async def test_orphaned_runs_are_marked_failed():
+    manager = BackgroundRunManager()
+    release = asyncio.Event()
+    simulations = {
+        "sim_20250101_090000": {"status": "queued", "created": "2025-01-01T09:00:00"},
+        "sim_20250102_090000": {"status": "running", "created": "2025-01-02T09:00:00"},
+        "sim_20250103_090000": {"status": "running", "created": "2025-01-03T09:00:00"},
+        "sim_20250104_090000": {"status": "completed", "created": "2025-01-04T09:00:00"},
+    }
+    manager.submit("sim_20250103_090000", release.wait())
+    saved = {}
+
+    orphaned = manager.fail_orphaned(simulations, lambda sim_id, record: saved.update({sim_id: record}))
+
+    assert sorted(orphaned) == ["sim_20250101_090000", "sim_20250102_090000"]
+    assert {record["status"] for record in saved.values()} == {"failed"}
+    assert "Interrupted while queued" in saved["sim_20250101_090000"]["error"]
+    assert simulations["sim_20250103_090000"]["status"] == "running"
+    release.set()
+    await manager.wait("sim_20250103_090000", timeout=1)
+
+
+def test_runs_owned_by_live_processes_are_kept():
+    manager = BackgroundRunManager()
+    exited = subprocess.Popen([sys.executable, "-c", "pass"])
+    exited.wait()
+    parent = dict(process_owner(), pid=os.getppid())
+    simulations = {
+        "sim_20250101_090000": {"status": "running", "created": "2025-01-01T09:00:00", "owner": parent},
+        "sim_20250102_090000": {"status": "running", "created": "2025-01-02T09:00:00",
+                                "owner": dict(parent, pid=exited.pid)},
+        "sim_20250103_090000": {"status": "queued", "created": "2025-01-03T09:00:00",
+                                "owner": dict(parent, host="other-host", pid=exited.pid)},
+        "sim_20250104_090000": {"status": "running", "created": "2025-01-04T09:00:00",
+                                "owner": dict(parent, boot_id="previous-boot")},
+    }
+
+    orphaned = manager.fail_orphaned(simulations, lambda sim_id, record: None)
+
+    assert sorted(orphaned) == ["sim_20250102_090000", "sim_20250104_090000"]
+    assert simulations["sim_20250101_090000"]["status"] == "running"
+    assert simulations["sim_20250103_090000"]["status"] == "queued"
+    assert not owner_alive(manager.owner)
@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+Tests that sweep points and replications of the v2 server run with their own inputs.
+"""
+
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import fastmcp_anylogic_server_v2 as server
+from result_cache import ResultCache
+from results_layout import ResultsLayout
+from simulation_journal import SimulationJournal
+
+
+class FakeModel:
+    id = "m1"
+    name = "Queue"
+    model_versions = ["v1"]
+
+
+class FakeVersion:
+    def __init__(self, version_id):
+        self.id = version_id
+
+
+class FakeInputs:
+    """Inputs exposing only set_input, like the AnyLogic Cloud client's Inputs"""
+
+    def __init__(self):
+        self.values = {}
+
+    def set_input(self, name, value):
+        if name == "Unknown":
+            raise KeyError(name)
+        self.values[name] = value
+
+
+class FakeCatalog:
+    async def resolve(self, name):
+        return FakeModel()
+
+    async def get_version(self, model, version_id=None):
+        return FakeVersion(model.model_versions[-1])
+
+    async def default_inputs(self, model, version_id=None):
+        return version_id, FakeInputs()
+
+
+class FakeOutputs:
+    def __init__(self, values):
+        self.values = values
+
+    def names(self):
+        return list(self.values)
+
+    def value(self, name):
+        return self.values[name]
+
+
+class FakeSimulation:
+    def __init__(self, inputs):
+        self.inputs = dict(inputs.values)
+
+    def get_outputs_and_run_if_absent(self):
+        return FakeOutputs({"Throughput": self.inputs.get("Rate", 0) * 10 + self.inputs.get("{RANDOM_SEED}", 0)})
+
+
+class FakeCloudClient:
+    def __init__(self):
+        self.created = []
+
+    def create_simulation(self, inputs):
+        simulation = FakeSimulation(inputs)
+        self.created.append(simulation.inputs)
+        return simulation
+
+
+@pytest.fixture
+def cloud(tmp_path, monkeypatch):
+    client = FakeCloudClient()
+    layout = ResultsLayout(tmp_path / "results", scheme="flat")
+    monkeypatch.setattr(server, "cloud_client", client)
+    monkeypatch.setattr(server, "model_catalog", FakeCatalog())
+    monkeypatch.setattr(server, "current_simulations", {})
+    monkeypatch.setattr(server, "results_layout", layout)
+    monkeypatch.setattr(server, "result_cache", ResultCache(tmp_path / "cache", enabled=True))
+    monkeypatch.setattr(server, "simulation_journal", SimulationJournal(tmp_path / "results", layout=layout))
+    monkeypatch.setattr(server, "sweeps_dir", tmp_path / "sweeps")
+    return client
+
+
+async def test_sweep_points_run_with_their_parameters(cloud):
+    result = json.loads(await server.run_parameter_sweep("Queue", grid={"Rate": [1, 2, 3]}, use_cache=False))
+
+    assert result["counts"]["completed"] == 3
+    assert sorted(inputs["Rate"] for inputs in cloud.created) == [1, 2, 3]
+    rows = {row[3]: row[4] for row in result["results"]["rows"]}
+    assert rows == {1: 10, 2: 20, 3: 30}
+
+
+async def test_cached_sweep_points_fill_the_result_table(cloud):
+    first = json.loads(await server.run_parameter_sweep("Queue", grid={"Rate": [1, 2]}))
+    again = json.loads(await server.run_parameter_sweep("Queue", grid={"Rate": [1, 2]}))
+
+    assert len(cloud.created) == 2
+    assert again["results"]["rows"] and [row[3:] for row in again["results"]["rows"]] == [
+        row[3:] for row in first["results"]["rows"]
+    ]
+
+
+async def test_unsettable_parameter_fails_the_point(cloud):
+    result = json.loads(await server.run_parameter_sweep("Queue", points=[{"Unknown": 1}], use_cache=False))
+
+    assert result["counts"]["failed"] == 1
+    assert "Unknown" in result["points"][0]["error"]
+    assert cloud.created == []
+
+
+async def test_each_replication_gets_its_own_seed(cloud):
+    result = json.loads(await server.run_replications("Queue", {"Rate": 2}, replications=4, base_seed=7,
+                                                      use_cache=False))
+
+    assert result["counts"]["completed"] == 4
+    assert sorted(inputs["{RANDOM_SEED}"] for inputs in cloud.created) == [7, 8, 9, 10]
+    assert all(inputs["Rate"] == 2 for inputs in cloud.created)
+    throughput = result["statistics"]["outputs"]["Throughput"]
+    assert (throughput["min"], throughput["max"]) == (27, 30)
+    assert throughput["variance"] > 0
+
+
+async def test_cached_replications_keep_their_statistics(cloud):
+    first = json.loads(await server.run_replications("Queue", {"Rate": 2}, replications=4, base_seed=7))
+    again = json.loads(await server.run_replications("Queue", {"Rate": 2}, replications=4, base_seed=7))
+
+    assert len(cloud.created) == 4
+    assert again["counts"]["completed"] == 4
+    assert again["statistics"]["outputs"]["Throughput"] == first["statistics"]["outputs"]["Throughput"]
+    assert again["statistics"]["outputs"]["Throughput"]["mean"] == 28.5